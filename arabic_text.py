@@ -0,0 +1,184 @@
+"""
+BrainSAIT Arabic Text Pipeline
+==============================
+Arabic reshaping and bidi reordering for ReportLab output
+
+BILINGUAL: Contextual letter forms (arabic-reshaper) and visual RTL ordering
+(python-bidi), so Arabic titles and body text render correctly with a
+registered Arabic TTF
+BILINGUAL: Right-to-left paragraphs are reshaped in logical order and each
+line is reordered when it is drawn (see compact_flowables.RTLParagraph), so
+a wrapped Arabic paragraph still reads from its first line down
+NEURAL: Shaped strings are memoized in an LRU; department names and section
+titles repeat across thousands of documents
+
+Both libraries are optional. Without them text passes through unchanged.
+The Arabic font is taken from BRAINSAIT_ARABIC_FONT, or the first of
+ARABIC_FONT_CANDIDATES that exists, and registered through the process-wide
+font manager; without one, FONT_ARABIC is used.
+"""
+
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List
+
+from font_manager import get_font_manager
+
+try:
+    import arabic_reshaper
+    from bidi.algorithm import get_display
+    SHAPING_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    SHAPING_AVAILABLE = False
+
+# Shaped strings kept in the process-wide LRU
+SHAPE_CACHE_SIZE = 4096
+
+ARABIC_FONT_NAME = "BrainSAITArabic"
+ARABIC_FONT_CANDIDATES = (
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 "fonts", "IBMPlexSansArabic-Regular.ttf"),
+    "/usr/share/fonts/truetype/ibm-plex/IBMPlexSansArabic-Regular.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansArabic-Regular.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+)
+
+_ARABIC_CLASS = '[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]'
+_ARABIC_CHARS = re.compile(_ARABIC_CLASS)
+# Arabic words and the spaces between them, e.g. one run per font switch
+_ARABIC_RUN = re.compile(f'{_ARABIC_CLASS}+(?:\\s+{_ARABIC_CLASS}+)*')
+# Paragraph markup tags and entities, which are never reordered
+_MARKUP_TOKEN = re.compile(r'(<[^>]*>|&#?\w+;)')
+
+
+
+def has_arabic(text: str) -> bool:
+    return bool(text) and _ARABIC_CHARS.search(text) is not None
+
+
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def _shape(text: str) -> str:
+    return get_display(arabic_reshaper.reshape(text))
+
+
+def shape_arabic(text: str) -> str:
+    """
+    BILINGUAL: Reshape and reorder Arabic text for left-to-right drawing
+
+    Text without Arabic characters (or when the shaping libraries are not
+    installed) is returned unchanged. Intended for plain text such as titles
+    and brand strings, not Paragraph markup.
+    """
+    if not SHAPING_AVAILABLE or not has_arabic(text):
+        return text
+    return _shape(text)
+
+
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def _reshape(text: str) -> str:
+    return arabic_reshaper.reshape(text)
+
+
+def reshape_arabic(text: str) -> str:
+    """
+    BILINGUAL: Contextual letter forms in logical (reading) order
+
+    For right-to-left paragraphs that are broken into lines before the
+    lines are reordered (see visual_line).
+    """
+    if not SHAPING_AVAILABLE or not has_arabic(text):
+        return text
+    return _reshape(text)
+
+
+@lru_cache(maxsize=SHAPE_CACHE_SIZE)
+def _visual_line(text: str) -> str:
+    return get_display(text, base_dir='R')
+
+
+def visual_line(text: str) -> str:
+    """One line of a right-to-left paragraph, reordered for left-to-right drawing"""
+    if not SHAPING_AVAILABLE:
+        return text
+    return _visual_line(text)
+
+
+def starts_rtl(text: str) -> bool:
+    """Whether the first strongly directional character (markup skipped) is right-to-left"""
+    for char in _MARKUP_TOKEN.sub('', text):
+        direction = unicodedata.bidirectional(char)
+        if direction in ('R', 'AL'):
+            return True
+        if direction == 'L':
+            return False
+    return False
+
+
+def shape_markup(text: str, font_name: str, rtl: bool = False) -> str:
+    """
+    BILINGUAL: Shape the Arabic in Paragraph markup and set it in font_name
+
+    Text between tags is shaped on its own (tags and entities are kept), and
+    each Arabic run is wrapped in a <font> tag, so a paragraph in a Latin
+    font can carry Arabic words. With rtl, the pieces are also put in
+    right-to-left order (tags mirrored so they still nest); that ordering
+    holds within a line, so it suits short marked-up items.
+    """
+    if not has_arabic(text):
+        return text
+    parts = _MARKUP_TOKEN.split(text)
+    if rtl:
+        parts = _mirror_markup(parts)
+    for i in range(0, len(parts), 2):
+        shaped = visual_line(reshape_arabic(parts[i])) if rtl else shape_arabic(parts[i])
+        parts[i] = _ARABIC_RUN.sub(lambda run: f'<font name="{font_name}">{run.group(0)}</font>',
+                                   shaped)
+    return ''.join(parts)
+
+
+def _mirror_markup(parts: List[str]) -> List[str]:
+    """Text and tag pieces in reverse order, each tag pair swapped to keep nesting"""
+    mirrored = list(parts)
+    opened = []
+    for i in range(1, len(parts), 2):
+        tag = parts[i]
+        if tag.startswith('</'):
+            if not opened:
+                return parts
+            j = opened.pop()
+            mirrored[i], mirrored[j] = parts[j], tag
+        elif tag.startswith('<') and not tag.endswith('/>'):
+            opened.append(i)
+    if opened:
+        return parts
+    return mirrored[::-1]
+
+
+def shape_cache_info():
+    """Hit/miss statistics for the shaped-text LRU"""
+    return _shape.cache_info()
+
+
+def arabic_font_candidates() -> List[str]:
+    """TTF paths to try for the Arabic font, in order of preference"""
+    configured = os.environ.get("BRAINSAIT_ARABIC_FONT")
+    return ([configured] if configured else []) + list(ARABIC_FONT_CANDIDATES)
+
+
+def arabic_font(fallback: str) -> str:
+    """
+    Name of the registered Arabic font, registering it on first use
+
+    Returns fallback when no Arabic TTF is available.
+    """
+    return get_font_manager().font(ARABIC_FONT_NAME, fallback)
+
+
+# Declared at import (cheap); the TTF is parsed on first arabic_font() call
+get_font_manager().declare(ARABIC_FONT_NAME, arabic_font_candidates())
+
+
+__all__ = ['shape_arabic', 'shape_markup', 'reshape_arabic', 'visual_line', 'starts_rtl',
+           'has_arabic', 'arabic_font', 'shape_cache_info', 'SHAPING_AVAILABLE']
@@ -0,0 +1,290 @@
+"""
+BrainSAIT Async Rendering
+=========================
+asyncio facade for PDF generation
+
+BRAINSAIT: Await documents from an async web tier without blocking the loop
+NEURAL: Renders run on a thread or process executor behind a concurrency
+limit; callers beyond the queue depth are rejected instead of piling up
+MEDICAL: Timeouts and cancellation release the caller immediately, while the
+concurrency slot is held until the worker is actually free
+
+    renderer = AsyncRenderer(mode='process', workers=4, max_queue=32, timeout=30)
+    pdf = await renderer.render_template('business-plan', department="Sales")
+    pdf = await generate_pdf_async(doc_gen, None, sections, renderer=renderer)
+
+Thread mode (the default) keeps the loop responsive but shares the GIL with
+it; process mode renders in parallel on pre-warmed workers, with generators
+and content sections pickled across, so on_metrics callbacks run in the
+worker.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional, Union
+
+DEFAULT_WORKERS = int(os.environ.get("BRAINSAIT_WORKERS", str(os.cpu_count() or 1)))
+
+EXECUTOR_MODES = ('thread', 'process')
+
+
+class RenderQueueFull(RuntimeError):
+    """Raised when a render is requested while the wait queue is full"""
+
+
+def _generate(generator, filename, content_sections, include_cover: bool):
+    """Worker entry point for generate_pdf (module-level so it pickles)"""
+    return generator.generate_pdf(filename, content_sections, include_cover)
+
+
+def _render_template(template_id: str, output_path, params: Dict[str, Any]):
+    from template_registry import get_template_registry
+    return get_template_registry().get(template_id).render(output_path, **params)
+
+
+def _render_job(job: Dict[str, Any]) -> bytes:
+    from render_service import render_job
+    return render_job(job)
+
+
+def _warm_process():
+    from render_service import _warm_worker
+    _warm_worker()
+
+
+class AsyncRenderer:
+    """
+    NEURAL: Bounded async front end to a render executor
+
+    Args:
+        mode: 'thread' or 'process' (ignored when executor is given)
+        workers: Executor size, and the default concurrency limit
+        max_concurrency: Renders allowed in flight at once (per event loop)
+        max_queue: Callers allowed to wait for a slot; further calls raise
+            RenderQueueFull (None waits without limit)
+        timeout: Default seconds per call, queueing included (None: no limit)
+        executor: Use this executor instead of creating one (not shut down
+            by close())
+    """
+
+    def __init__(self,
+                 mode: str = 'thread',
+                 workers: int = DEFAULT_WORKERS,
+                 max_concurrency: Optional[int] = None,
+                 max_queue: Optional[int] = None,
+                 timeout: Optional[float] = None,
+                 executor: Optional[Executor] = None):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"unknown executor mode: {mode!r}")
+        self.workers = max(1, workers)
+        self.max_concurrency = max_concurrency or self.workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+
+        self._owns_executor = executor is None
+        if executor is not None:
+            self.executor = executor
+            self.mode = 'process' if isinstance(executor, ProcessPoolExecutor) else 'thread'
+        elif mode == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                initializer=_warm_process)
+            self.mode = mode
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                               thread_name_prefix='brainsait-render')
+            self.mode = mode
+
+        # asyncio primitives belong to one event loop: one limiter per loop, so
+        # a renderer (e.g. the process-wide one) outlives successive asyncio.run()
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self.active = 0
+        self.waiting = 0
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None):
+        """
+        Run fn(*args) on the executor within the concurrency limit
+
+        Raises:
+            RenderQueueFull: If max_queue callers are already waiting
+            TimeoutError: If the call takes longer than timeout
+        """
+        timeout = self.timeout if timeout is None else timeout
+        if timeout is None:
+            return await self._run(fn, args)
+        return await asyncio.wait_for(self._run(fn, args), timeout)
+
+    async def _run(self, fn: Callable, args: tuple):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            # A semaphore refers to its loop, so closed loops are dropped here
+            for other in list(self._semaphores):
+                if other.is_closed():
+                    self._semaphores.pop(other, None)
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        if semaphore.locked():
+            if self.max_queue is not None and self.waiting >= self.max_queue:
+                raise RenderQueueFull(f"{self.waiting} renders already waiting")
+            self.waiting += 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self.waiting -= 1
+        else:
+            await semaphore.acquire()
+
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+        self.active += 1
+
+        # The slot is freed when the work finishes, not when the caller gives
+        # up: a timed-out render still occupies its worker until it returns
+        def release(_):
+            try:
+                loop.call_soon_threadsafe(self._release, semaphore)
+            except RuntimeError:  # loop already closed
+                pass
+        future.add_done_callback(release)
+
+        # Cancelling the awaiting task cancels the future if it has not started
+        return await asyncio.wrap_future(future)
+
+    def _release(self, semaphore: asyncio.Semaphore):
+        self.active -= 1
+        semaphore.release()
+
+    async def generate_pdf(self,
+                           generator,
+                           filename: Union[str, BinaryIO, None],
+                           content_sections: Iterable[Dict[str, Any]],
+                           include_cover: bool = True,
+                           timeout: Optional[float] = None):
+        """Async BrainSAITDocumentGenerator.generate_pdf (same arguments and result)"""
+        if self.mode == 'thread':
+            return await self.run(_generate, generator, filename, content_sections,
+                                  include_cover, timeout=timeout)
+
+        # Streams and generators do not cross process boundaries
+        sections = list(content_sections)
+        if filename is None or isinstance(filename, str):
+            return await self.run(_generate, generator, filename, sections,
+                                  include_cover, timeout=timeout)
+        data = await self.run(_generate, generator, None, sections,
+                              include_cover, timeout=timeout)
+        filename.write(data)
+        return filename
+
+    async def render_template(self, template_id: str, output_path: Optional[str] = None,
+                              timeout: Optional[float] = None, **params):
+        """Render a registered template (see template_registry) to a path or bytes"""
+        return await self.run(_render_template, template_id, output_path, params,
+                              timeout=timeout)
+
+    async def render_job(self, job: Dict[str, Any], timeout: Optional[float] = None) -> bytes:
+        """Validate and render a render-service job to PDF bytes"""
+        from render_service import validate_job
+        return await self.run(_render_job, validate_job(job), timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'mode': self.mode, 'workers': self.workers,
+                'max_concurrency': self.max_concurrency, 'max_queue': self.max_queue,
+                'active': self.active, 'waiting': self.waiting}
+
+    def close(self, wait: bool = True):
+        if self._owns_executor:
+            self.executor.shutdown(wait=wait)
+
+    async def __aenter__(self) -> 'AsyncRenderer':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close(wait=False)
+
+
+_default_renderer: Optional[AsyncRenderer] = None
+_default_lock = threading.Lock()
+
+
+def get_async_renderer() -> AsyncRenderer:
+    """The process-wide renderer used when none is passed (thread mode by default)"""
+    global _default_renderer
+    if _default_renderer is None:
+        with _default_lock:
+            if _default_renderer is None:
+                _default_renderer = AsyncRenderer()
+    return _default_renderer
+
+
+def set_async_renderer(renderer: Optional[AsyncRenderer]):
+    """Install the process-wide renderer (e.g. a process pool at app startup)"""
+    global _default_renderer
+    with _default_lock:
+        _default_renderer = renderer
+
+
+async def generate_pdf_async(generator,
+                             filename: Union[str, BinaryIO, None],
+                             content_sections: Iterable[Dict[str, Any]],
+                             include_cover: bool = True,
+                             timeout: Optional[float] = None,
+                             renderer: Optional[AsyncRenderer] = None):
+    """
+    BRAINSAIT: Await generator.generate_pdf without blocking the event loop
+
+    Returns what generate_pdf returns: the path or stream written to, or the
+    PDF bytes when filename is None.
+    """
+    renderer = renderer or get_async_renderer()
+    return await renderer.generate_pdf(generator, filename, content_sections,
+                                       include_cover, timeout)
+
+
+class AsyncDocumentTemplates:
+    """
+    Async counterparts of DocumentTemplates
+
+    Same arguments and results as the DocumentTemplates methods, rendered
+    through the process-wide AsyncRenderer.
+    """
+
+    @staticmethod
+    async def generate_business_plan(department: str, output_path=None,
+                                     timeout: Optional[float] = None):
+        return await get_async_renderer().render_template(
+            'business-plan', output_path, timeout, department=department)
+
+    @staticmethod
+    async def generate_business_proposal(department: str, output_path=None,
+                                         client_name: str = "Healthcare Partner",
+                                         timeout: Optional[float] = None):
+        return await get_async_renderer().render_template(
+            'proposal', output_path, timeout, department=department, client_name=client_name)
+
+    @staticmethod
+    async def generate_company_policy(department: str, output_path=None,
+                                      policy_name: str = "Information Security Policy",
+                                      timeout: Optional[float] = None):
+        return await get_async_renderer().render_template(
+            'policy', output_path, timeout, department=department, policy_name=policy_name)
+
+    @staticmethod
+    async def generate_employee_handbook(output_path=None, timeout: Optional[float] = None):
+        return await get_async_renderer().render_template(
+            'employee-handbook', output_path, timeout)
+
+    @staticmethod
+    async def generate_marketing_plan(output_path=None,
+                                      campaign_name: str = "Q1 2025 Campaign",
+                                      timeout: Optional[float] = None):
+        return await get_async_renderer().render_template(
+            'marketing-plan', output_path, timeout, campaign_name=campaign_name)
+
+
+__all__ = ['AsyncRenderer', 'AsyncDocumentTemplates', 'RenderQueueFull',
+           'generate_pdf_async', 'get_async_renderer', 'set_async_renderer']
@@ -0,0 +1,397 @@
+"""
+BrainSAIT Batch Document Runner
+===============================
+Render document job manifests with bounded concurrency
+
+BRAINSAIT: Tenant onboarding and nightly suites from a JSON/JSONL/YAML manifest
+NEURAL: Process pool with a bounded in-flight window; up-to-date jobs are skipped
+MEDICAL: Outputs are written atomically and every job is recorded in a results manifest
+
+The results manifest doubles as the build index: each output is recorded
+with a fingerprint of its parameters, template definition, design system
+constants and rendering library (ReportLab, shaping libraries, Arabic font
+and this pipeline's code), plus any table files it reads. A job is
+re-rendered only when its fingerprint changed or its output is missing or
+modified, and the reasons are reported.
+
+A manifest is a list of render jobs in the render service format, each with
+an "output" path (relative paths resolve against the output directory):
+
+    {"template": "business-plan", "department": "Sales", "output": "Sales_Plan.pdf"}
+
+Usage:
+    python batch_runner.py jobs.jsonl -o out/ -j 8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from render_service import RenderJobError, render_job, validate_job
+
+RESULTS_FILENAME = "results.json"
+
+# Modules whose code determines what a job renders
+_PIPELINE_MODULES = ('brainsait_document_system.py', 'arabic_text.py', 'font_manager.py',
+                     'template_registry.py', 'render_service.py', 'compact_flowables.py',
+                     'tabular.py', 'report_inputs.py', 'document_contents.py')
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Keys that describe how a job is reported, not what it renders
+_PRESENTATION_KEYS = ('id', 'group', 'label')
+
+
+class ManifestError(ValueError):
+    """Raised when a job manifest cannot be read"""
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Load jobs from a .json, .jsonl or .yaml/.yml manifest
+
+    JSON and YAML manifests may be a list of jobs or an object with a
+    "jobs" list.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding='utf-8') as f:
+        if ext == '.jsonl':
+            data = [json.loads(line) for line in f if line.strip()]
+        elif ext in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ManifestError("PyYAML is required for YAML manifests")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+
+    if isinstance(data, dict):
+        data = data.get('jobs')
+    if not isinstance(data, list):
+        raise ManifestError(f"{path}: manifest must be a list of jobs")
+    return data
+
+
+def job_hash(job: Dict[str, Any]) -> str:
+    """Stable hash of the parts of a job that affect its output"""
+    spec = {k: v for k, v in job.items() if k not in _PRESENTATION_KEYS}
+    payload = json.dumps(spec, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def environment_fingerprint() -> Dict[str, str]:
+    """
+    Fingerprints shared by every job in a run
+
+    design: the design system and palette constants
+    library: ReportLab and shaping library versions, the Arabic font file
+        and the source of the rendering pipeline
+    """
+    import reportlab
+    from arabic_text import ARABIC_FONT_NAME, SHAPING_AVAILABLE
+    from brainsait_document_system import BrainSAITColors, BrainSAITDesignSystem, _design_key
+    from font_manager import get_font_manager
+
+    font_path = get_font_manager().path(ARABIC_FONT_NAME)
+    code = hashlib.sha256()
+    for name in _PIPELINE_MODULES:
+        with open(os.path.join(_HERE, name), 'rb') as f:
+            code.update(f.read())
+
+    library = {
+        'reportlab': reportlab.Version,
+        'python': platform.python_version(),
+        'shaping': SHAPING_AVAILABLE and [_package_version('arabic-reshaper'),
+                                          _package_version('python-bidi')],
+        'arabic_font': font_path and [font_path, os.path.getsize(font_path)],
+        'code': code.hexdigest(),
+    }
+    return {
+        'design': _digest(_design_key(BrainSAITDesignSystem, BrainSAITColors)),
+        'library': _digest(library),
+    }
+
+
+def _package_version(name: str) -> Optional[str]:
+    from importlib import metadata
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def job_fingerprint(job: Dict[str, Any], environment: Dict[str, str]) -> Dict[str, str]:
+    """Fingerprint of everything a job's output depends on (see environment_fingerprint)"""
+    from template_registry import get_template_registry
+
+    from tabular import source_files
+
+    registry = get_template_registry()
+    template = job.get('template')
+    fingerprint = {
+        'params': job_hash(job),
+        'template': registry.get(template).fingerprint if template in registry else template,
+        'design': environment['design'],
+        'library': environment['library'],
+    }
+    # Data read from files (a custom job's sections_file, table sources)
+    files = source_files(job.get('sections'))
+    if isinstance(job.get('sections_file'), str):
+        files.append(job['sections_file'])
+    if files:
+        stats = []
+        for path in files:
+            try:
+                stat = os.stat(path)
+                stats.append([path, stat.st_size, stat.st_mtime_ns])
+            except OSError:
+                stats.append([path, None, None])
+        fingerprint['inputs'] = _digest(stats)
+    return fingerprint
+
+
+def resolve_output(job: Dict[str, Any], output_dir: str) -> str:
+    output = job.get('output')
+    if not output:
+        raise RenderJobError("output is required")
+    return output if os.path.isabs(output) else os.path.join(output_dir, output)
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Previous results keyed by output path (empty if none were written)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            results = json.load(f).get('results', [])
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return {r['path']: r for r in results if r.get('path')}
+
+
+def write_results(path: str, results: List[Dict[str, Any]]):
+    """Write the results manifest atomically"""
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    payload = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'summary': summary,
+        'results': results,
+    }
+    _write_atomic(path, (json.dumps(payload, indent=2, ensure_ascii=False) + "\n").encode('utf-8'))
+
+
+def update_results(path: str, results: List[Dict[str, Any]]):
+    """Merge results into an existing results manifest, replacing entries for the same outputs"""
+    merged = load_results(path)
+    for result in results:
+        merged[result.get('path') or result['id']] = result
+    write_results(path, list(merged.values()))
+
+
+def _write_atomic(path: str, data: bytes):
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def rebuild_reasons(path: str, fingerprint: Dict[str, str],
+                    previous: Optional[Dict[str, Any]]) -> List[str]:
+    """Why an output must be rendered again (empty when it is up to date)"""
+    if not previous:
+        return ["new output"]
+    if previous.get('status') not in ('ok', 'skipped'):
+        return ["previous render failed"]
+
+    recorded = previous.get('fingerprint')
+    if not isinstance(recorded, dict):
+        return ["no fingerprint recorded"]
+    reasons = [f"{key} changed" for key in fingerprint if recorded.get(key) != fingerprint[key]]
+
+    try:
+        if os.path.getsize(path) != previous.get('size'):
+            reasons.append("output modified")
+    except OSError:
+        reasons.append("output missing")
+    return reasons
+
+
+def execute_job(job: Dict[str, Any], path: str) -> Dict[str, Any]:
+    """
+    Render one job to its output path, reporting errors instead of raising
+
+    Module-level so it can be pickled into ProcessPoolExecutor workers.
+    """
+    start = time.perf_counter()
+    try:
+        data = render_job(job, allow_files=True)
+        _write_atomic(path, data)
+    except Exception as e:
+        return {'status': 'failed', 'error': str(e),
+                'duration_s': round(time.perf_counter() - start, 4)}
+    return {'status': 'ok', 'size': len(data),
+            'duration_s': round(time.perf_counter() - start, 4)}
+
+
+def plan_jobs(jobs: List[Dict[str, Any]],
+              output_dir: str = ".",
+              previous: Optional[Dict[str, Dict[str, Any]]] = None,
+              force: bool = False) -> Tuple[List[Optional[Dict[str, Any]]], List[tuple]]:
+    """
+    Validate jobs and work out which ones must be rendered
+
+    Returns (results, pending): results holds the final result of every job
+    that needs no render (invalid or up to date) and None for the others;
+    pending holds (index, job, path, result) for each job to render, where
+    result already carries its id, path, fingerprint and rebuild reasons.
+    """
+    previous = previous or {}
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    pending = []
+    environment = environment_fingerprint()
+
+    for index, job in enumerate(jobs):
+        result = {'id': job.get('id', index) if isinstance(job, dict) else index}
+        try:
+            # Manifests are trusted: their jobs may read extracts from disk
+            job = validate_job(job, allow_files=True)
+            path = resolve_output(job, output_dir)
+        except RenderJobError as e:
+            results[index] = dict(result, status='failed', error=str(e))
+            continue
+
+        fingerprint = job_fingerprint(job, environment)
+        reasons = ["forced"] if force else rebuild_reasons(path, fingerprint, previous.get(path))
+        result.update(path=path, fingerprint=fingerprint)
+        if not reasons:
+            results[index] = dict(result, status='skipped', size=previous[path]['size'],
+                                  duration_s=0.0)
+            continue
+        result['reasons'] = reasons
+        pending.append((index, job, path, result))
+    return results, pending
+
+
+def run_jobs(jobs: List[Dict[str, Any]],
+             output_dir: str = ".",
+             workers: int = 1,
+             previous: Optional[Dict[str, Dict[str, Any]]] = None,
+             force: bool = False,
+             on_result: Optional[Callable[[int, Dict[str, Any]], None]] = None
+             ) -> List[Dict[str, Any]]:
+    """
+    Run a list of jobs and return one result per job, in manifest order
+
+    Args:
+        jobs: Render jobs, each with an "output" path
+        output_dir: Directory relative output paths resolve against
+        workers: Worker processes (1 renders in this process)
+        previous: Earlier results by path (see load_results); outputs whose
+            fingerprint matches and whose file is unchanged are skipped
+            unless force is set
+        force: Re-render every job
+        on_result: Called with (index, result) as each job finishes
+    """
+    results, pending = plan_jobs(jobs, output_dir, previous, force)
+
+    def finish(index: int, result: Dict[str, Any]):
+        results[index] = result
+        if on_result is not None:
+            on_result(index, result)
+
+    if on_result is not None:
+        for index, result in enumerate(results):
+            if result is not None:
+                on_result(index, result)
+
+    if workers <= 1:
+        for index, job, path, result in pending:
+            finish(index, dict(result, **execute_job(job, path)))
+        return results
+
+    # Keep at most 2x workers jobs in flight so huge manifests stay bounded
+    window = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = {}
+        queue = iter(pending)
+        while True:
+            for index, job, path, result in queue:
+                in_flight[executor.submit(execute_job, job, path)] = (index, result)
+                if len(in_flight) >= window:
+                    break
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, result = in_flight.pop(future)
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = {'status': 'failed', 'error': f"worker error: {e}"}
+                finish(index, dict(result, **outcome))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render a BrainSAIT document job manifest")
+    parser.add_argument("manifest", help="job manifest (.json, .jsonl, .yaml)")
+    parser.add_argument("-o", "--output-dir", default=".",
+                        help="directory for relative output paths (default: current directory)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: %(default)s)")
+    parser.add_argument("--results", help=f"results manifest path "
+                                          f"(default: <output-dir>/{RESULTS_FILENAME})")
+    parser.add_argument("--force", action="store_true", help="re-render up-to-date outputs")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+
+    results_path = args.results or os.path.join(args.output_dir, RESULTS_FILENAME)
+    previous = {} if args.force else load_results(results_path)
+
+    def report(index: int, result: Dict[str, Any]):
+        mark = {'ok': '✓', 'skipped': '·'}.get(result['status'], '✗')
+        line = f"  {mark} [{index + 1}/{len(jobs)}] {result.get('path', result['id'])}"
+        if result.get('error'):
+            line += f" - {result['error']}"
+        elif result.get('reasons'):
+            line += f" ({', '.join(result['reasons'])})"
+        print(line)
+
+    results = run_jobs(jobs, args.output_dir, args.workers, previous, args.force, report)
+    write_results(results_path, results)
+
+    failed = sum(1 for r in results if r['status'] == 'failed')
+    skipped = sum(1 for r in results if r['status'] == 'skipped')
+    print(f"{len(results) - failed}/{len(results)} jobs succeeded "
+          f"({len(results) - failed - skipped} rendered, {skipped} up to date); "
+          f"results: {results_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
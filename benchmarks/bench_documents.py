@@ -0,0 +1,329 @@
+"""
+BrainSAIT Document Pipeline Benchmarks
+======================================
+Reproducible benchmarks for the PDF generation pipeline
+
+NEURAL: Synthetic fixtures scaled by sections, paragraphs, table rows and
+Arabic/English mix, plus the stock DocumentTemplates builders
+
+Each scenario runs in a fresh process so peak RSS is per scenario. Import
+scenarios time a cold import in a new interpreter and carry a target; the run
+exits non-zero when one is missed. Results are written as JSON and can be
+compared against a previous run:
+
+    python benchmarks/bench_documents.py --output bench.json
+    python benchmarks/bench_documents.py --baseline bench.json --threshold 0.10
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+# Fixed timestamp so output sizes are stable between runs
+FIXED_TIMESTAMP = datetime(2025, 1, 1)
+
+ENGLISH_TEXT = ("BrainSAIT delivers NPHIES-compliant, bilingual healthcare technology "
+                "with <b>HIPAA</b> safeguards, audit logging and role-based access control.")
+ARABIC_TEXT = "تقدم برين سايت حلول الذكاء الاصطناعي للرعاية الصحية المتوافقة مع نفيس"
+
+# Cold-start budget for importing the document modules (no ReportLab loaded)
+IMPORT_TARGET_S = 0.10
+
+# Page objects in a PDF (excluding the /Pages tree node)
+_PAGE_OBJECT = re.compile(rb'/Type\s*/Page(?![a-zA-Z])')
+
+
+# ---------------------------------------------------------------------------
+# Synthetic fixtures
+# ---------------------------------------------------------------------------
+
+def make_sections(sections: int, paragraphs: int, table_rows: int = 0,
+                  arabic_ratio: float = 0.0) -> List[Dict[str, Any]]:
+    """Build deterministic content sections for a benchmark scenario"""
+    arabic_every = int(1 / arabic_ratio) if arabic_ratio else 0
+    result = []
+    for s in range(sections):
+        content = []
+        for p in range(paragraphs):
+            if arabic_every and p % arabic_every == 0:
+                content.append(ARABIC_TEXT)
+            else:
+                content.append(f"{s}.{p} {ENGLISH_TEXT}")
+        section = {
+            'title': f"Section {s + 1}",
+            'title_ar': f"القسم {s + 1}" if arabic_ratio else '',
+            'level': 1,
+            'content': content,
+        }
+        if table_rows:
+            section['table'] = {
+                'headers': ['Claim', 'Provider', 'Amount (SAR)', 'Status'],
+                'data': [[f"CLM-{s:03d}-{r:06d}", "King Fahad Medical City",
+                          f"{(r * 37) % 10000:.2f}", "Approved" if r % 3 else "Pending"]
+                         for r in range(table_rows)],
+            }
+        result.append(section)
+    return result
+
+
+def _generator(title: str = "Benchmark Document", table_of_contents: bool = False):
+    from brainsait_document_system import BrainSAITDocumentGenerator
+    return BrainSAITDocumentGenerator(
+        document_type="Benchmark",
+        department="Technology",
+        title_en=title,
+        title_ar="وثيقة اختبار الأداء",
+        generated_at=FIXED_TIMESTAMP,
+        table_of_contents=table_of_contents
+    )
+
+
+# ---------------------------------------------------------------------------
+# Scenario runners
+# ---------------------------------------------------------------------------
+
+def run_generate_pdf(sections: int, paragraphs: int, table_rows: int = 0,
+                     arabic_ratio: float = 0.0, table_of_contents: bool = False) -> bytes:
+    content_sections = make_sections(sections, paragraphs, table_rows, arabic_ratio)
+    return _generator(table_of_contents=table_of_contents).generate_pdf(None, content_sections)
+
+
+def run_create_table(rows: int) -> None:
+    from reportlab.lib.pagesizes import letter
+    doc_gen = _generator()
+    data = make_sections(1, 0, rows)[0]['table']
+    table = doc_gen.create_table(data['data'], data['headers'])
+    table.wrap(letter[0], letter[1])
+
+
+def run_bullet_list(items: int) -> bytes:
+    doc_gen = _generator()
+    bullets = doc_gen.create_bullet_list(
+        f"Step {i}: verify eligibility and submit the <b>claim</b> record" if i % 10 == 0
+        else f"Step {i}: verify eligibility and submit the claim record" for i in range(items))
+    return doc_gen.generate_pdf(None, [{'title': "Procedure", 'content': bullets}])
+
+
+def run_create_cover_page(count: int) -> None:
+    doc_gen = _generator()
+    for _ in range(count):
+        doc_gen.create_cover_page(FIXED_TIMESTAMP)
+
+
+def run_template(method: str, *args) -> bytes:
+    from document_templates import DocumentTemplates
+    return getattr(DocumentTemplates, method)(*args)
+
+
+def run_template_languages(template_id: str, department: str) -> bytes:
+    """Render the English and Arabic variants together (pages of both are counted)"""
+    from template_registry import get_template_registry
+    outputs = get_template_registry().get(template_id).render_languages(
+        {'en': None, 'ar': None}, department=department)
+    return outputs['en'] + outputs['ar']
+
+
+def check_arabic_font(pdf: bytes):
+    """Fail unless the Arabic TTF is embedded (Arabic was not drawn in a base-14 font)"""
+    from reportlab.pdfbase.pdfmetrics import getFont
+    from arabic_text import ARABIC_FONT_NAME, arabic_font
+    if arabic_font('Helvetica') != ARABIC_FONT_NAME:
+        raise RuntimeError("no Arabic TTF found; set BRAINSAIT_ARABIC_FONT")
+    face = getFont(ARABIC_FONT_NAME).face.name
+    if not re.search(rb'/BaseFont /[A-Z]{6}\+' + re.escape(face) + rb'\b', pdf):
+        raise AssertionError(f"Arabic font {face.decode()} is not embedded in the output")
+
+
+def run_import(module: str) -> float:
+    """Import a module in a fresh interpreter and return the import time in seconds"""
+    code = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"import {module}\n"
+            "elapsed = time.perf_counter() - start\n"
+            "assert 'reportlab.platypus' not in sys.modules, 'ReportLab loaded at import'\n"
+            "print(elapsed)")
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout)
+
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    # Import scenarios report the import time and peak RSS of the new interpreter
+    'import/brainsait_document_system': {'run': run_import,
+                                         'args': ('brainsait_document_system',),
+                                         'self_timed': True, 'child_process': True,
+                                         'target_s': IMPORT_TARGET_S},
+    'import/document_templates': {'run': run_import, 'args': ('document_templates',),
+                                  'self_timed': True, 'child_process': True,
+                                  'target_s': IMPORT_TARGET_S},
+    'generate_pdf/small': {'run': run_generate_pdf, 'args': (5, 5)},
+    'generate_pdf/medium': {'run': run_generate_pdf, 'args': (20, 10, 20, 0.25)},
+    'generate_pdf/large': {'run': run_generate_pdf, 'args': (60, 20, 40, 0.25)},
+    'generate_pdf/large_contents': {'run': run_generate_pdf, 'args': (60, 20, 40, 0.25, True)},
+    # Arabic body text is shaped and subset into the Arabic TTF (checked)
+    'generate_pdf/arabic_heavy': {'run': run_generate_pdf, 'args': (20, 10, 0, 1.0),
+                                  'check': check_arabic_font},
+    'generate_pdf/table_10k': {'run': run_generate_pdf, 'args': (1, 1, 10000)},
+    'create_table/1k': {'run': run_create_table, 'args': (1000,)},
+    'bullet_list/5k': {'run': run_bullet_list, 'args': (5000,)},
+    'create_cover_page/x100': {'run': run_create_cover_page, 'args': (100,)},
+    'templates/business_plan': {'run': run_template,
+                                'args': ('generate_business_plan', 'Technology', None)},
+    'templates/business_proposal': {'run': run_template,
+                                    'args': ('generate_business_proposal', 'Sales', None)},
+    'templates/company_policy': {'run': run_template,
+                                 'args': ('generate_company_policy', 'Legal', None)},
+    'templates/employee_handbook': {'run': run_template,
+                                    'args': ('generate_employee_handbook', None)},
+    'templates/marketing_plan': {'run': run_template,
+                                 'args': ('generate_marketing_plan', None)},
+    'templates/business_plan_en_ar': {'run': run_template_languages,
+                                      'args': ('business-plan', 'Technology')},
+}
+
+
+def count_pages(pdf: bytes) -> int:
+    """Count page objects in a ReportLab-generated PDF"""
+    return len(_PAGE_OBJECT.findall(pdf))
+
+
+def _measure(name: str, repeat: int) -> Dict[str, Any]:
+    """Run one scenario (in a fresh worker process) and collect its metrics"""
+    scenario = SCENARIOS[name]
+    run: Callable = scenario['run']
+
+    # Warm-up run pays import and first-use costs outside the timings
+    output = run(*scenario['args'])
+    if 'check' in scenario:
+        scenario['check'](output)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = run(*scenario['args'])
+        timings.append(output if scenario.get('self_timed')
+                       else time.perf_counter() - start)
+
+    wall = statistics.median(timings)
+    # Scenarios that run in a child interpreter report the child's peak RSS
+    who = resource.RUSAGE_CHILDREN if scenario.get('child_process') else resource.RUSAGE_SELF
+    result = {
+        'wall_s': round(wall, 6),
+        'wall_min_s': round(min(timings), 6),
+        'repeat': repeat,
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        'peak_rss_kb': resource.getrusage(who).ru_maxrss
+                       // (1024 if sys.platform == 'darwin' else 1),
+    }
+    if 'target_s' in scenario:
+        result['target_s'] = scenario['target_s']
+        result['meets_target'] = wall <= scenario['target_s']
+    if isinstance(output, bytes):
+        pages = count_pages(output)
+        result.update({
+            'pages': pages,
+            'pages_per_s': round(pages / wall, 2) if wall else None,
+            'output_bytes': len(output),
+        })
+    return result
+
+
+def run_benchmarks(names: List[str], repeat: int) -> Dict[str, Any]:
+    """Run scenarios, each in its own spawned process"""
+    results = {}
+    context = get_context('spawn')
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[name] = executor.submit(_measure, name, repeat).result()
+        print(f"  {name:<32} {results[name]['wall_s'] * 1000:10.1f} ms", file=sys.stderr)
+
+    import reportlab
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'reportlab': reportlab.Version,
+            'platform': platform.platform(),
+        },
+        'scenarios': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float) -> List[Dict[str, Any]]:
+    """Compare wall time and peak RSS per scenario against a baseline run"""
+    rows = []
+    for name, metrics in current['scenarios'].items():
+        base = baseline.get('scenarios', {}).get(name)
+        if not base:
+            continue
+        row = {'scenario': name}
+        for metric in ('wall_s', 'peak_rss_kb'):
+            if base.get(metric):
+                change = metrics[metric] / base[metric] - 1
+                row[metric] = round(change, 4)
+                if metric == 'wall_s' and change > threshold:
+                    row['regression'] = True
+        rows.append(row)
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the BrainSAIT document pipeline")
+    parser.add_argument("-o", "--output", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("-b", "--baseline", help="compare against a previous JSON result")
+    parser.add_argument("-t", "--threshold", type=float, default=0.10,
+                        help="relative wall-time slowdown that counts as a regression")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="timed runs per scenario")
+    parser.add_argument("-k", "--select", action="append",
+                        help="only run scenarios whose name contains this (repeatable)")
+    parser.add_argument("--list", action="store_true", help="list scenarios and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(SCENARIOS))
+        return 0
+
+    names = [name for name in SCENARIOS
+             if not args.select or any(sel in name for sel in args.select)]
+    results = run_benchmarks(names, args.repeat)
+
+    exit_code = 0
+    missed = [name for name, metrics in results['scenarios'].items()
+              if metrics.get('meets_target') is False]
+    if missed:
+        print(f"  target missed: {', '.join(missed)}", file=sys.stderr)
+        exit_code = 1
+    if args.baseline:
+        with open(args.baseline) as f:
+            comparison = compare(results, json.load(f), args.threshold)
+        results['comparison'] = comparison
+        if any(row.get('regression') for row in comparison):
+            exit_code = 1
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,37 +8,69 @@ BRAINSAIT: Enterprise document templates with bilingual support
 MEDICAL: HIPAA-compliant document handling with audit trails
 NEURAL: Branded design system with BrainSAIT colors and styling
 BILINGUAL: Full Arabic/English RTL/LTR support
+
+BILINGUAL: Documents render as English (LTR) or Arabic (RTL) variants, and
+generate_pdf_languages emits both from one set of prepared sections
+
+NEURAL: ReportLab is imported when rendering starts, not at module import, so
+listing templates or validating a manifest does not pay for platypus,
+pdfbase and the TTF machinery.
 """
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle,
-    Image, Frame, PageTemplate, BaseDocTemplate, KeepTogether
-)
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from __future__ import annotations
+
+from datetime import date, datetime
+from itertools import islice
+from typing import (TYPE_CHECKING, Dict, List, Optional, Any, BinaryIO, Callable, Iterable,
+                    Iterator, Sequence, Union)
+import copy
+import cProfile
+import io
 import os
+import re
+import threading
+import time
+
+from arabic_text import arabic_font, has_arabic, reshape_arabic, shape_arabic, shape_markup, starts_rtl
+from render_cache import RenderCache, cache_key, get_default_cache
+from tabular import is_tabular_source, iter_column_chunks, iter_rows, source_files, table_source
+
+if TYPE_CHECKING:
+    from reportlab.lib.styles import ParagraphStyle, StyleSheet1
+    from reportlab.platypus import Table, TableStyle
+
+# Points per inch (reportlab.lib.units.inch) and US letter (reportlab.lib.pagesizes.letter)
+inch = 72.0
+letter = (612.0, 792.0)
+
+
+class _PaletteColor:
+    """Palette entry resolved to a ReportLab color on first access"""
+    
+    def __init__(self, value: str):
+        self.value = value
+        self.color = None
+    
+    def __get__(self, instance, owner):
+        if self.color is None:
+            from reportlab.lib import colors
+            self.color = (getattr(colors, self.value) if not self.value.startswith('#')
+                          else colors.HexColor(self.value))
+        return self.color
 
 
 # BRAINSAIT: Brand Colors Configuration
 class BrainSAITColors:
     """BrainSAIT official color palette for all documents"""
-    MIDNIGHT_BLUE = colors.HexColor('#1a365d')
-    MEDICAL_BLUE = colors.HexColor('#2b6cb8')
-    SIGNAL_TEAL = colors.HexColor('#0ea5e9')
-    DEEP_ORANGE = colors.HexColor('#ea580c')
-    PROFESSIONAL_GRAY = colors.HexColor('#64748b')
-    WHITE = colors.white
-    BLACK = colors.black
-    LIGHT_GRAY = colors.HexColor('#f1f5f9')
-    BORDER_GRAY = colors.HexColor('#cbd5e1')
+    MIDNIGHT_BLUE = _PaletteColor('#1a365d')
+    MEDICAL_BLUE = _PaletteColor('#2b6cb8')
+    SIGNAL_TEAL = _PaletteColor('#0ea5e9')
+    DEEP_ORANGE = _PaletteColor('#ea580c')
+    PROFESSIONAL_GRAY = _PaletteColor('#64748b')
+    WHITE = _PaletteColor('white')
+    BLACK = _PaletteColor('black')
+    LIGHT_GRAY = _PaletteColor('#f1f5f9')
+    BORDER_GRAY = _PaletteColor('#cbd5e1')
 
 
 # NEURAL: Design System Configuration
@@ -71,6 +103,9 @@ class BrainSAITDesignSystem:
     SPACER_MEDIUM = 0.3 * inch
     SPACER_SMALL = 0.15 * inch
     
+    # Streaming: table rows per sub-table (roughly one page of body rows)
+    TABLE_CHUNK_ROWS = 20
+    
     # Document Metadata
     COMPANY_NAME_EN = "BrainSAIT"
     COMPANY_NAME_AR = "برين سايت"
@@ -83,6 +118,290 @@ class BrainSAITDesignSystem:
     SECURITY_CLASSIFICATION_AR = "سري - محمي بموجب HIPAA"
 
 
+# NEURAL: Shared style registry
+# Paragraph styles depend only on the design system and palette constants, so
+# they are built once per process per configuration and shared by every
+# generator. Per-document changes go through DocumentStyles overrides.
+_STYLE_REGISTRY: Dict[tuple, 'StyleRegistry'] = {}
+_STYLE_REGISTRY_LOCK = threading.Lock()
+
+# BILINGUAL: Document languages; 'ar' is the right-to-left variant
+SUPPORTED_LANGUAGES = ('en', 'ar')
+
+# Cover page info labels in the Arabic variant
+_COVER_LABELS_AR = {
+    'Document Type:': 'نوع الوثيقة:',
+    'Department:': 'القسم:',
+    'Version:': 'الإصدار:',
+    'Date:': 'التاريخ:',
+    'Author:': 'المؤلف:',
+    'Classification:': 'التصنيف:',
+}
+
+
+def _build_style_sheet(design, palette) -> StyleSheet1:
+    """Build the BrainSAIT paragraph styles for one design configuration"""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_RIGHT
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    
+    styles = getSampleStyleSheet()
+    
+    # NEURAL: Custom styles with BrainSAIT branding
+    styles.add(ParagraphStyle(
+        name='BrainSAITTitle',
+        parent=styles['Title'],
+        fontSize=design.SIZE_TITLE,
+        textColor=palette.MIDNIGHT_BLUE,
+        spaceAfter=20,
+        alignment=TA_CENTER,
+        fontName=design.FONT_TITLE
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='BrainSAITSubtitle',
+        parent=styles['Heading1'],
+        fontSize=design.SIZE_SUBTITLE,
+        textColor=palette.MEDICAL_BLUE,
+        spaceAfter=15,
+        spaceBefore=10,
+        fontName=design.FONT_SUBTITLE
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='BrainSAITHeading1',
+        parent=styles['Heading1'],
+        fontSize=design.SIZE_HEADING1,
+        textColor=palette.MEDICAL_BLUE,
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName=design.FONT_SUBTITLE,
+        borderPadding=5,
+        leftIndent=0,
+        borderColor=palette.SIGNAL_TEAL,
+        borderWidth=0,
+        borderRadius=0
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='BrainSAITHeading2',
+        parent=styles['Heading2'],
+        fontSize=design.SIZE_HEADING2,
+        textColor=palette.PROFESSIONAL_GRAY,
+        spaceAfter=10,
+        spaceBefore=10,
+        fontName=design.FONT_BODY_BOLD
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='BrainSAITBody',
+        parent=styles['Normal'],
+        fontSize=design.SIZE_BODY,
+        textColor=colors.black,
+        spaceAfter=8,
+        alignment=TA_JUSTIFY,
+        fontName=design.FONT_BODY
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='BrainSAITBullet',
+        parent=styles['Normal'],
+        fontSize=design.SIZE_BODY,
+        textColor=colors.black,
+        spaceAfter=6,
+        leftIndent=20,
+        bulletIndent=10,
+        fontName=design.FONT_BODY
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='BrainSAITArabic',
+        parent=styles['Normal'],
+        fontSize=design.SIZE_BODY,
+        textColor=colors.black,
+        spaceAfter=8,
+        alignment=TA_RIGHT,
+        fontName=arabic_font(design.FONT_ARABIC)
+    ))
+    
+    # BILINGUAL: Body text and bullets that read right-to-left (see
+    # BrainSAITDocumentGenerator.text_paragraph)
+    styles.add(ParagraphStyle(
+        name='BrainSAITArabicBody',
+        parent=styles['BrainSAITBody'],
+        alignment=TA_RIGHT,
+        fontName=arabic_font(design.FONT_ARABIC)
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='BrainSAITArabicBullet',
+        parent=styles['BrainSAITBullet'],
+        alignment=TA_RIGHT,
+        leftIndent=0,
+        rightIndent=styles['BrainSAITBullet'].leftIndent,
+        fontName=arabic_font(design.FONT_ARABIC)
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='BrainSAITHighlight',
+        parent=styles['Normal'],
+        fontSize=design.SIZE_BODY,
+        textColor=palette.MEDICAL_BLUE,
+        spaceAfter=8,
+        fontName=design.FONT_BODY_BOLD,
+        backColor=palette.LIGHT_GRAY,
+        borderPadding=8
+    ))
+    
+    return styles
+
+
+# Right-to-left counterparts of the text styles (see text_paragraph)
+_RTL_TEXT_STYLES = {'BrainSAITBody': 'BrainSAITArabicBody',
+                    'BrainSAITBullet': 'BrainSAITArabicBullet'}
+
+
+def _build_rtl_style_sheet(base: StyleSheet1, design) -> StyleSheet1:
+    """
+    BILINGUAL: Arabic (RTL) variant of a style sheet
+    
+    Headings, titles, body text and bullets are re-derived right-aligned in
+    the Arabic font; every other style is the base sheet's own object, so
+    language-independent work keyed by style (e.g. the parse cache) is shared.
+    """
+    from reportlab.lib.enums import TA_RIGHT
+    from reportlab.lib.styles import ParagraphStyle, StyleSheet1
+    
+    styles = StyleSheet1()
+    styles.byName.update(base.byName)
+    styles.byAlias.update(base.byAlias)
+    
+    font = arabic_font(design.FONT_ARABIC)
+    rtl = {
+        'BrainSAITTitle': {'fontName': font},
+        'BrainSAITHeading1': {'fontName': font, 'alignment': TA_RIGHT},
+        'BrainSAITHeading2': {'fontName': font, 'alignment': TA_RIGHT},
+        'BrainSAITBody': {'fontName': font, 'alignment': TA_RIGHT},
+        'BrainSAITBullet': {'fontName': font, 'alignment': TA_RIGHT, 'leftIndent': 0,
+                            'bulletIndent': 0,
+                            'rightIndent': base['BrainSAITBullet'].leftIndent},
+    }
+    for name, attrs in rtl.items():
+        styles.byName[name] = ParagraphStyle(name=name, parent=base[name], **attrs)
+    return styles
+
+
+def _design_key(design, palette) -> tuple:
+    """Stable, hashable key for a design system / palette configuration"""
+    def constants(obj):
+        items = []
+        for name in dir(obj):
+            if not name.isupper():
+                continue
+            value = getattr(obj, name)
+            if hasattr(value, 'hexval'):
+                value = value.hexval()
+            items.append((name, value))
+        return tuple(items)
+    return constants(design), constants(palette)
+
+
+class StyleRegistry:
+    """
+    NEURAL: Read-only view of a shared, pre-built style sheet
+    
+    Instances are shared across generators (and threads), so styles must never
+    be mutated in place; use DocumentStyles overrides instead.
+    """
+    
+    def __init__(self, sheet: StyleSheet1):
+        self._sheet = sheet
+    
+    def __getitem__(self, name: str) -> ParagraphStyle:
+        return self._sheet[name]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._sheet
+    
+    def get(self, name: str, default=None):
+        return self._sheet.get(name, default)
+    
+    def names(self) -> List[str]:
+        return list(self._sheet.byName.keys())
+
+
+def get_style_registry(design=BrainSAITDesignSystem,
+                       palette=BrainSAITColors,
+                       language: str = 'en') -> StyleRegistry:
+    """
+    Return the process-wide style registry for a design configuration
+    
+    The registry is built on first use and cached by the values of the
+    design system and palette constants, and the language ('ar' registries
+    layer RTL styles over the 'en' one).
+    """
+    if language not in SUPPORTED_LANGUAGES:
+        raise ValueError(f"unsupported language: {language!r}")
+    key = _design_key(design, palette) + (language,)
+    registry = _STYLE_REGISTRY.get(key)
+    if registry is None:
+        base = get_style_registry(design, palette) if language == 'ar' else None
+        with _STYLE_REGISTRY_LOCK:
+            registry = _STYLE_REGISTRY.get(key)
+            if registry is None:
+                if base is not None:
+                    registry = StyleRegistry(_build_rtl_style_sheet(base._sheet, design))
+                else:
+                    registry = StyleRegistry(_build_style_sheet(design, palette))
+                _STYLE_REGISTRY[key] = registry
+    return registry
+
+
+class DocumentStyles:
+    """
+    BRAINSAIT: Per-document style layer on top of the shared registry
+    
+    Lookups check this document's overrides first and fall back to the shared
+    registry. Overrides derive from the registry style of the same name, so
+    only the changed attributes need to be given.
+    """
+    
+    def __init__(self,
+                 registry: StyleRegistry,
+                 overrides: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.registry = registry
+        self._local: Dict[str, ParagraphStyle] = {}
+        for name, attrs in (overrides or {}).items():
+            self.override(name, **attrs)
+    
+    def override(self, name: str, **attrs) -> ParagraphStyle:
+        """Derive a document-local variant of a style"""
+        from reportlab.lib.styles import ParagraphStyle
+        
+        parent = self[name]
+        style = ParagraphStyle(name=name, parent=parent, **attrs)
+        self._local[name] = style
+        return style
+    
+    def add(self, style: ParagraphStyle, alias: Optional[str] = None):
+        """Add a document-local style (StyleSheet1-compatible signature)"""
+        self._local[style.name] = style
+        if alias:
+            self._local[alias] = style
+    
+    def __getitem__(self, name: str) -> ParagraphStyle:
+        style = self._local.get(name)
+        if style is None:
+            style = self.registry[name]
+        return style
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self._local or name in self.registry
+    
+    def get(self, name: str, default=None):
+        return self[name] if name in self else default
+
+
 class DocumentHeaderFooter:
     """
     BRAINSAIT: Custom header and footer for all documents
@@ -93,15 +412,54 @@ class DocumentHeaderFooter:
                  document_type: str,
                  department: str,
                  classification: str = "INTERNAL USE",
-                 show_watermark: bool = False):
+                 show_watermark: bool = False,
+                 generated_at: Optional[date] = None,
+                 form_suffix: str = ""):
         self.document_type = document_type
         self.department = department
         self.classification = classification
         self.show_watermark = show_watermark
+        self.generated_at = generated_at
         self.colors = BrainSAITColors()
+        # Distinct suffixes let several headers/footers share one canvas (bundles)
+        self.header_form = self.HEADER_FORM + form_suffix
+        self.footer_form = self.FOOTER_FORM + form_suffix
         
+    # Form XObject names for the static page chrome (one definition per document)
+    HEADER_FORM = 'BrainSAITHeader'
+    FOOTER_FORM = 'BrainSAITFooter'
+    
     def header(self, canvas, doc):
         """Draw document header with branding"""
+        # NEURAL: The header is fully static; record it once, stamp it per page
+        if not canvas.hasForm(self.header_form):
+            canvas.beginForm(self.header_form)
+            self._draw_header_static(canvas)
+            canvas.endForm()
+        canvas.doForm(self.header_form)
+    
+    def footer(self, canvas, doc):
+        """Draw document footer with page numbers and security info"""
+        if not canvas.hasForm(self.footer_form):
+            canvas.beginForm(self.footer_form)
+            self._draw_footer_static(canvas)
+            canvas.endForm()
+        canvas.doForm(self.footer_form)
+        
+        # Page number and timestamp are the only per-page content
+        canvas.saveState()
+        width, height = letter
+        canvas.setFont(BrainSAITDesignSystem.FONT_BODY, 9)
+        canvas.setFillColor(self.colors.PROFESSIONAL_GRAY)
+        generated_at = self.generated_at or datetime.now()
+        # A pinned day (a date, see render_cache) prints without a time of day
+        stamp = generated_at.strftime('%Y-%m-%d %H:%M' if isinstance(generated_at, datetime)
+                                      else '%Y-%m-%d')
+        page_num = f"Page {doc.page} | Generated: {stamp}"
+        canvas.drawCentredString(width/2, 0.35*inch, page_num)
+        canvas.restoreState()
+    
+    def _draw_header_static(self, canvas):
         canvas.saveState()
         width, height = letter
         
@@ -121,9 +479,9 @@ class DocumentHeaderFooter:
                          BrainSAITDesignSystem.COMPANY_NAME_EN)
         
         # Arabic company name (right-aligned)
-        canvas.setFont(BrainSAITDesignSystem.FONT_ARABIC, 14)
+        canvas.setFont(arabic_font(BrainSAITDesignSystem.FONT_ARABIC), 14)
         canvas.drawRightString(width - 0.75*inch, height - 0.3*inch,
-                              BrainSAITDesignSystem.COMPANY_NAME_AR)
+                              shape_arabic(BrainSAITDesignSystem.COMPANY_NAME_AR))
         
         # Document type and department
         canvas.setFont(BrainSAITDesignSystem.FONT_BODY, 10)
@@ -133,8 +491,7 @@ class DocumentHeaderFooter:
         
         canvas.restoreState()
     
-    def footer(self, canvas, doc):
-        """Draw document footer with page numbers and security info"""
+    def _draw_footer_static(self, canvas):
         canvas.saveState()
         width, height = letter
         
@@ -143,14 +500,9 @@ class DocumentHeaderFooter:
         canvas.setFillColor(self.colors.DEEP_ORANGE)
         canvas.drawCentredString(width/2, 0.5*inch, self.classification)
         
-        # Page number
-        canvas.setFont(BrainSAITDesignSystem.FONT_BODY, 9)
-        canvas.setFillColor(self.colors.PROFESSIONAL_GRAY)
-        page_num = f"Page {doc.page} | Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        canvas.drawCentredString(width/2, 0.35*inch, page_num)
-        
         # Company OID and compliance info
         canvas.setFont(BrainSAITDesignSystem.FONT_BODY, 7)
+        canvas.setFillColor(self.colors.PROFESSIONAL_GRAY)
         canvas.drawString(0.75*inch, 0.35*inch, 
                          f"OID: {BrainSAITDesignSystem.COMPANY_OID}")
         canvas.drawRightString(width - 0.75*inch, 0.35*inch,
@@ -164,37 +516,213 @@ class DocumentHeaderFooter:
         canvas.restoreState()
 
 
-class BrainSAITDocumentTemplate(BaseDocTemplate):
+def _stream_position(stream) -> Optional[int]:
+    """Current offset of a seekable binary stream, else None"""
+    try:
+        return stream.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class RenderMetrics:
     """
-    BRAINSAIT: Master document template with custom headers and footers
-    MEDICAL: Built-in audit logging and HIPAA compliance
+    NEURAL: Per-document render measurements
+    
+    Phases (seconds): style_init (setting up the generator's styles; zero
+    for later renders by the same generator), story (building flowables),
+    layout (ReportLab doc.build excluding the other phases), header_footer
+    (page callbacks), write (serializing the PDF) and total. On a render-cache
+    hit only cache, write and total are recorded and pages is None.
     """
     
-    def __init__(self, filename, **kwargs):
-        self.header_footer = kwargs.pop('header_footer', None)
-        BaseDocTemplate.__init__(self, filename, **kwargs)
-        
-        # Define page templates
-        frame = Frame(
-            BrainSAITDesignSystem.MARGIN_LEFT,
-            BrainSAITDesignSystem.MARGIN_BOTTOM,
-            self.width,
-            self.height - 1.2*inch,
-            id='normal'
-        )
+    PHASES = ('style_init', 'story', 'layout', 'header_footer', 'write', 'cache', 'total')
+    
+    def __init__(self, document_type: str = "", department: str = ""):
+        self.document_type = document_type
+        self.department = department
+        self.phases: Dict[str, float] = {}
+        self.pages: Optional[int] = None
+        self.flowables = 0
+        self.output_bytes: Optional[int] = None
+        self.cache_hit: Optional[bool] = None
+        self.profile_path: Optional[str] = None
+    
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+    
+    def timed(self, iterable: Iterable) -> Iterator:
+        """Pass items through, charging the time spent producing them to 'story'"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add('story', time.perf_counter() - start)
+                return
+            self.add('story', time.perf_counter() - start)
+            self.flowables += 1
+            yield item
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'document_type': self.document_type,
+            'department': self.department,
+            'phases': dict(self.phases),
+            'pages': self.pages,
+            'flowables': self.flowables,
+            'output_bytes': self.output_bytes,
+            'cache_hit': self.cache_hit,
+            'profile_path': self.profile_path,
+        }
+
+
+class LazyStory:
+    """
+    NEURAL: List-like story that pulls flowables from an iterator on demand
+    
+    BaseDocTemplate.build consumes its story from the front and only looks a
+    few flowables ahead (keepWithNext groups, split remainders), so a small
+    look-ahead buffer is enough. Peak memory is bounded by the buffer rather
+    than by document size.
+    """
+    
+    def __init__(self, flowables, lookahead: int = 64):
+        self._source = iter(flowables)
+        self._buffer: List = []
+        self._lookahead = lookahead
+        self._exhausted = False
+    
+    def _fill(self):
+        while not self._exhausted and len(self._buffer) < self._lookahead:
+            try:
+                self._buffer.append(next(self._source))
+            except StopIteration:
+                self._exhausted = True
+    
+    def __len__(self) -> int:
+        # build() calls len() once per flowable, which keeps the buffer topped up
+        self._fill()
+        return len(self._buffer)
+    
+    def __getitem__(self, index):
+        if not self._buffer:
+            self._fill()
+        return self._buffer[index]
+    
+    def __setitem__(self, index, value):
+        self._buffer[index] = value
+    
+    def __delitem__(self, index):
+        del self._buffer[index]
+    
+    def insert(self, index: int, flowable):
+        self._buffer.insert(index, flowable)
+
+
+_DOCUMENT_TEMPLATE_CLASS = None
+
+
+def _document_template_class():
+    """
+    BrainSAITDocumentTemplate, defined on first use
+    
+    The class derives from ReportLab's BaseDocTemplate, so it is created when
+    the first document is built rather than when this module is imported.
+    """
+    global _DOCUMENT_TEMPLATE_CLASS
+    if _DOCUMENT_TEMPLATE_CLASS is not None:
+        return _DOCUMENT_TEMPLATE_CLASS
+    
+    from reportlab.platypus import BaseDocTemplate, Frame, PageTemplate
+    
+    class BrainSAITDocumentTemplate(BaseDocTemplate):
+        """
+        BRAINSAIT: Master document template with custom headers and footers
+        MEDICAL: Built-in audit logging and HIPAA compliance
+        """
+    
+        def __init__(self, filename, **kwargs):
+            self.header_footer = kwargs.pop('header_footer', None)
+            self.metrics = kwargs.pop('metrics', None)
+            # document_contents.DocumentContents: record headings for contents and outline
+            self.contents = kwargs.pop('contents', None)
+            # Callables run with the canvas after the last page, before saving
+            self.before_save: List[Callable] = []
+            BaseDocTemplate.__init__(self, filename, **kwargs)
+            self.body_height = self.height - 1.2*inch
+            
+            # Define page templates
+            self.add_header_footer_template('main', self.header_footer)
+            
+            if self.contents is not None:
+                # Less the frames' default 6pt padding
+                self.contents.frame_size = (self.width - 12, self.body_height - 12)
+                self.before_save.append(self.contents.finish)
+                self.before_save.append(lambda canvas: canvas.showOutline())
         
-        template = PageTemplate(
-            id='main',
-            frames=[frame],
-            onPage=self._on_page
-        )
-        self.addPageTemplates([template])
+        def add_header_footer_template(self, template_id: str, header_footer):
+            """
+            Add a page template that draws the given header/footer
+            
+            Switch to it with NextPageTemplate(template_id), e.g. to give each
+            document in a bundle its own header.
+            """
+            frame = Frame(
+                BrainSAITDesignSystem.MARGIN_LEFT,
+                BrainSAITDesignSystem.MARGIN_BOTTOM,
+                self.width,
+                self.body_height,
+                id='normal'
+            )
+            
+            def on_page(canvas, doc):
+                self._on_page(canvas, doc, header_footer)
+            
+            template = PageTemplate(
+                id=template_id,
+                frames=[frame],
+                onPage=on_page
+            )
+            self.addPageTemplates([template])
+        
+        def filterFlowables(self, flowables):
+            # NEURAL: Headings are anchored and recorded as they are drawn; no multiBuild
+            if self.contents is not None:
+                self.contents.filter(flowables)
+        
+        def _on_page(self, canvas, doc, header_footer=None):
+            """Apply header and footer to each page"""
+            if header_footer:
+                start = time.perf_counter()
+                header_footer.header(canvas, doc)
+                header_footer.footer(canvas, doc)
+                if self.metrics is not None:
+                    self.metrics.add('header_footer', time.perf_counter() - start)
+        
+        def _endBuild(self):
+            # BaseDocTemplate._endBuild finishes the last page and saves the canvas
+            start = time.perf_counter()
+            if self.before_save:
+                self._doSave = 0
+                BaseDocTemplate._endBuild(self)
+                for hook in self.before_save:
+                    hook(self.canv)
+                self.canv.save()
+            else:
+                BaseDocTemplate._endBuild(self)
+            if self.metrics is not None:
+                self.metrics.add('write', time.perf_counter() - start)
     
-    def _on_page(self, canvas, doc):
-        """Apply header and footer to each page"""
-        if self.header_footer:
-            self.header_footer.header(canvas, doc)
-            self.header_footer.footer(canvas, doc)
+    _DOCUMENT_TEMPLATE_CLASS = BrainSAITDocumentTemplate
+    return BrainSAITDocumentTemplate
+
+
+def __getattr__(name: str):
+    # PEP 562: BrainSAITDocumentTemplate stays importable by name
+    if name == 'BrainSAITDocumentTemplate':
+        return _document_template_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class BrainSAITDocumentGenerator:
@@ -211,8 +739,18 @@ class BrainSAITDocumentGenerator:
                  title_ar: str = "",
                  classification: str = "INTERNAL USE",
                  author: str = "BrainSAIT",
-                 version: str = "1.0"):
+                 version: str = "1.0",
+                 style_overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+                 generated_at: Optional[datetime] = None,
+                 render_cache: Optional[RenderCache] = None,
+                 on_metrics: Optional[Callable[[RenderMetrics], None]] = None,
+                 profile_dir: Optional[str] = None,
+                 language: str = 'en',
+                 allow_files: bool = True,
+                 table_of_contents: bool = False):
         
+        if language not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"unsupported language: {language!r}")
         self.document_type = document_type
         self.department = department
         self.title_en = title_en
@@ -220,122 +758,96 @@ class BrainSAITDocumentGenerator:
         self.classification = classification
         self.author = author
         self.version = version
+        # BILINGUAL: 'ar' leads with Arabic titles and lays out right-to-left
+        self.language = language
+        # NEURAL: Contents page and PDF outline from the headings (see document_contents)
+        self.table_of_contents = table_of_contents
         self.colors = BrainSAITColors()
         self.design = BrainSAITDesignSystem()
+        self.style_overrides = style_overrides or {}
+        # MEDICAL: A fixed generated_at makes output reproducible (and cacheable)
+        self.generated_at = generated_at
+        self.render_cache = render_cache
+        # MEDICAL: Whether table sources may name files on this machine; off
+        # for documents built from untrusted input (render service HTTP jobs)
+        self.allow_files = allow_files
+        self._standard_table_style = None
+        
+        # NEURAL: Instrumentation - metrics callback and opt-in cProfile dumps
+        self.on_metrics = on_metrics
+        self.profile_dir = profile_dir
+        self.last_metrics: Optional[RenderMetrics] = None
         
         # Initialize styles
         self._init_styles()
         
     def _init_styles(self):
-        """Initialize custom paragraph styles"""
-        self.styles = getSampleStyleSheet()
-        
-        # NEURAL: Custom styles with BrainSAIT branding
-        self.styles.add(ParagraphStyle(
-            name='BrainSAITTitle',
-            parent=self.styles['Title'],
-            fontSize=self.design.SIZE_TITLE,
-            textColor=self.colors.MIDNIGHT_BLUE,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            fontName=self.design.FONT_TITLE
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='BrainSAITSubtitle',
-            parent=self.styles['Heading1'],
-            fontSize=self.design.SIZE_SUBTITLE,
-            textColor=self.colors.MEDICAL_BLUE,
-            spaceAfter=15,
-            spaceBefore=10,
-            fontName=self.design.FONT_SUBTITLE
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='BrainSAITHeading1',
-            parent=self.styles['Heading1'],
-            fontSize=self.design.SIZE_HEADING1,
-            textColor=self.colors.MEDICAL_BLUE,
-            spaceAfter=12,
-            spaceBefore=12,
-            fontName=self.design.FONT_SUBTITLE,
-            borderPadding=5,
-            leftIndent=0,
-            borderColor=self.colors.SIGNAL_TEAL,
-            borderWidth=0,
-            borderRadius=0
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='BrainSAITHeading2',
-            parent=self.styles['Heading2'],
-            fontSize=self.design.SIZE_HEADING2,
-            textColor=self.colors.PROFESSIONAL_GRAY,
-            spaceAfter=10,
-            spaceBefore=10,
-            fontName=self.design.FONT_BODY_BOLD
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='BrainSAITBody',
-            parent=self.styles['Normal'],
-            fontSize=self.design.SIZE_BODY,
-            textColor=colors.black,
-            spaceAfter=8,
-            alignment=TA_JUSTIFY,
-            fontName=self.design.FONT_BODY
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='BrainSAITBullet',
-            parent=self.styles['Normal'],
-            fontSize=self.design.SIZE_BODY,
-            textColor=colors.black,
-            spaceAfter=6,
-            leftIndent=20,
-            bulletIndent=10,
-            fontName=self.design.FONT_BODY
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='BrainSAITArabic',
-            parent=self.styles['Normal'],
-            fontSize=self.design.SIZE_BODY,
-            textColor=colors.black,
-            spaceAfter=8,
-            alignment=TA_RIGHT,
-            fontName=self.design.FONT_ARABIC
-        ))
-        
-        self.styles.add(ParagraphStyle(
-            name='BrainSAITHighlight',
-            parent=self.styles['Normal'],
-            fontSize=self.design.SIZE_BODY,
-            textColor=self.colors.MEDICAL_BLUE,
-            spaceAfter=8,
-            fontName=self.design.FONT_BODY_BOLD,
-            backColor=self.colors.LIGHT_GRAY,
-            borderPadding=8
-        ))
-    
-    def create_cover_page(self) -> List:
+        """Attach the shared style registry plus this document's overrides"""
+        start = time.perf_counter()
+        self.styles = DocumentStyles(
+            get_style_registry(self.design, self.colors, self.language),
+            self.style_overrides
+        )
+        # Charged to the next instrumented render only
+        self._style_init_s = time.perf_counter() - start
+    
+    def __getstate__(self):
+        # Styles come from the shared registry; rebuild them after unpickling
+        # (e.g. in a process-pool worker) instead of pickling style sheets
+        state = self.__dict__.copy()
+        state.pop('styles', None)
+        state['_standard_table_style'] = None
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_styles()
+    
+    def with_language(self, language: str) -> 'BrainSAITDocumentGenerator':
+        """This document in another language (self when it already matches)"""
+        if language == self.language:
+            return self
+        if language not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"unsupported language: {language!r}")
+        variant = copy.copy(self)
+        variant.language = language
+        variant._standard_table_style = None
+        variant.last_metrics = None
+        variant._init_styles()
+        return variant
+    
+    @property
+    def rtl(self) -> bool:
+        return self.language == 'ar'
+    
+    def create_cover_page(self, generated_at: Optional[date] = None) -> List:
         """
         NEURAL: Create a professional cover page with bilingual content
+        
+        Args:
+            generated_at: Date shown on the cover (defaults to the generator's
+                generated_at, then the current time)
         """
+        from reportlab.platypus import PageBreak, Spacer, Table, TableStyle
+        from compact_flowables import CompactParagraph
+        
         story = []
         
         # Large spacer to center content
         story.append(Spacer(1, 2*inch))
         
-        # Main title
-        title_para = Paragraph(self.title_en, self.styles['BrainSAITTitle'])
+        # Main title (Arabic first in the Arabic variant)
+        title, second_title = self.title_en, self.title_ar and shape_arabic(self.title_ar)
+        if self.rtl and self.title_ar:
+            title, second_title = second_title, self.title_en
+        title_para = CompactParagraph(title, self.styles['BrainSAITTitle'])
         story.append(title_para)
         
-        # Arabic title (if provided)
-        if self.title_ar:
+        # Second-language title (if provided)
+        if second_title:
             story.append(Spacer(1, self.design.SPACER_SMALL))
-            arabic_title = Paragraph(self.title_ar, self.styles['BrainSAITArabic'])
-            story.append(arabic_title)
+            second_title_para = CompactParagraph(second_title, self.styles['BrainSAITArabic'])
+            story.append(second_title_para)
         
         # Document info box
         story.append(Spacer(1, self.design.SPACER_LARGE))
@@ -344,18 +856,27 @@ class BrainSAITDocumentGenerator:
             ['Document Type:', self.document_type],
             ['Department:', self.department],
             ['Version:', self.version],
-            ['Date:', datetime.now().strftime('%B %d, %Y')],
+            ['Date:', (generated_at or self.generated_at or datetime.now()).strftime('%B %d, %Y')],
             ['Author:', self.author],
             ['Classification:', self.classification]
         ]
+        label_font = self.design.FONT_BODY_BOLD
+        col_widths = [2*inch, 4*inch]
+        if self.rtl:
+            # Labels on the right, in Arabic
+            info_data = [[value, shape_arabic(_COVER_LABELS_AR[label])] for label, value in info_data]
+            label_font = arabic_font(self.design.FONT_ARABIC)
+            col_widths.reverse()
+        label_col = 1 if self.rtl else 0
+        value_col = 1 - label_col
         
-        info_table = Table(info_data, colWidths=[2*inch, 4*inch])
+        info_table = Table(info_data, colWidths=col_widths)
         info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), self.colors.LIGHT_GRAY),
-            ('TEXTCOLOR', (0, 0), (0, -1), self.colors.MEDICAL_BLUE),
-            ('FONT', (0, 0), (0, -1), self.design.FONT_BODY_BOLD, 11),
-            ('FONT', (1, 0), (1, -1), self.design.FONT_BODY, 11),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('BACKGROUND', (label_col, 0), (label_col, -1), self.colors.LIGHT_GRAY),
+            ('TEXTCOLOR', (label_col, 0), (label_col, -1), self.colors.MEDICAL_BLUE),
+            ('FONT', (label_col, 0), (label_col, -1), label_font, 11),
+            ('FONT', (value_col, 0), (value_col, -1), self.design.FONT_BODY, 11),
+            ('ALIGN', (0, 0), (-1, -1), 'RIGHT' if self.rtl else 'LEFT'),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
             ('GRID', (0, 0), (-1, -1), 1, self.colors.BORDER_GRAY),
             ('PADDING', (0, 0), (-1, -1), 10),
@@ -369,18 +890,18 @@ class BrainSAITDocumentGenerator:
         <para align="center">
         <font color="{self.colors.DEEP_ORANGE.hexval()}" size="10">
         <b>{self.design.SECURITY_CLASSIFICATION}</b><br/>
-        {self.design.SECURITY_CLASSIFICATION_AR}
+        <font name="{arabic_font(self.design.FONT_ARABIC)}">{shape_arabic(self.design.SECURITY_CLASSIFICATION_AR)}</font>
         </font>
         </para>
         """
-        story.append(Paragraph(compliance_text, self.styles['BrainSAITBody']))
+        story.append(CompactParagraph(compliance_text, self.styles['BrainSAITBody']))
         
         story.append(PageBreak())
         return story
     
     def create_section(self, 
                       title: str, 
-                      content: List[str],
+                      content: Iterable[Any],
                       title_ar: str = "",
                       level: int = 1) -> List:
         """
@@ -392,46 +913,98 @@ class BrainSAITDocumentGenerator:
             title_ar: Section title in Arabic (optional)
             level: Heading level (1 or 2)
         """
-        story = []
+        return list(self.iter_section(title, content, title_ar, level))
+    
+    def iter_section(self,
+                     title: str,
+                     content: Iterable[Any],
+                     title_ar: str = "",
+                     level: int = 1) -> Iterator:
+        """
+        Yield a section's flowables lazily (see create_section)
+        
+        NEURAL: Text becomes CompactParagraphs, parsed only when laid out and
+        served from the process-wide parse cache for repeated markup
+        """
+        from reportlab.platypus import Spacer
+        from compact_flowables import CompactParagraph
         
-        # Section title
+        # Section title (Arabic first in the Arabic variant)
+        outline_title = title_ar if self.rtl and title_ar else title
+        second_title = title_ar and shape_arabic(title_ar)
+        if self.rtl and title_ar:
+            title, second_title = second_title, title
         style_name = f'BrainSAITHeading{level}'
-        story.append(Paragraph(title, self.styles[style_name]))
+        heading = CompactParagraph(title, self.styles[style_name])
+        # Logical-order title for the PDF outline (the drawn one may be shaped)
+        heading.outline_title = outline_title
+        yield heading
         
-        # Arabic title (if provided)
-        if title_ar:
-            story.append(Spacer(1, self.design.SPACER_SMALL))
-            story.append(Paragraph(title_ar, self.styles['BrainSAITArabic']))
+        # Second-language title (if provided)
+        if second_title:
+            yield Spacer(1, self.design.SPACER_SMALL)
+            yield CompactParagraph(second_title, self.styles['BrainSAITArabic'])
         
-        story.append(Spacer(1, self.design.SPACER_SMALL))
+        yield Spacer(1, self.design.SPACER_SMALL)
         
         # Section content
         for item in content:
             if isinstance(item, str):
-                story.append(Paragraph(item, self.styles['BrainSAITBody']))
+                yield self.text_paragraph(item, 'BrainSAITBody')
             else:
-                story.append(item)
+                yield item
         
-        story.append(Spacer(1, self.design.SPACER_MEDIUM))
-        return story
+        yield Spacer(1, self.design.SPACER_MEDIUM)
     
     def create_table(self, 
-                    data: List[List[str]], 
-                    headers: List[str],
+                    data: Any, 
+                    headers: Optional[List[str]] = None,
                     col_widths: Optional[List[float]] = None,
-                    style_type: str = 'standard') -> Table:
+                    style_type: str = 'standard',
+                    formats: Optional[Dict[str, Any]] = None) -> Table:
         """
         NEURAL: Create a styled table with BrainSAIT branding
+        
+        data is a list of rows, or a columnar source (CSV/Parquet path,
+        Arrow table, NumPy array, pandas DataFrame, header -> column mapping;
+        see tabular), in which case headers default to the source's columns
+        and formats maps a header to its column format.
+        
+        For large or streamed datasets use iter_table_chunks, which splits
+        rows into page-sized sub-tables instead of one huge Table.
         """
+        from reportlab.platypus import Table
+        
+        if formats is not None or is_tabular_source(data):
+            headers, rows = iter_rows(data, headers, formats=formats,
+                                      allow_files=self.allow_files)
+            data = [list(row) for row in rows]
+        
         # Add headers to data
-        table_data = [headers] + data
+        table_data = [headers] + list(data)
+        if self.rtl:
+            # Right-to-left column order
+            table_data = [list(reversed(row)) for row in table_data]
+            col_widths = col_widths and list(reversed(col_widths))
         
         # Create table
         table = Table(table_data, colWidths=col_widths)
         
         # Apply style based on type
-        if style_type == 'standard':
-            table.setStyle(TableStyle([
+        table_style = self._table_style(style_type)
+        if table_style is not None:
+            table.setStyle(table_style)
+        
+        return table
+    
+    def _table_style(self, style_type: str) -> Optional[TableStyle]:
+        """TableStyle for a style type, built once per generator"""
+        if style_type != 'standard':
+            return None
+        if self._standard_table_style is None:
+            from reportlab.lib import colors
+            from reportlab.platypus import TableStyle
+            self._standard_table_style = TableStyle([
                 # Header row
                 ('BACKGROUND', (0, 0), (-1, 0), self.colors.MEDICAL_BLUE),
                 ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
@@ -441,7 +1014,7 @@ class BrainSAITDocumentGenerator:
                 ('BACKGROUND', (0, 1), (-1, -1), colors.white),
                 ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
                 ('FONT', (0, 1), (-1, -1), self.design.FONT_BODY, 10),
-                ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+                ('ALIGN', (0, 1), (-1, -1), 'RIGHT' if self.rtl else 'LEFT'),
                 # Alternating row colors
                 ('ROWBACKGROUNDS', (0, 1), (-1, -1), 
                  [colors.white, self.colors.LIGHT_GRAY]),
@@ -449,82 +1022,431 @@ class BrainSAITDocumentGenerator:
                 ('GRID', (0, 0), (-1, -1), 1, self.colors.BORDER_GRAY),
                 ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
                 ('PADDING', (0, 0), (-1, -1), 8),
-            ]))
+            ])
+        return self._standard_table_style
+    
+    def measure_col_widths(self,
+                           rows: List[List[Any]],
+                           headers: List[str],
+                           padding: float = 8) -> List[float]:
+        """
+        Compute column widths from a sample of rows
         
-        return table
+        Widths fit the widest sampled cell (header font for the header row)
+        and are scaled down proportionally to fit the page frame. Cells
+        beyond the last header are not measured.
+        """
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        
+        widths = [stringWidth(str(h), self.design.FONT_BODY_BOLD, 11) for h in headers]
+        for row in rows:
+            for i, cell in enumerate(row[:len(widths)]):
+                width = stringWidth(str(cell), self.design.FONT_BODY, 10)
+                if width > widths[i]:
+                    widths[i] = width
+        widths = [w + 2 * padding for w in widths]
+        
+        available = letter[0] - self.design.MARGIN_LEFT - self.design.MARGIN_RIGHT
+        total = sum(widths)
+        if total > available:
+            widths = [w * available / total for w in widths]
+        return widths
     
-    def create_bullet_list(self, items: List[str]) -> List:
-        """Create a bullet list"""
-        story = []
-        for item in items:
-            bullet_text = f"• {item}"
-            story.append(Paragraph(bullet_text, self.styles['BrainSAITBullet']))
-        return story
+    def iter_table_chunks(self,
+                          data: Optional[Iterable[List[Any]]],
+                          headers: Optional[List[str]] = None,
+                          col_widths: Optional[List[float]] = None,
+                          style_type: str = 'standard',
+                          chunk_rows: Optional[int] = None,
+                          columns: Optional[Union[Sequence[Sequence], Dict[str, Sequence]]] = None,
+                          formats: Optional[Dict[str, Any]] = None
+                          ) -> Iterator[Table]:
+        """
+        NEURAL: High-volume table path; yields page-sized sub-tables
+        
+        Up to chunk_rows rows become one ordinary Table. Longer data becomes a
+        StreamedTable that pulls rows from data (any iterable) as layout
+        reaches each page and emits one Table per page, with the header row
+        at the top of each page only; at most a page of rows is held in
+        memory. Column widths (if not given) are measured from the first
+        chunk_rows rows and the table style is shared, so every page lines up;
+        pass col_widths when later rows may hold wider cells.
+        An empty data set still yields the header row.
+        
+        Args:
+            data: Row iterable, or a tabular source (see create_table)
+            headers: Header row (defaults to a tabular source's columns)
+            col_widths: Fixed column widths (optional)
+            style_type: Table style type
+            chunk_rows: Rows in a single Table, and sampled for column widths
+                (defaults to TABLE_CHUNK_ROWS)
+            columns: Columnar source instead of rows; a sequence of columns
+                (lists, arrays) or a mapping of header -> column
+            formats: Column formats for columnar sources, by header
+        """
+        chunk_rows = chunk_rows or self.design.TABLE_CHUNK_ROWS
+        if columns is not None or formats is not None or is_tabular_source(data):
+            # Read and format column-wise in source-sized chunks (tabular's
+            # default), re-chunked into sub-tables below
+            headers, chunks = iter_column_chunks(columns if columns is not None else data,
+                                                 headers, formats=formats,
+                                                 allow_files=self.allow_files)
+            data = (row for chunk in chunks for row in zip(*chunk))
+        rows = iter(data)
+        
+        chunk = [list(row) for row in islice(rows, chunk_rows + 1)]
+        if len(chunk) <= chunk_rows:
+            table = self.create_table(chunk, headers, col_widths, style_type)
+            table.repeatRows = 1
+            yield table
+            return
+        
+        from compact_flowables import StreamedTable
+        
+        if col_widths is None:
+            col_widths = self.measure_col_widths(chunk[:chunk_rows], headers)
+        
+        def make_table(page_rows):
+            table = self.create_table(page_rows, headers, col_widths, style_type)
+            table.repeatRows = 1
+            return table
+        
+        yield StreamedTable(make_table, rows, chunk)
+    
+    def create_bullet_list(self, items: Iterable[str]) -> List:
+        """
+        Create a bullet list
+        
+        NEURAL: Items are kept as text (CompactParagraph) and parsed when laid
+        out; plain items never go through the markup parser
+        """
+        return [self.text_paragraph(item, 'BrainSAITBullet', prefix="• ") for item in items]
+    
+    def text_paragraph(self, text: str, style_name: str, prefix: str = ""):
+        """
+        BILINGUAL: Body or bullet paragraph, shaping any Arabic in the text
+        
+        Text that starts in Arabic is right-aligned in the Arabic font
+        (BrainSAITArabicBody / BrainSAITArabicBullet) and broken into lines
+        before each line is reordered (RTLParagraph); Arabic words inside
+        left-to-right text are shaped and set in the Arabic font in place.
+        """
+        from compact_flowables import CompactParagraph, RTLParagraph
+        
+        if not has_arabic(text):
+            return CompactParagraph(prefix + text, self.styles[style_name])
+        font = arabic_font(self.design.FONT_ARABIC)
+        if not starts_rtl(text):
+            return CompactParagraph(prefix + shape_markup(text, font), self.styles[style_name])
+        style = self.styles[_RTL_TEXT_STYLES.get(style_name, style_name)]
+        if '<' in text or '&' in text:
+            return CompactParagraph(shape_markup(prefix + text, font, rtl=True), style)
+        return RTLParagraph(reshape_arabic(prefix + text), style)
     
     def generate_pdf(self, 
-                    filename: str, 
-                    content_sections: List[Dict[str, Any]],
-                    include_cover: bool = True) -> str:
+                    filename: Union[str, BinaryIO, None], 
+                    content_sections: Iterable[Dict[str, Any]],
+                    include_cover: bool = True) -> Union[str, BinaryIO, bytes]:
         """
         BRAINSAIT: Main PDF generation method
         
         Args:
-            filename: Output filename
-            content_sections: List of section dictionaries with 'title', 'content', etc.
+            filename: Output filename, a writable binary stream, or None to
+                render in memory
+            content_sections: Section dictionaries with 'title', 'content', etc.
+                (any iterable; generators are consumed lazily)
             include_cover: Whether to include cover page
             
         Returns:
-            Path to generated PDF file
+            The path or stream that was written to, or the PDF bytes when
+            filename is None
         """
+        instrumented = self.on_metrics is not None or self.profile_dir is not None
+        if not instrumented:
+            return self._generate(filename, content_sections, include_cover)
+        
+        metrics = RenderMetrics(self.document_type, self.department)
+        metrics.add('style_init', self._style_init_s)
+        self._style_init_s = 0.0
+        profiler = cProfile.Profile() if self.profile_dir else None
+        
+        stream_start = _stream_position(filename)
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            result = self._generate(filename, content_sections, include_cover, metrics)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                metrics.profile_path = self._dump_profile(profiler)
+        metrics.add('total', time.perf_counter() - start)
+        
+        if isinstance(result, bytes):
+            metrics.output_bytes = len(result)
+        elif isinstance(result, str):
+            metrics.output_bytes = os.path.getsize(result)
+        elif stream_start is not None:
+            metrics.output_bytes = _stream_position(result) - stream_start
+        
+        self.last_metrics = metrics
+        if self.on_metrics is not None:
+            self.on_metrics(metrics)
+        return result
+    
+    def _generate(self, filename, content_sections, include_cover: bool,
+                  metrics: Optional[RenderMetrics] = None):
+        cache = self.render_cache if self.render_cache is not None else get_default_cache()
+        if cache is not None:
+            return self._generate_cached(cache, filename, content_sections, include_cover, metrics)
+        
+        if filename is None:
+            buffer = io.BytesIO()
+            self._build_pdf(buffer, content_sections, include_cover, metrics=metrics)
+            return buffer.getvalue()
+        
+        self._build_pdf(filename, content_sections, include_cover, metrics=metrics)
+        return filename
+    
+    def _generate_cached(self, cache: RenderCache, filename, content_sections,
+                         include_cover: bool, metrics: Optional[RenderMetrics] = None):
+        """Serve a render from the cache, rendering and storing it on a miss"""
+        start = time.perf_counter()
+        generated_at = self.generated_at or cache.pinned_timestamp()
+        key = cache_key(self._cache_params(generated_at, include_cover), content_sections)
+        if key is not None and source_files(content_sections):
+            # Table files can change under the same sections; never cache those
+            key = None
+        data = cache.get(key) if key is not None else None
+        
+        if metrics is not None:
+            metrics.cache_hit = data is not None
+            metrics.add('cache', time.perf_counter() - start)
+        
+        if data is None:
+            buffer = io.BytesIO()
+            self._build_pdf(buffer, content_sections, include_cover, generated_at, metrics)
+            data = buffer.getvalue()
+            if key is not None:
+                cache.set(key, data)
+        
+        if filename is None:
+            return data
+        start = time.perf_counter()
+        if isinstance(filename, str):
+            with open(filename, 'wb') as f:
+                f.write(data)
+        else:
+            filename.write(data)
+        if metrics is not None:
+            metrics.add('write', time.perf_counter() - start)
+        return filename
+    
+    def _dump_profile(self, profiler: cProfile.Profile) -> str:
+        """Write cProfile stats for one document to profile_dir"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', self.title_en).strip('_') or 'document'
+        path = os.path.join(self.profile_dir,
+                            f"{slug}-{datetime.now().strftime('%Y%m%d%H%M%S%f')}.prof")
+        profiler.dump_stats(path)
+        return path
+    
+    def _cache_params(self, generated_at: Optional[date], include_cover: bool) -> Dict[str, Any]:
+        """Generator parameters that affect the rendered output"""
+        return {
+            'document_type': self.document_type,
+            'department': self.department,
+            'title_en': self.title_en,
+            'title_ar': self.title_ar,
+            'classification': self.classification,
+            'author': self.author,
+            'version': self.version,
+            'style_overrides': self.style_overrides,
+            'design': _design_key(self.design, self.colors),
+            'generated_at': generated_at.isoformat() if generated_at else None,
+            'include_cover': include_cover,
+            'language': self.language,
+            'table_of_contents': self.table_of_contents,
+        }
+    
+    def _build_pdf(self, output, content_sections: Iterable[Dict[str, Any]],
+                   include_cover: bool, generated_at: Optional[date] = None,
+                   metrics: Optional[RenderMetrics] = None):
+        """Lay out the story and write the PDF to a path or stream"""
+        generated_at = generated_at or self.generated_at
+        
+        contents = None
+        if self.table_of_contents:
+            # Pages are reserved for the headings the sections announce
+            from document_contents import DocumentContents, expected_headings
+            contents = DocumentContents(self.design, self.colors, self.language,
+                                        expected_headings(content_sections) or 0)
+        
         # Create header/footer handler
         header_footer = DocumentHeaderFooter(
             document_type=self.document_type,
             department=self.department,
-            classification=self.classification
+            classification=self.classification,
+            generated_at=generated_at
         )
         
         # Create document
-        doc = BrainSAITDocumentTemplate(
-            filename,
+        doc = _document_template_class()(
+            output,
             pagesize=letter,
             header_footer=header_footer,
-            title=self.title_en,
+            title=self.title_ar if self.rtl and self.title_ar else self.title_en,
             author=self.author,
-            subject=f"{self.document_type} - {self.department}"
+            subject=f"{self.document_type} - {self.department}",
+            # Omit creation date and random document ID when the timestamp is pinned
+            invariant=generated_at is not None,
+            metrics=metrics,
+            contents=contents
         )
         
-        # Build story
-        story = []
+        # Build PDF from a lazily produced story
+        story = self.iter_story(content_sections, include_cover, generated_at, contents)
+        if metrics is None:
+            doc.build(LazyStory(story))
+            return
+        
+        start = time.perf_counter()
+        doc.build(LazyStory(metrics.timed(story)))
+        elapsed = time.perf_counter() - start
+        
+        # Layout is whatever part of doc.build the other phases do not account for
+        accounted = sum(metrics.phases.get(p, 0.0) for p in ('story', 'header_footer', 'write'))
+        metrics.add('layout', max(0.0, elapsed - accounted))
+        metrics.pages = doc.page
+    
+    def iter_story(self,
+                   content_sections: Iterable[Dict[str, Any]],
+                   include_cover: bool = True,
+                   generated_at: Optional[date] = None,
+                   contents=None) -> Iterator:
+        """
+        NEURAL: Yield the document's flowables one at a time
+        
+        content_sections may be any iterable (including a generator), and a
+        section's content and table data may be iterables too; nothing is
+        materialized beyond the current table chunk. contents (a
+        document_contents.DocumentContents) reserves its pages after the cover.
+        """
+        from reportlab.platypus import Spacer
         
         # Add cover page
         if include_cover:
-            story.extend(self.create_cover_page())
+            yield from self.create_cover_page(generated_at)
+        
+        if contents is not None:
+            yield from contents.placeholders()
         
         # Add content sections
         for section in content_sections:
-            section_story = self.create_section(
+            yield from self.iter_section(
                 title=section.get('title', ''),
                 content=section.get('content', []),
                 title_ar=section.get('title_ar', ''),
                 level=section.get('level', 1)
             )
-            story.extend(section_story)
             
             # Add tables if present
             if 'table' in section:
-                table = self.create_table(
-                    data=section['table']['data'],
-                    headers=section['table']['headers'],
-                    col_widths=section['table'].get('col_widths')
+                table = section['table']
+                yield from self.iter_table_chunks(
+                    data=table_source(table),
+                    headers=table.get('headers'),
+                    col_widths=table.get('col_widths'),
+                    columns=table.get('columns'),
+                    formats=table.get('formats')
                 )
-                story.append(table)
-                story.append(Spacer(1, self.design.SPACER_MEDIUM))
+                yield Spacer(1, self.design.SPACER_MEDIUM)
+    
+    def generate_pdf_languages(self,
+                               outputs: Dict[str, Union[str, BinaryIO, None]],
+                               content_sections: Iterable[Dict[str, Any]],
+                               include_cover: bool = True) -> Dict[str, Union[str, BinaryIO, bytes]]:
+        """
+        BILINGUAL: Render several language variants of this document together
         
-        # Build PDF
-        doc.build(story)
+        Sections are prepared once (content and table rows materialized,
+        column widths measured, Arabic shaped and markup parsed through the
+        process-wide caches) and each variant only pays for its own layout.
+        Pre-built flowables in the content are shared by the variants.
         
-        return filename
+        Args:
+            outputs: Language -> filename, writable stream or None (bytes),
+                e.g. {'en': "plan-en.pdf", 'ar': "plan-ar.pdf"}
+            content_sections: As for generate_pdf
+            include_cover: Whether to include cover page
+            
+        Returns:
+            Language -> what generate_pdf returned for that variant
+        """
+        for language in outputs:
+            if language not in SUPPORTED_LANGUAGES:
+                raise ValueError(f"unsupported language: {language!r}")
+        sections = self._prepare_sections(content_sections)
+        return {language: self.with_language(language).generate_pdf(filename, sections,
+                                                                      include_cover)
+                for language, filename in outputs.items()}
+    
+    def _prepare_sections(self, content_sections: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Materialize sections for several renders; table widths are measured once for all"""
+        prepared = []
+        for section in content_sections:
+            section = dict(section)
+            section['content'] = list(section.get('content', []))
+            for item in section['content']:
+                if isinstance(item, str) and has_arabic(item):
+                    # Shaped once here; each variant's text_paragraph finds
+                    # the result in the shaped-text LRU
+                    self.text_paragraph(item, 'BrainSAITBody')
+            if 'table' in section:
+                table = dict(section['table'])
+                source = table_source(table)
+                columns = table.pop('columns', None)
+                table.pop('source', None)
+                formats = table.pop('formats', None)
+                if columns is not None or formats is not None or is_tabular_source(source):
+                    headers, rows = iter_rows(source, table.get('headers'), formats=formats,
+                                              allow_files=self.allow_files)
+                    table['headers'] = headers
+                else:
+                    rows = source or []
+                rows = [list(row) for row in rows]
+                table['data'] = rows
+                if table.get('col_widths') is None and len(rows) > self.design.TABLE_CHUNK_ROWS:
+                    # The rows are in memory anyway: measure all of them, not
+                    # just the first chunk a streamed table is sized from
+                    table['col_widths'] = self.measure_col_widths(rows, table['headers'])
+                section['table'] = table
+            prepared.append(section)
+        return prepared
+    
+    async def generate_pdf_async(self,
+                                 filename: Union[str, BinaryIO, None],
+                                 content_sections: Iterable[Dict[str, Any]],
+                                 include_cover: bool = True,
+                                 timeout: Optional[float] = None,
+                                 renderer=None):
+        """
+        Await generate_pdf on a render executor instead of the event loop
+
+        See async_render.AsyncRenderer for concurrency limits, backpressure
+        and timeouts; renderer defaults to the process-wide one.
+        """
+        from async_render import generate_pdf_async
+        return await generate_pdf_async(self, filename, content_sections, include_cover,
+                                        timeout=timeout, renderer=renderer)
+    
+    def generate_pdf_bytes(self,
+                           content_sections: List[Dict[str, Any]],
+                           include_cover: bool = True) -> bytes:
+        """Render the document in memory and return the PDF bytes"""
+        return self.generate_pdf(None, content_sections, include_cover)
 
 
 # Export main class
-__all__ = ['BrainSAITDocumentGenerator', 'BrainSAITColors', 'BrainSAITDesignSystem']
+__all__ = ['BrainSAITDocumentGenerator', 'BrainSAITColors', 'BrainSAITDesignSystem',
+           'DocumentStyles', 'RenderMetrics', 'get_style_registry', 'SUPPORTED_LANGUAGES']
@@ -0,0 +1,246 @@
+"""
+BrainSAIT Compact Flowables
+===========================
+Paragraphs stored as source text and a style until layout needs them
+
+NEURAL: A Paragraph parses its markup into fragments when it is created, so a
+long procedure document holds thousands of parsed paragraphs before layout
+even starts. A CompactParagraph keeps only its text and style reference and
+parses when it is first wrapped; once drawn, the parsed state is dropped.
+NEURAL: Plain-text items (no tags or entities) skip the markup parser: their
+single fragment is cloned from a per-style template
+NEURAL: Markup is parsed once per (text, style) per process: boilerplate such
+as the cover's compliance notice or the handbook's values bullets is served
+from a bounded LRU cache across documents (see parse_cache_info)
+BILINGUAL: An RTLParagraph breaks reshaped Arabic into lines in reading
+order and reorders each line only when drawing it
+NEURAL: A StreamedTable holds a row iterator and pulls only the rows of the
+frame it is being split for, so a long table is one page-sized Table per page
+
+Layout and output are identical to plain Paragraphs; the document template
+sees the same flowables, only later and lighter.
+
+Imports ReportLab at module level, so import it from rendering code only.
+"""
+
+import re
+import weakref
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from reportlab.platypus import Flowable, Paragraph
+from reportlab.platypus.paragraph import ParaParser, cleanBlockQuotedText, textTransformFrags
+
+from arabic_text import visual_line
+
+# Parsed markup paragraphs kept per process
+PARSE_CACHE_SIZE = 2048
+
+# Anything the markup parser would treat specially
+_MARKUP = re.compile(r'[<&]')
+
+# Attributes set by Paragraph._setup, computed on first access
+_PARSED_ATTRIBUTES = frozenset(('text', 'frags', 'bulletText', 'debug'))
+
+# Plain-text fragment template per style (styles are shared, so this stays small)
+_PLAIN_FRAGMENTS: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+
+
+def _copy_fragment(fragment, **changes):
+    # Lists (links, underlines) must not be shared between paragraphs
+    for name, value in fragment.__dict__.items():
+        if isinstance(value, list) and name not in changes:
+            changes[name] = list(value)
+    return fragment.clone(**changes)
+
+
+def _plain_fragment(style, text: str):
+    """The fragment the parser would produce for markup-free text in this style"""
+    template = _PLAIN_FRAGMENTS.get(style)
+    if template is None:
+        template = Paragraph('x', style).frags[0]
+        _PLAIN_FRAGMENTS[style] = template
+    return _copy_fragment(template, text=text)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_markup(text: str, style) -> tuple:
+    """
+    Parse cleaned paragraph markup (cached by text and style object)
+
+    Returns the paragraph style (a <para> tag may derive a new one), the
+    fragments and any bullet fragments. Callers copy the fragments, so the
+    cached ones are never mutated.
+    """
+    parser = ParaParser()
+    parser.caseSensitive = 1
+    style, frags, bullet_frags = parser.parse(text, style)
+    if frags is None:
+        raise ValueError("xml parser error (%s) in paragraph beginning\n'%s'"
+                         % (parser.errors[0], text[:min(30, len(text))]))
+    textTransformFrags(frags, style)
+    return style, tuple(frags), bullet_frags and tuple(bullet_frags)
+
+
+def parse_cache_info() -> Dict[str, float]:
+    """Hit/miss statistics for the parsed-markup cache"""
+    info = _parse_markup.cache_info()
+    lookups = info.hits + info.misses
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize,
+            'max_size': info.maxsize, 'hit_rate': info.hits / lookups if lookups else 0.0}
+
+
+def clear_parse_cache():
+    _parse_markup.cache_clear()
+
+
+class CompactParagraph(Paragraph):
+    """
+    NEURAL: Paragraph that defers markup parsing until it is laid out
+
+    Behaves exactly like Paragraph(text, style) once wrapped. Split halves
+    are ordinary (already parsed) paragraphs of this class.
+    """
+
+    caseSensitive = 1
+    encoding = 'utf8'
+
+    def __init__(self, text, style=None, bulletText=None, frags=None,
+                 caseSensitive=1, encoding='utf8'):
+        if frags is not None or bulletText is not None or style is None:
+            # Built by split() from parsed fragments
+            Paragraph.__init__(self, text, style, bulletText, frags, caseSensitive, encoding)
+            return
+        self._source = text
+        self.style = style
+
+    def __getattr__(self, name):
+        # Only reached for attributes that are not set yet
+        if name in _PARSED_ATTRIBUTES and '_source' in self.__dict__:
+            self._parse()
+            return self.__dict__[name]
+        raise AttributeError(name)
+
+    def _parse(self):
+        text, style = self._source, self.style
+        bullet_text = getattr(style, 'bulletText', None)
+        if _MARKUP.search(text) is None:
+            text = cleanBlockQuotedText(text)
+            if text:
+                frags = [_plain_fragment(style, text)]
+                textTransformFrags(frags, style)
+                self._setup(text, style, bullet_text, frags, cleanBlockQuotedText)
+                return
+        text = cleanBlockQuotedText(self._source)
+        style, frags, bullet_frags = _parse_markup(text, style)
+        if bullet_frags:
+            bullet_text = [_copy_fragment(fragment) for fragment in bullet_frags]
+        self._setup(text, style, bullet_text,
+                    [_copy_fragment(fragment) for fragment in frags], cleanBlockQuotedText)
+
+    def draw(self):
+        Paragraph.draw(self)
+        if '_source' in self.__dict__:
+            # Drawn for good: keep only the source (a re-layout parses again)
+            for name in _PARSED_ATTRIBUTES | {'blPara', '_wrapWidths'}:
+                self.__dict__.pop(name, None)
+
+
+class RTLParagraph(CompactParagraph):
+    """
+    BILINGUAL: Right-to-left paragraph of reshaped text in logical order
+
+    Give it the output of arabic_text.reshape_arabic, without markup. Lines
+    are broken (and split across frames) in reading order, and each line is
+    reordered for display as it is drawn, so the first line on the page is
+    the start of the text. Marked-up text is drawn as given.
+    """
+
+    def draw(self):
+        blPara = self.blPara
+        if blPara.kind != 0:
+            return CompactParagraph.draw(self)
+        lines = blPara.lines
+        blPara.lines = [(space, visual_line(' '.join(words)).split(' '))
+                        for space, words in lines]
+        try:
+            CompactParagraph.draw(self)
+        finally:
+            blPara.lines = lines
+
+
+class StreamedTable(Flowable):
+    """
+    NEURAL: Table whose rows are read from an iterator one frame at a time
+
+    make_table(rows) builds the Table for a list of body rows, with the
+    header row and repeatRows set. When the table is split across frames,
+    only the rows for that frame are read and turned into a Table; the split
+    remainder keeps the iterator. Headers repeat once per page, never
+    between chunks of the same page.
+    """
+
+    # Lower bound on a body row's height (10pt text, no padding); sizes the
+    # first read-ahead, later frames read as many rows as the last one held
+    MIN_ROW_HEIGHT = 12
+
+    def __init__(self, make_table: Callable[[List[list]], Flowable], rows: Iterator,
+                 buffered: Iterable[list] = (), rows_per_frame: int = 0):
+        self._make_table = make_table
+        self._rows = rows
+        self._buffer = [list(row) for row in buffered]
+        self._rows_per_frame = rows_per_frame
+        self._exhausted = False
+        self._table = None
+
+    def _fill(self, count: int):
+        while len(self._buffer) < count and not self._exhausted:
+            row = next(self._rows, None)
+            if row is None:
+                self._exhausted = True
+            else:
+                self._buffer.append(list(row))
+
+    def wrap(self, availWidth, availHeight):
+        self._fill(self._rows_per_frame + 1)
+        if not self._exhausted:
+            # More rows follow: report a height that makes the frame split us
+            self.width, self.height = availWidth, availHeight + 1
+            return self.width, self.height
+        self._table = self._make_table(self._buffer)
+        self.width, self.height = self._table.wrap(availWidth, availHeight)
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        if self._rows_per_frame:
+            wanted = self._rows_per_frame + 1
+        else:
+            wanted = int(availHeight // self.MIN_ROW_HEIGHT) + 1
+        while True:
+            self._fill(wanted)
+            parts = self._make_table(self._buffer).split(availWidth, availHeight)
+            if not parts:
+                return []
+            placed = parts[0]._nrows - 1
+            if placed < len(self._buffer) or self._exhausted:
+                break
+            # A taller frame than the last one: read further ahead
+            wanted = 2 * len(self._buffer)
+        if placed == len(self._buffer):
+            return [parts[0]]
+        rest = StreamedTable(self._make_table, self._rows, self._buffer[placed:], placed)
+        rest._exhausted = self._exhausted
+        return [parts[0], rest]
+
+    def draw(self):
+        # Only reached when the remaining rows fit the frame
+        self._table.drawOn(self.canv, 0, 0)
+
+
+def compact_paragraphs(items: Iterable[str], style, prefix: str = "") -> List[CompactParagraph]:
+    """One CompactParagraph per item, e.g. bullet items with prefix "• " """
+    return [CompactParagraph(prefix + item, style) for item in items]
+
+
+__all__ = ['CompactParagraph', 'RTLParagraph', 'StreamedTable', 'compact_paragraphs', 'parse_cache_info', 'clear_parse_cache',
+           'PARSE_CACHE_SIZE']
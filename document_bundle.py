@@ -0,0 +1,173 @@
+"""
+BrainSAIT Document Bundles
+==========================
+Several documents rendered into one PDF in a single build pass
+
+BRAINSAIT: Department packages (plan + proposal + policy) as one deliverable
+NEURAL: One canvas for every document, so fonts are embedded once and no
+intermediate PDFs are written, re-parsed or merged
+BILINGUAL: Each document keeps its own bilingual header and footer
+
+The bundle opens with a cover and a combined table of contents, and every
+document and section gets a PDF bookmark. The contents is a
+document_contents.DocumentContents whose entries are the documents and
+their sections rather than heading paragraphs, so it reserves its pages up
+front and fills in the page numbers before saving; no second layout pass is
+needed.
+
+    bundle = DocumentBundle("Sales Department Package", department="Sales")
+    bundle.add_template('business-plan', department="Sales")
+    bundle.add_template('proposal', department="Sales", client_name="Bupa Arabia")
+    bundle.add_template('policy', department="Sales")
+    pdf = bundle.generate_pdf(None)
+"""
+
+import io
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Union
+
+from brainsait_document_system import (BrainSAITDocumentGenerator, DocumentHeaderFooter,
+                                       _document_template_class, letter)
+
+class _BundleDocument:
+    def __init__(self, generator: BrainSAITDocumentGenerator,
+                 content_sections: List[Dict[str, Any]], include_cover: bool):
+        self.generator = generator
+        self.content_sections = content_sections
+        self.include_cover = include_cover
+
+
+class DocumentBundle:
+    """
+    BRAINSAIT: Combine several documents into one PDF
+
+    Args:
+        title_en: Bundle title for the cover, contents and PDF metadata
+        title_ar: Arabic bundle title (optional)
+        department: Department shown on the bundle cover
+        classification: Classification on the cover and contents pages
+        author: PDF author
+        generated_at: Fixed timestamp for every document (reproducible output)
+        include_contents: Add the combined table of contents page(s)
+        include_sections: List sections (not just documents) in the contents
+    """
+
+    def __init__(self,
+                 title_en: str,
+                 title_ar: str = "",
+                 department: str = "",
+                 classification: str = "CONFIDENTIAL - INTERNAL USE ONLY",
+                 author: str = "BrainSAIT",
+                 generated_at: Optional[datetime] = None,
+                 include_contents: bool = True,
+                 include_sections: bool = True):
+        self.title_en = title_en
+        self.title_ar = title_ar
+        self.department = department
+        self.classification = classification
+        self.author = author
+        self.generated_at = generated_at
+        self.include_contents = include_contents
+        self.include_sections = include_sections
+        self.documents: List[_BundleDocument] = []
+
+    def add_document(self,
+                     generator: BrainSAITDocumentGenerator,
+                     content_sections,
+                     include_cover: bool = True) -> 'DocumentBundle':
+        """Add a document; its sections are materialized for the contents"""
+        self.documents.append(_BundleDocument(generator, list(content_sections), include_cover))
+        return self
+
+    def add_template(self, template_id: str, include_cover: bool = True,
+                     **params) -> 'DocumentBundle':
+        """Add a registered template (see template_registry) with its parameters"""
+        from template_registry import get_template_registry
+        template = get_template_registry().get(template_id)
+        generator = BrainSAITDocumentGenerator(**template.document_kwargs(**params))
+        return self.add_document(generator, template.content_sections(**params), include_cover)
+
+    def generate_pdf(self, filename: Union[str, BinaryIO, None]) -> Union[str, BinaryIO, bytes]:
+        """
+        Render the bundle to a path or writable stream, or return the PDF
+        bytes when filename is None
+        """
+        if filename is None:
+            buffer = io.BytesIO()
+            self._build_pdf(buffer)
+            return buffer.getvalue()
+        self._build_pdf(filename)
+        return filename
+
+    def _build_pdf(self, output):
+        from brainsait_document_system import LazyStory
+        from document_contents import DocumentContents
+
+        cover = BrainSAITDocumentGenerator(
+            document_type="Document Package",
+            department=self.department,
+            title_en=self.title_en,
+            title_ar=self.title_ar,
+            classification=self.classification,
+            author=self.author,
+            generated_at=self.generated_at
+        )
+        listed = len(self.documents)
+        if self.include_sections:
+            listed += sum(len(document.content_sections) for document in self.documents)
+        # Sections are still bookmarked when they are not listed
+        contents = DocumentContents(cover.design, cover.colors, expected=listed, headings=False)
+        doc = _document_template_class()(
+            output,
+            pagesize=letter,
+            header_footer=DocumentHeaderFooter(
+                document_type="Document Package",
+                department=self.department,
+                classification=self.classification,
+                generated_at=self.generated_at
+            ),
+            title=self.title_en,
+            author=self.author,
+            subject=f"Document Package - {self.department}" if self.department else "Document Package",
+            invariant=self.generated_at is not None,
+            contents=contents
+        )
+
+        for index, document in enumerate(self.documents):
+            generator = document.generator
+            doc.add_header_footer_template(f'document-{index}', DocumentHeaderFooter(
+                document_type=generator.document_type,
+                department=generator.department,
+                classification=generator.classification,
+                generated_at=self.generated_at or generator.generated_at,
+                form_suffix=f'-{index}'
+            ))
+        doc.build(LazyStory(self._iter_story(cover, contents)))
+
+    def _iter_story(self, cover: BrainSAITDocumentGenerator, contents) -> Iterator:
+        from reportlab.platypus import NextPageTemplate, PageBreak
+
+        # The cover's closing page break is replaced below, after the switch
+        # to the next page template has been queued
+        yield from cover.create_cover_page(self.generated_at)[:-1]
+
+        if self.include_contents:
+            yield PageBreak()
+            yield from contents.placeholders()
+
+        for index, document in enumerate(self.documents):
+            generator = document.generator
+            generated_at = self.generated_at or generator.generated_at
+
+            yield NextPageTemplate(f'document-{index}')
+            yield PageBreak()
+            yield contents.anchor(generator.title_en, 0)
+            if document.include_cover:
+                yield from generator.create_cover_page(generated_at)
+            for section in document.content_sections:
+                yield contents.anchor(section.get('title', ''), 1, listed=self.include_sections)
+                yield from generator.iter_story([section], include_cover=False,
+                                                generated_at=generated_at)
+
+
+__all__ = ['DocumentBundle']
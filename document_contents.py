@@ -0,0 +1,374 @@
+"""
+BrainSAIT Document Contents
+===========================
+Table of contents and PDF outline for a single document, without multiBuild
+
+NEURAL: ReportLab's TableOfContents needs multiBuild, which lays the whole
+document out again until the page numbers settle. Here the document template
+puts a zero-size anchor before each BrainSAITHeading1/2; when the anchor is
+drawn it bookmarks the heading, adds it to the PDF outline and records its
+text and page. The contents pages are reserved up front: each one links its
+rows to the headings' bookmarks as it is drawn and draws a Form XObject that
+is filled in from the recorded headings just before the PDF is saved, so the
+only extra work is laying out the contents rows themselves. Only the public
+canvas API is used (bookmarks, links and forms); no page objects are patched.
+NEURAL: Pages are reserved for the headings the sections announce (one per
+section plus heading paragraphs in their content). Sections that can only
+be read once (generators, streamed .jsonl) get one page and unlinked rows;
+should layout record more headings than fit, the last row refers the reader
+to the outline, which is always complete.
+BILINGUAL: Arabic documents list headings right-aligned, page numbers on the left
+
+    doc_gen = BrainSAITDocumentGenerator(..., table_of_contents=True)
+
+Callers that decide the entries themselves (document bundles) pass
+headings=False and put anchor(title, level) flowables where they belong.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from arabic_text import arabic_font, shape_arabic
+
+# Paragraph styles that become contents entries; the index is the outline level
+HEADING_STYLES = ('BrainSAITHeading1', 'BrainSAITHeading2')
+
+# Form XObject holding one reserved contents page
+_PAGE_FORM = 'BrainSAITContents{}'
+
+# Rows taken by the "Contents" title on the first page
+_TITLE_ROWS = 3
+
+_LABELS = {
+    'en': ("Contents", "Further headings are listed in the PDF bookmarks"),
+    'ar': ("المحتويات", "بقية العناوين مدرجة في إشارات ملف PDF المرجعية"),
+}
+
+
+class ContentsEntry:
+    """One recorded heading"""
+
+    def __init__(self, key: str, title: str, text: str, font: str, level: int, page: int):
+        self.key = key
+        # Logical-order title for the outline; text is what the heading drew
+        self.title = title
+        self.text = text
+        self.font = font
+        self.level = level
+        self.page = page
+
+
+def _heading_key(number: int) -> str:
+    """Bookmark name of the number-th heading"""
+    return f'heading{number}'
+
+
+def _is_heading(flowable) -> bool:
+    return getattr(getattr(flowable, 'style', None), 'name', None) in HEADING_STYLES
+
+
+def _count_headings(flowables) -> int:
+    """Heading paragraphs among flowables, including inside KeepTogether and similar"""
+    count = 0
+    for flowable in flowables:
+        if _is_heading(flowable):
+            count += 1
+        elif isinstance(getattr(flowable, '_content', None), (list, tuple)):
+            count += _count_headings(flowable._content)
+    return count
+
+
+def expected_headings(content_sections: Iterable[Dict[str, Any]]) -> Optional[int]:
+    """
+    Headings the sections will produce, or None when the sections (or a
+    section's content) can only be read once
+    """
+    if not isinstance(content_sections, (list, tuple)):
+        return None
+    count = 0
+    for section in content_sections:
+        content = section.get('content', [])
+        if not isinstance(content, (list, tuple)):
+            return None
+        count += 1 + _count_headings(content)
+    return count
+
+
+def _fit(text: str, font: str, size: float, width: float, rtl: bool) -> str:
+    """Shorten text with an ellipsis to fit width (shaped Arabic loses its visual left)"""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    if stringWidth(text, font, size) <= width:
+        return text
+    while len(text) > 1:
+        text = text[1:] if rtl else text[:-1]
+        shortened = '…' + text if rtl else text + '…'
+        if stringWidth(shortened, font, size) <= width:
+            return shortened
+    return text
+
+
+def _entry_anchor(contents: 'DocumentContents', *entry):
+    """Zero-size flowable that bookmarks and records an entry where it is drawn"""
+    from reportlab.platypus import Flowable
+
+    class Anchor(Flowable):
+        def __init__(self):
+            Flowable.__init__(self)
+            # Placed on the page of whatever follows, at its top
+            self.keepWithNext = True
+
+        def wrap(self, availWidth, availHeight):
+            return 0, 0
+
+        def draw(self):
+            contents._record(self.canv, *entry)
+
+    return Anchor()
+
+
+class DocumentContents:
+    """
+    NEURAL: Headings recorded during layout, drawn onto reserved contents pages
+
+    Args:
+        design: BrainSAITDesignSystem of the document
+        colors: BrainSAITColors of the document
+        language: Document language ('ar' lays the contents out right-to-left)
+        expected: Headings to reserve pages for (see expected_headings)
+        headings: Anchor heading paragraphs automatically; when False, only
+            anchor() flowables produce entries
+    """
+
+    def __init__(self, design, colors, language: str = 'en', expected: int = 0,
+                 headings: bool = True):
+        self.design = design
+        self.colors = colors
+        self.rtl = language == 'ar'
+        self.title, self.more = _LABELS.get(language, _LABELS['en'])
+        self.expected = expected
+        self.headings = headings
+        self.entries: List[ContentsEntry] = []
+        # Inner frame (width, height), set by the document template
+        self.frame_size: Optional[tuple] = None
+        # (width, height) of each reserved page as laid out
+        self._pages: List[tuple] = []
+        self._level = -1
+        # Outline-only anchors (see anchor)
+        self._unlisted = 0
+
+    @property
+    def row_height(self) -> float:
+        return self.design.SIZE_BODY * 1.8
+
+    def capacity(self, pages: int) -> int:
+        """Rows that fit on this many contents pages"""
+        rows = int(self.frame_size[1] // self.row_height)
+        return max(1, pages * rows - _TITLE_ROWS)
+
+    def pages_for(self, count: int) -> int:
+        pages = 1
+        while self.capacity(pages) < count:
+            pages += 1
+        return pages
+
+    def _rows(self, index: int, height: float):
+        """(row number, row top) of each row slot on reserved page index"""
+        per_page = int(height // self.row_height)
+        top = height
+        first = 0
+        free = per_page
+        if index == 0:
+            top -= _TITLE_ROWS * self.row_height
+            free -= _TITLE_ROWS
+        else:
+            first = index * per_page - _TITLE_ROWS
+        for slot in range(free):
+            top -= self.row_height
+            yield first + slot, top
+
+    @property
+    def overflow(self) -> int:
+        """Recorded headings that did not fit the reserved pages"""
+        return max(0, len(self.entries) - self.capacity(len(self._pages)))
+
+    def placeholders(self) -> List:
+        """Flowables reserving the contents pages (each fills its frame)"""
+        return [self._placeholder(index) for index in range(self.pages_for(self.expected))]
+
+    def _placeholder(self, index: int):
+        from reportlab.platypus import Flowable
+
+        contents = self
+
+        class ContentsPage(Flowable):
+            def wrap(self, availWidth, availHeight):
+                self.width, self.height = availWidth, availHeight
+                return availWidth, availHeight
+
+            def draw(self):
+                canvas = self.canv
+                contents._pages.append((self.width, self.height))
+                if index == 0:
+                    canvas.bookmarkPage('contents')
+                    contents._add_outline(canvas, contents.title, 'contents', 0)
+                canvas.doForm(_PAGE_FORM.format(index))
+                # Rows announced up front are linked now; their headings'
+                # bookmarks are defined when those are drawn
+                for row, top in contents._rows(index, self.height):
+                    if row >= contents.expected:
+                        break
+                    canvas.linkRect('', _heading_key(row),
+                                    (0, top, self.width, top + contents.row_height),
+                                    relative=1)
+
+        return ContentsPage()
+
+    def _add_outline(self, canvas, title: str, key: str, level: int):
+        # Outline levels may only step down one at a time
+        level = min(level, self._level + 1)
+        self._level = level
+        canvas.addOutlineEntry(title, key, level=level)
+
+    def filter(self, flowables):
+        """
+        Called by the document template before it handles flowables[0]
+
+        Puts an anchor before the next heading, including headings inside
+        containers such as KeepTogether (their first piece is placed
+        without passing through here again).
+        """
+        first = flowables[0] if flowables else None
+        if first is None or not self.headings:
+            return
+        if _is_heading(first):
+            if not getattr(first, '_contents_anchored', False):
+                flowables.insert(0, self._anchor(first))
+        elif isinstance(getattr(first, '_content', None), (list, tuple)):
+            self._anchor_all(first)
+
+    def _anchor_all(self, container):
+        content = list(container._content)
+        for flowable in list(content):
+            if _is_heading(flowable) and not getattr(flowable, '_contents_anchored', False):
+                content.insert(content.index(flowable), self._anchor(flowable))
+            elif isinstance(getattr(flowable, '_content', None), (list, tuple)):
+                self._anchor_all(flowable)
+        container._content = content
+
+    def _anchor(self, heading):
+        """Anchor recording the heading paragraph after it"""
+        heading._contents_anchored = True
+        text = heading.getPlainText()
+        return _entry_anchor(self, getattr(heading, 'outline_title', None) or text, text,
+                       heading.style.fontName, HEADING_STYLES.index(heading.style.name))
+
+    def anchor(self, title: str, level: int = 0, font: Optional[str] = None,
+               listed: bool = True):
+        """
+        Zero-size flowable that adds an entry for whatever follows it
+
+        font defaults to bold body text at level 0 and body text below it.
+        Unlisted anchors get a bookmark and outline entry but no contents row.
+        """
+        if font is None:
+            font = self.design.FONT_BODY_BOLD if level == 0 else self.design.FONT_BODY
+        return _entry_anchor(self, title, title, font, level, listed)
+
+    def _record(self, canvas, title: str, text: str, font: str, level: int,
+                listed: bool = True):
+        if listed:
+            key = _heading_key(len(self.entries))
+        else:
+            key = f'outline{self._unlisted}'
+            self._unlisted += 1
+        canvas.bookmarkHorizontal(key, 0, 0)
+        self._add_outline(canvas, title, key, level)
+        if listed:
+            self.entries.append(ContentsEntry(key, title, text, font, level,
+                                              canvas.getPageNumber()))
+
+    def finish(self, canvas):
+        """
+        Draw the rows into the reserved pages' forms
+
+        Runs before the PDF is saved, when every page number is known.
+        """
+        entries = self.entries
+        overflow = self.overflow
+        if overflow:
+            entries = entries[:len(entries) - overflow - 1]
+
+        rows = iter(entries)
+        for index, (width, height) in enumerate(self._pages):
+            canvas.beginForm(_PAGE_FORM.format(index), lowerx=0, lowery=0,
+                             upperx=width, uppery=height)
+            if index == 0:
+                self._draw_title(canvas, width, height)
+            free_top = None
+            for _, top in self._rows(index, height):
+                entry = next(rows, None)
+                if entry is None:
+                    free_top = top
+                    break
+                self._draw_row(canvas, entry, width, top)
+            if overflow and index == len(self._pages) - 1 and free_top is not None:
+                # The slot after the last row refers the reader to the outline
+                self._draw_more(canvas, width, free_top)
+            canvas.endForm()
+
+    def _draw_title(self, canvas, width: float, top: float):
+        design = self.design
+        size = design.SIZE_HEADING1
+        canvas.setFillColor(self.colors.MEDICAL_BLUE)
+        if self.rtl:
+            canvas.setFont(arabic_font(design.FONT_ARABIC), size)
+            canvas.drawRightString(width, top - size, shape_arabic(self.title))
+        else:
+            canvas.setFont(design.FONT_SUBTITLE, size)
+            canvas.drawString(0, top - size, self.title)
+
+    def _draw_row(self, canvas, entry: ContentsEntry, width: float, top: float):
+        """Title, dot leader and page number on one row"""
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        design = self.design
+        size = design.SIZE_BODY
+        baseline = top + size * 0.5
+        indent = 18 * entry.level
+        number = str(entry.page)
+        number_width = stringWidth(number, design.FONT_BODY, size)
+        text = _fit(entry.text, entry.font, size, width - indent - number_width - 24, self.rtl)
+        text_width = stringWidth(text, entry.font, size)
+
+        canvas.setFont(entry.font, size)
+        canvas.setFillColor(self.colors.MIDNIGHT_BLUE)
+        if self.rtl:
+            canvas.drawRightString(width - indent, baseline, text)
+            dots_start, dots_end = number_width + 6, width - indent - text_width - 6
+        else:
+            canvas.drawString(indent, baseline, text)
+            dots_start, dots_end = indent + text_width + 6, width - number_width - 6
+
+        canvas.setFont(design.FONT_BODY, size)
+        canvas.setFillColor(self.colors.PROFESSIONAL_GRAY)
+        dot = stringWidth('.', design.FONT_BODY, size)
+        if dots_end > dots_start:
+            canvas.drawString(dots_start, baseline, '.' * int((dots_end - dots_start) / dot))
+        if self.rtl:
+            canvas.drawString(0, baseline, number)
+        else:
+            canvas.drawRightString(width, baseline, number)
+
+    def _draw_more(self, canvas, width: float, top: float):
+        design = self.design
+        size = design.SIZE_SMALL
+        canvas.setFillColor(self.colors.PROFESSIONAL_GRAY)
+        if self.rtl:
+            canvas.setFont(arabic_font(design.FONT_ARABIC), size)
+            canvas.drawRightString(width, top + size * 0.5, shape_arabic(self.more))
+        else:
+            canvas.setFont(design.FONT_BODY, size)
+            canvas.drawString(0, top + size * 0.5, self.more)
+
+
+__all__ = ['DocumentContents', 'ContentsEntry', 'expected_headings', 'HEADING_STYLES']
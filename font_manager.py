@@ -0,0 +1,126 @@
+"""
+BrainSAIT Font Manager
+======================
+Process-wide, lazy TrueType font registration with a subset cache
+
+NEURAL: Each font file is parsed once per process, on first use, and its
+metrics are shared by every generator through ReportLab's font registry
+NEURAL: Embedded subsets are memoized by glyph set, so documents that use the
+same characters (brand strings, department names) reuse the subset binary
+instead of rebuilding it for every document
+
+Fonts are declared up front (cheap) and only parsed when a style or canvas
+first asks for them:
+
+    fonts = get_font_manager()
+    fonts.declare("BrainSAITArabic", ["/path/to/IBMPlexSansArabic-Regular.ttf"])
+    font_name = fonts.font("BrainSAITArabic", fallback="Helvetica")
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+# Subset binaries kept per font face
+SUBSET_CACHE_SIZE = 256
+
+
+class FontManager:
+    """
+    NEURAL: Registry of declared fonts, registered with ReportLab on demand
+
+    Thread-safe; a declared font whose files are all missing resolves to the
+    caller's fallback instead of raising.
+    """
+
+    def __init__(self, subset_cache_size: int = SUBSET_CACHE_SIZE):
+        self.subset_cache_size = subset_cache_size
+        self._candidates: Dict[str, List[str]] = {}
+        self._resolved: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self.subset_hits = 0
+        self.subset_misses = 0
+
+    def declare(self, name: str, candidates: Iterable[str]):
+        """Declare a font by name and candidate TTF paths (nothing is parsed yet)"""
+        with self._lock:
+            self._candidates[name] = [path for path in candidates if path]
+            self._resolved.pop(name, None)
+
+    def font(self, name: str, fallback: str) -> str:
+        """Name to draw with: the declared font if it could be registered, else fallback"""
+        resolved = self._resolved.get(name, False)
+        if resolved is False:
+            with self._lock:
+                resolved = self._resolved.get(name, False)
+                if resolved is False:
+                    resolved = self._register(name)
+                    self._resolved[name] = resolved
+        return resolved or fallback
+
+    def path(self, name: str) -> Optional[str]:
+        """First existing file for a declared font"""
+        for candidate in self._candidates.get(name, ()):
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+    def preload(self):
+        """Register every declared font now (e.g. while warming a worker)"""
+        for name in list(self._candidates):
+            self.font(name, fallback=name)
+
+    def subset_cache_info(self) -> Dict[str, int]:
+        return {'hits': self.subset_hits, 'misses': self.subset_misses}
+
+    def _register(self, name: str) -> Optional[str]:
+        from reportlab.pdfbase import pdfmetrics
+
+        if name in pdfmetrics.getRegisteredFontNames():
+            return name
+        path = self.path(name)
+        if path is None:
+            return None
+
+        from reportlab.pdfbase.ttfonts import TTFont
+        font = TTFont(name, path)
+        self._cache_subsets(font.face)
+        pdfmetrics.registerFont(font)
+        return name
+
+    def _cache_subsets(self, face):
+        """Memoize face.makeSubset by glyph set (LRU, per face)"""
+        make_subset = face.makeSubset
+        cache: 'OrderedDict[tuple, bytes]' = OrderedDict()
+        lock = threading.Lock()
+        manager = self
+
+        def cached_make_subset(subset):
+            key = tuple(subset)
+            with lock:
+                data = cache.get(key)
+                if data is not None:
+                    cache.move_to_end(key)
+                    manager.subset_hits += 1
+                    return data
+            data = make_subset(subset)
+            with lock:
+                manager.subset_misses += 1
+                cache[key] = data
+                while len(cache) > manager.subset_cache_size:
+                    cache.popitem(last=False)
+            return data
+
+        face.makeSubset = cached_make_subset
+
+
+_manager = FontManager()
+
+
+def get_font_manager() -> FontManager:
+    """The process-wide font manager"""
+    return _manager
+
+
+__all__ = ['FontManager', 'get_font_manager']
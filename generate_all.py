@@ -5,111 +5,102 @@ Generate all business documents for all departments
 
 BRAINSAIT: Complete document suite for enterprise operations
 BILINGUAL: Full Arabic/English support across all templates
+NEURAL: Suite is a job manifest rendered by batch_runner, optionally in parallel
+
+Runs are incremental: batch_runner's build index (results.json in the output
+directory) fingerprints every output, so only documents whose template,
+parameters, design system or rendering library changed are rendered again.
+
+With --queue, the out-of-date documents are submitted to a render queue as a
+tenant's bulk run instead of being rendered here, so they share the workers
+fairly with interactive requests (see render_queue):
+
+    python generate_all.py --queue renders.sqlite --tenant acme -o out/
 """
 
+import argparse
 import os
 import sys
-from document_templates import DocumentTemplates
+from typing import Dict, List, Optional
+
+from batch_runner import (RESULTS_FILENAME, load_manifest, load_results, run_jobs,
+                          update_results, write_results)
 
-# Ensure output directory exists
 OUTPUT_DIR = "/mnt/user-data/outputs/brainsait-documents"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+SUITE_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              "manifests", "document_suite.json")
+
+# Worker processes used when no explicit count is given (1 = sequential)
+DEFAULT_WORKERS = int(os.environ.get("BRAINSAIT_WORKERS", "1"))
 
-def generate_all_documents():
+
+def generate_all_documents(workers: Optional[int] = None,
+                           output_dir: str = OUTPUT_DIR,
+                           manifest: str = SUITE_MANIFEST,
+                           force: bool = False,
+                           include_catalog: bool = False) -> List[str]:
     """
     Generate comprehensive document suite for all departments
     
     BRAINSAIT: Creates complete set of professional business documents
+    NEURAL: With workers > 1, jobs are rendered by a process pool
+
+    Args:
+        workers: Number of worker processes (defaults to DEFAULT_WORKERS)
+        output_dir: Directory the documents are written to
+        manifest: Job manifest describing the suite
+        force: Re-render documents that are already up to date
+        include_catalog: Also render the template catalog (see create_catalog)
+
+    Returns:
+        Output paths of the documents that are present and current, in
+        manifest order
     """
     print("=" * 80)
     print("BrainSAIT Document Template Generator")
     print("=" * 80)
     print()
     
-    departments = list(DocumentTemplates.DEPARTMENTS.keys())
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or DEFAULT_WORKERS
+    jobs = load_manifest(manifest)
+    if include_catalog:
+        jobs.append(catalog_job())
+    results_path = os.path.join(output_dir, RESULTS_FILENAME)
+    previous = {} if force else load_results(results_path)
+
+    results = run_jobs(jobs, output_dir, workers, previous, force)
+    write_results(results_path, results)
+
+    # Results come back in manifest order, so output stays deterministic
     generated_files = []
-    
-    # 1. Generate Business Plans for key departments
-    print("📊 Generating Business Plans...")
-    for dept in ['Technology', 'Products', 'Sales', 'Marketing']:
-        output_file = f"{OUTPUT_DIR}/{dept.replace(' ', '_')}_Business_Plan.pdf"
-        print(f"  ✓ Creating: {dept} Business Plan")
-        try:
-            DocumentTemplates.generate_business_plan(dept, output_file)
-            generated_files.append(output_file)
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-    print()
-    
-    # 2. Generate Business Proposals
-    print("📝 Generating Business Proposals...")
-    proposals = [
-        ('Technology', 'King Fahad Medical City'),
-        ('Sales', 'Bupa Arabia Insurance'),
-        ('Products', 'National Guard Health Affairs')
-    ]
-    for dept, client in proposals:
-        output_file = f"{OUTPUT_DIR}/{dept}_Proposal_{client.replace(' ', '_')}.pdf"
-        print(f"  ✓ Creating: {dept} Proposal for {client}")
-        try:
-            DocumentTemplates.generate_business_proposal(dept, output_file, client)
-            generated_files.append(output_file)
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-    print()
-    
-    # 3. Generate Company Policies
-    print("📋 Generating Company Policies...")
-    policies = [
-        ('Administration', 'Corporate Governance Policy'),
-        ('Technology', 'Information Security Policy'),
-        ('Human Resources', 'Code of Conduct Policy'),
-        ('Legal', 'Data Protection & Privacy Policy'),
-        ('Finance', 'Financial Management Policy')
-    ]
-    for dept, policy in policies:
-        output_file = f"{OUTPUT_DIR}/{dept.replace(' ', '_')}_{policy.replace(' ', '_')}.pdf"
-        print(f"  ✓ Creating: {dept} - {policy}")
-        try:
-            DocumentTemplates.generate_company_policy(dept, output_file, policy)
-            generated_files.append(output_file)
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
-    print()
-    
-    # 4. Generate Employee Handbook
-    print("👥 Generating Employee Handbook...")
-    handbook_file = f"{OUTPUT_DIR}/BrainSAIT_Employee_Handbook.pdf"
-    try:
-        DocumentTemplates.generate_employee_handbook(handbook_file)
-        generated_files.append(handbook_file)
-        print("  ✓ Created: Employee Handbook")
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-    print()
-    
-    # 5. Generate Marketing Plans
-    print("📢 Generating Marketing Plans...")
-    campaigns = [
-        'Q1 2025 Launch Campaign',
-        'Q2 2025 NPHIES Awareness',
-        'Q3 2025 Enterprise Growth'
-    ]
-    for campaign in campaigns:
-        output_file = f"{OUTPUT_DIR}/Marketing_Plan_{campaign.replace(' ', '_')}.pdf"
-        print(f"  ✓ Creating: {campaign}")
-        try:
-            DocumentTemplates.generate_marketing_plan(output_file, campaign)
-            generated_files.append(output_file)
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
+    group = None
+    for job, result in zip(jobs, results):
+        if job.get('group') != group:
+            if group is not None:
+                print()
+            group = job.get('group')
+            if group:
+                print(group)
+        label = job.get('label', result.get('path', result['id']))
+        if result['status'] == 'skipped':
+            print(f"  · Up to date: {label}")
+        else:
+            reasons = result.get('reasons')
+            print(f"  ✓ Creating: {label}" + (f" ({', '.join(reasons)})" if reasons else ""))
+        if result['status'] == 'failed':
+            print(f"  ✗ Error: {result.get('error')}")
+        else:
+            generated_files.append(result['path'])
     print()
     
     # Summary
+    rendered = sum(1 for result in results if result['status'] == 'ok')
     print("=" * 80)
     print(f"✅ Generation Complete!")
-    print(f"📁 Total Documents Generated: {len(generated_files)}")
-    print(f"📂 Output Directory: {OUTPUT_DIR}")
+    print(f"📁 Total Documents Generated: {len(generated_files)} "
+          f"({rendered} rendered, {len(generated_files) - rendered} up to date)")
+    print(f"📂 Output Directory: {output_dir}")
     print("=" * 80)
     print()
     print("Generated Documents:")
@@ -119,19 +110,42 @@ def generate_all_documents():
     
     return generated_files
 
-def create_catalog():
-    """Create a comprehensive catalog of all available templates"""
-    from brainsait_document_system import BrainSAITDocumentGenerator
-    
-    doc_gen = BrainSAITDocumentGenerator(
-        document_type="Template Catalog",
-        department="All Departments",
-        title_en="BrainSAIT Document Templates Catalog",
-        title_ar="كتالوج قوالب وثائق برين سايت",
-        classification="SALES MATERIAL - FOR DISTRIBUTION",
-        version="1.0"
-    )
-    
+CATALOG_FILENAME = "BrainSAIT_Templates_Catalog.pdf"
+
+
+def queue_all_documents(queue_path: str,
+                        tenant: str = "default",
+                        output_dir: str = OUTPUT_DIR,
+                        manifest: str = SUITE_MANIFEST,
+                        force: bool = False,
+                        include_catalog: bool = False) -> List[Optional[int]]:
+    """
+    Submit the out-of-date documents of the suite as a bulk run for a tenant
+
+    The queue's workers record each document in the build index as it
+    finishes. Returns the queue id of each job (None if it was not queued).
+    """
+    from render_queue import RenderQueue, enqueue_manifest
+
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = load_manifest(manifest)
+    if include_catalog:
+        jobs.append(catalog_job())
+    ids, results = enqueue_manifest(RenderQueue(queue_path), jobs, output_dir, tenant,
+                                    'bulk', force)
+
+    queued = sum(1 for job_id in ids if job_id is not None)
+    up_to_date = sum(1 for r in results if r is not None and r['status'] == 'skipped')
+    for job, result in zip(jobs, results):
+        if result is not None and result['status'] == 'failed':
+            print(f"  ✗ Error: {job.get('label', result['id'])}: {result.get('error')}")
+    print(f"📥 Queued {queued} documents for {tenant} in {queue_path} "
+          f"({up_to_date} up to date, {len(jobs) - queued - up_to_date} already queued or invalid)")
+    return ids
+
+
+def catalog_job() -> Dict:
+    """Render job (custom template) for the catalog of all available templates"""
     content_sections = [
         {
             'title': 'About BrainSAIT Document Templates',
@@ -243,18 +257,67 @@ def create_catalog():
         }
     ]
     
-    catalog_file = f"{OUTPUT_DIR}/BrainSAIT_Templates_Catalog.pdf"
-    doc_gen.generate_pdf(catalog_file, content_sections)
-    print(f"\n📖 Catalog created: {catalog_file}")
+    return {
+        'template': 'custom',
+        'group': "Catalog",
+        'label': "Template Catalog",
+        'output': CATALOG_FILENAME,
+        'document_type': "Template Catalog",
+        'department': "All Departments",
+        'title': "BrainSAIT Document Templates Catalog",
+        'title_ar': "كتالوج قوالب وثائق برين سايت",
+        'classification': "SALES MATERIAL - FOR DISTRIBUTION",
+        'version': "1.0",
+        'sections': content_sections,
+    }
+
+def create_catalog(output_dir: str = OUTPUT_DIR, force: bool = False):
+    """Create a comprehensive catalog of all available templates (skipped when up to date)"""
+    os.makedirs(output_dir, exist_ok=True)
+    results_path = os.path.join(output_dir, RESULTS_FILENAME)
+    previous = {} if force else load_results(results_path)
+    [result] = run_jobs([catalog_job()], output_dir, 1, previous, force)
+    update_results(results_path, [result])
+
+    if result['status'] == 'failed':
+        raise RuntimeError(f"Catalog failed: {result.get('error')}")
+    catalog_file = result['path']
+    if result['status'] == 'skipped':
+        print(f"\n📖 Catalog up to date: {catalog_file}")
+    else:
+        print(f"\n📖 Catalog created: {catalog_file} ({', '.join(result['reasons'])})")
     
     return catalog_file
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the BrainSAIT document suite")
+    parser.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help="number of worker processes (default: %(default)s)")
+    parser.add_argument("-o", "--output-dir", default=OUTPUT_DIR,
+                        help="output directory (default: %(default)s)")
+    parser.add_argument("-m", "--manifest", default=SUITE_MANIFEST,
+                        help="job manifest to render (default: the standard suite)")
+    parser.add_argument("--force", action="store_true", help="re-render up-to-date documents")
+    parser.add_argument("--queue", default=None,
+                        help="submit the documents to this render queue database as a bulk run")
+    parser.add_argument("--tenant", default="default",
+                        help="tenant the queued run belongs to (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.queue:
+        queue_all_documents(args.queue, args.tenant, args.output_dir, args.manifest,
+                            args.force, include_catalog=True)
+        sys.exit(0)
+
     # Generate all sample documents
-    generated_files = generate_all_documents()
-    
-    # Create catalog
-    catalog_file = create_catalog()
+    jobs_total = len(load_manifest(args.manifest))
+    # The catalog is rendered (or skipped) with the suite, sharing its build index
+    generated_files = generate_all_documents(workers=args.workers, output_dir=args.output_dir,
+                                             manifest=args.manifest, force=args.force,
+                                             include_catalog=True)
     
+    if len(generated_files) < jobs_total + 1:
+        print(f"\n⚠️  {jobs_total + 1 - len(generated_files)} document(s) failed")
+        sys.exit(1)
     print("\n🎉 All documents generated successfully!")
-    print(f"📁 Find your documents at: {OUTPUT_DIR}")
+    print(f"📁 Find your documents at: {args.output_dir}")
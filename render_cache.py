@@ -0,0 +1,229 @@
+"""
+BrainSAIT Render Cache
+======================
+Content-addressed cache for rendered PDF documents
+
+BRAINSAIT: Re-requested documents are served without re-rendering
+NEURAL: LRU eviction with optional TTL, in-memory or on-disk backends
+MEDICAL: Cache entries are keyed by content hash only; no PHI in key names
+
+A render is identified by a SHA-256 hash of the generator parameters and the
+content sections. With pin_timestamps enabled, the cover and footer show only
+the current day (no time of day) and the PDF is written in ReportLab's
+invariant mode, so a cached entry is byte-identical to a fresh render of the
+same inputs on the same day; the day is part of the key, so a new day starts
+new entries rather than serving documents dated yesterday.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def cache_key(params: Dict[str, Any], content_sections: Any) -> Optional[str]:
+    """
+    Stable hash of generator parameters and content sections
+
+    Returns None when the inputs contain objects that cannot be serialised
+    deterministically (for example pre-built flowables), in which case the
+    render should not be cached.
+    """
+    def reject(value):
+        raise TypeError(f"uncacheable value of type {type(value).__name__}")
+
+    try:
+        payload = json.dumps([params, content_sections], sort_keys=True,
+                             ensure_ascii=False, separators=(',', ':'), default=reject)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache(ABC):
+    """
+    Base class for render caches
+
+    Subclasses implement _load, _store, _evict and __len__; expiry,
+    statistics and locking are handled here. A cache with no entries is
+    falsy (it has a length), so test a cache argument with "is not None".
+    """
+
+    def __init__(self,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl: Optional[float] = None,
+                 pin_timestamps: bool = False):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.pin_timestamps = pin_timestamps
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def pinned_timestamp(self) -> Optional[date]:
+        """Day renders should show (printed without a time), or None for the current time"""
+        if not self.pin_timestamps:
+            return None
+        return date.today()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._load(key)
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return data
+
+    def set(self, key: str, data: bytes):
+        with self._lock:
+            self._store(key, data)
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': len(self),
+        }
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    @abstractmethod
+    def _load(self, key: str) -> Optional[bytes]:
+        """The entry's bytes, or None when missing or expired"""
+
+    @abstractmethod
+    def _store(self, key: str, data: bytes):
+        """Add or replace an entry"""
+
+    @abstractmethod
+    def _evict(self):
+        """Drop entries beyond max_entries, least recently used first"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored entries"""
+
+
+class MemoryRenderCache(RenderCache):
+    """In-process LRU cache of rendered PDF bytes"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl: Optional[float] = None, pin_timestamps: bool = False):
+        super().__init__(max_entries, ttl, pin_timestamps)
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+
+    def _load(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, data = entry
+        if self._expired(stored_at):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def _store(self, key: str, data: bytes):
+        self._entries[key] = (time.time(), data)
+        self._entries.move_to_end(key)
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskRenderCache(RenderCache):
+    """
+    On-disk LRU cache of rendered PDF bytes
+
+    Entries are stored as <key>.pdf files; the file mtime records the last
+    access and drives both LRU eviction and TTL expiry. The directory can be
+    shared between processes.
+    """
+
+    def __init__(self, directory: str, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl: Optional[float] = None, pin_timestamps: bool = False):
+        super().__init__(max_entries, ttl, pin_timestamps)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _load(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            if self._expired(os.path.getmtime(path)):
+                os.remove(path)
+                return None
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def _store(self, key: str, data: bytes):
+        # Write atomically so concurrent readers never see a partial PDF
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _entries(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pdf'):
+                yield entry
+
+    def _evict(self):
+        entries = list(self._entries())
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._entries())
+
+
+# Process-wide cache used by generators that were not given one explicitly
+_default_cache: Optional[RenderCache] = None
+
+
+def set_default_cache(cache: Optional[RenderCache]):
+    """Install (or with None, remove) the process-wide render cache"""
+    global _default_cache
+    _default_cache = cache
+
+
+def get_default_cache() -> Optional[RenderCache]:
+    return _default_cache
+
+
+__all__ = ['RenderCache', 'MemoryRenderCache', 'DiskRenderCache', 'cache_key',
+           'set_default_cache', 'get_default_cache']
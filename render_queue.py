@@ -0,0 +1,757 @@
+"""
+BrainSAIT Render Queue
+======================
+Durable render job queue shared by interactive requests and bulk runs
+
+BRAINSAIT: UI renders and tenant onboarding runs draw on one worker pool
+NEURAL: Jobs are claimed by priority class (interactive, normal, bulk) and,
+within a class, round-robin across tenants, so one tenant's 2,000-document
+run cannot hold up another tenant or a user waiting on a single proposal.
+The dispatcher also keeps bulk work off a reserved share of its workers, so
+an interactive job never waits for a bulk render to finish.
+MEDICAL: The queue is a local SQLite database: queued jobs survive a
+restart, a job whose worker died is re-queued once its lease expires, and
+transient failures are retried with exponential backoff before a job is
+recorded as failed. A dispatch round that fails is logged and the next one
+carries on; QueueDispatcher.health() reports a dispatcher that has stopped.
+
+Jobs are render service jobs (see render_service.validate_job). A job with
+an "output" path is written there; otherwise the PDF bytes are handed to an
+in-process waiter, or kept in the queue until collected (see wait).
+
+    queue = RenderQueue("renders.sqlite")
+    job_id = queue.enqueue({"template": "proposal", "department": "Sales",
+                            "client_name": "Bupa Arabia"},
+                           tenant="sales-ui", priority='interactive')
+
+Usage:
+    python render_queue.py serve --db renders.sqlite -j 4
+    python render_queue.py submit manifests/document_suite.json --db renders.sqlite \\
+        --tenant acme -o out/
+    python render_queue.py status --db renders.sqlite
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from batch_runner import (RESULTS_FILENAME, _write_atomic, load_manifest, load_results,
+                          plan_jobs, update_results)
+from render_service import DEFAULT_WORKERS, RenderJobError, render_job, validate_job
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, claimed in this order
+PRIORITIES = {'interactive': 0, 'normal': 1, 'bulk': 2}
+
+DEFAULT_TENANT = "default"
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Retry backoff: RETRY_BASE_S * 2^(attempt - 1), capped, with jitter
+RETRY_BASE_S = 2.0
+RETRY_MAX_S = 300.0
+
+# A claimed job is re-queued if its worker has not renewed the lease by then
+DEFAULT_LEASE_S = 300.0
+
+# Failures worth retrying: a worker process that died, memory pressure and
+# interrupted or would-block I/O. Anything else (including a missing source
+# file or a bad output path) would fail the same way again, so it fails at once.
+_TRANSIENT_ERRORS = (BrokenProcessPool, MemoryError, InterruptedError, BlockingIOError)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tenant TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    job TEXT NOT NULL,
+    dedupe_key TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_expires REAL,
+    worker TEXT,
+    error TEXT,
+    result TEXT,
+    report TEXT,
+    allow_files INTEGER NOT NULL DEFAULT 0,
+    pdf BLOB
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, priority, available_at);
+CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status);
+CREATE TABLE IF NOT EXISTS tenants (
+    tenant TEXT PRIMARY KEY,
+    served INTEGER NOT NULL
+);
+"""
+
+# Columns returned by RenderQueue.get (the PDF is fetched separately)
+_COLUMNS = ('id', 'tenant', 'priority', 'job', 'status', 'attempts', 'max_attempts',
+            'available_at', 'enqueued_at', 'started_at', 'finished_at', 'worker',
+            'error', 'result')
+
+
+class QueuedJob:
+    """A job claimed from the queue"""
+
+    def __init__(self, id: int, tenant: str, priority: int, job: Dict[str, Any],
+                 attempts: int, report: Optional[Dict[str, Any]], allow_files: bool = False,
+                 worker: Optional[str] = None):
+        self.id = id
+        self.tenant = tenant
+        self.priority = priority
+        self.job = job
+        self.attempts = attempts
+        # Build index entry to record on completion (see enqueue_manifest)
+        self.report = report
+        # Whether the job was queued from a trusted source (see enqueue)
+        self.allow_files = allow_files
+        # Lease holder; complete/fail are ignored once the lease has moved on
+        self.worker = worker
+
+
+def _priority(priority) -> int:
+    if priority in PRIORITIES:
+        return PRIORITIES[priority]
+    if priority in PRIORITIES.values():
+        return priority
+    raise ValueError(f"unknown priority: {priority!r}")
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds before retry number attempt (1-based), with 50-100% jitter"""
+    delay = min(RETRY_MAX_S, RETRY_BASE_S * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+class RenderQueue:
+    """
+    MEDICAL: Durable render queue in a SQLite database
+
+    Safe to share between threads and processes: each thread has its own
+    connection and claims are made in immediate transactions.
+
+    Args:
+        path: Database file (created with its schema on first use)
+        lease_s: Seconds a claimed job stays leased to its worker
+    """
+
+    def __init__(self, path: str, lease_s: float = DEFAULT_LEASE_S):
+        self.path = path
+        self.lease_s = lease_s
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front, so two claims never race
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    # -- Producers ---------------------------------------------------------
+
+    def enqueue(self, job: Dict[str, Any], tenant: str = DEFAULT_TENANT,
+                priority='normal', max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                dedupe_key: Optional[str] = None, allow_files: bool = False) -> Optional[int]:
+        """
+        Validate and add a job; returns its id, or None when dedupe_key
+        matches a job that is still queued or running
+
+        Only jobs queued with allow_files may read files or name an output
+        path to write; set it only for trusted sources such as manifests.
+
+        Raises:
+            RenderJobError: If the job is invalid (see render_service.validate_job)
+        """
+        [job_id] = self.enqueue_many([job], tenant, priority, max_attempts,
+                                     [dedupe_key], allow_files=allow_files)
+        return job_id
+
+    def enqueue_many(self, jobs: Iterable[Dict[str, Any]], tenant: str = DEFAULT_TENANT,
+                     priority='bulk', max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                     dedupe_keys: Optional[List[Optional[str]]] = None,
+                     reports: Optional[List[Optional[Dict[str, Any]]]] = None,
+                     allow_files: bool = False) -> List[Optional[int]]:
+        """Add several jobs for one tenant in a single transaction (see enqueue)"""
+        if not isinstance(tenant, str) or not tenant:
+            raise ValueError("tenant must be a non-empty string")
+        priority = _priority(priority)
+        jobs = [validate_job(job, allow_files=allow_files) for job in jobs]
+        if not allow_files and any(job.get('output') for job in jobs):
+            raise RenderJobError("jobs may not write server-side files")
+        dedupe_keys = dedupe_keys or [None] * len(jobs)
+        reports = reports or [None] * len(jobs)
+        now = time.time()
+        ids: List[Optional[int]] = []
+        with self._transaction() as db:
+            # A new tenant starts level with the most recently served one, so
+            # it is not ahead of tenants that have been waiting
+            db.execute(
+                "INSERT INTO tenants (tenant, served) VALUES"
+                " (?, (SELECT COALESCE(MAX(served), 0) FROM tenants))"
+                " ON CONFLICT (tenant) DO NOTHING", (tenant,))
+            for job, key, report in zip(jobs, dedupe_keys, reports):
+                if key is not None and db.execute(
+                        "SELECT 1 FROM jobs WHERE dedupe_key = ? AND status IN ('queued', 'running')",
+                        (key,)).fetchone():
+                    ids.append(None)
+                    continue
+                cursor = db.execute(
+                    "INSERT INTO jobs (tenant, priority, job, dedupe_key, max_attempts,"
+                    " available_at, enqueued_at, report, allow_files)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (tenant, priority, json.dumps(job, ensure_ascii=False), key, max_attempts,
+                     now, now, json.dumps(report, ensure_ascii=False) if report else None,
+                     int(allow_files)))
+                ids.append(cursor.lastrowid)
+        return ids
+
+    # -- Workers -----------------------------------------------------------
+
+    def claim(self, worker: str, priorities: Iterable[int] = tuple(PRIORITIES.values())
+              ) -> Optional[QueuedJob]:
+        """
+        Lease the next job to a worker, or return None when none is ready
+
+        NEURAL: The best priority class wins; within it, the tenant served
+        longest ago (a new tenant counts as served at its first enqueue),
+        then that tenant's oldest job.
+        """
+        priorities = tuple(priorities)
+        if not priorities:
+            return None
+        now = time.time()
+        with self._transaction() as db:
+            self._recover_expired(db, now)
+            row = db.execute(
+                "SELECT j.id, j.tenant, j.priority, j.job, j.attempts, j.report, j.allow_files"
+                " FROM jobs j"
+                " LEFT JOIN tenants t ON t.tenant = j.tenant"
+                " WHERE j.status = 'queued' AND j.available_at <= ?"
+                f" AND j.priority IN ({', '.join('?' * len(priorities))})"
+                " ORDER BY j.priority, COALESCE(t.served, 0), j.id LIMIT 1",
+                (now,) + priorities).fetchone()
+            if row is None:
+                return None
+            job_id, tenant, priority, job, attempts, report, allow_files = row
+            db.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?,"
+                " started_at = ?, lease_expires = ? WHERE id = ?",
+                (worker, now, now + self.lease_s, job_id))
+            db.execute(
+                "INSERT INTO tenants (tenant, served) VALUES"
+                " (?, (SELECT COALESCE(MAX(served), 0) + 1 FROM tenants))"
+                " ON CONFLICT (tenant) DO UPDATE SET served = excluded.served",
+                (tenant,))
+        return QueuedJob(job_id, tenant, priority, json.loads(job), attempts + 1,
+                         json.loads(report) if report else None, bool(allow_files), worker)
+
+    def _recover_expired(self, db: sqlite3.Connection, now: float):
+        """Re-queue (or fail) jobs whose worker stopped renewing its lease"""
+        expired = db.execute(
+            "SELECT id, worker, attempts, max_attempts FROM jobs"
+            " WHERE status = 'running' AND lease_expires < ?", (now,)).fetchall()
+        for job_id, worker, attempts, max_attempts in expired:
+            self._retry_or_fail(db, job_id, worker, attempts, max_attempts,
+                                "worker lost", now, True)
+
+    # Matches a job only while the given lease (worker and attempt) still holds it
+    _LEASED = "id = ? AND status = 'running' AND worker = ? AND attempts = ?"
+
+    def renew(self, jobs: Iterable[QueuedJob]):
+        """Extend the leases of jobs that are still being rendered"""
+        jobs = list(jobs)
+        if not jobs:
+            return
+        expires = time.time() + self.lease_s
+        with self._transaction() as db:
+            db.executemany(
+                f"UPDATE jobs SET lease_expires = ? WHERE {self._LEASED}",
+                [(expires, job.id, job.worker, job.attempts) for job in jobs])
+
+    def complete(self, job: QueuedJob, result: Dict[str, Any],
+                 pdf: Optional[bytes] = None) -> bool:
+        """
+        Record a finished render; returns False if the job's lease was lost
+
+        A worker whose lease expired may still finish after the job has been
+        re-queued or claimed again; its result is then ignored.
+        """
+        with self._transaction() as db:
+            return db.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, lease_expires = NULL,"
+                f" error = NULL, result = ?, pdf = ? WHERE {self._LEASED}",
+                (time.time(), json.dumps(result), pdf,
+                 job.id, job.worker, job.attempts)).rowcount == 1
+
+    def fail(self, job: QueuedJob, error: str, retry: bool = True) -> Optional[bool]:
+        """
+        Record a failed attempt; returns True if the job was re-queued, False
+        if it failed for good, and None if the job's lease was lost
+
+        Jobs are retried after retry_delay() until max_attempts is reached.
+        """
+        with self._transaction() as db:
+            row = db.execute("SELECT max_attempts FROM jobs WHERE id = ?",
+                             (job.id,)).fetchone()
+            if row is None:
+                return None
+            return self._retry_or_fail(db, job.id, job.worker, job.attempts, row[0],
+                                       error, time.time(), retry)
+
+    def _retry_or_fail(self, db, job_id: int, worker: str, attempts: int,
+                       max_attempts: int, error: str, now: float,
+                       retry: bool) -> Optional[bool]:
+        if retry and attempts < max_attempts:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'queued', available_at = ?, lease_expires = NULL,"
+                f" worker = NULL, error = ? WHERE {self._LEASED}",
+                (now + retry_delay(attempts), error, job_id, worker, attempts))
+            retried = True
+        else:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, lease_expires = NULL,"
+                f" error = ? WHERE {self._LEASED}", (now, error, job_id, worker, attempts))
+            retried = False
+        return retried if cursor.rowcount == 1 else None
+
+    # -- Inspection --------------------------------------------------------
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """A job's state, without its PDF bytes"""
+        row = self._connection().execute(
+            f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(_COLUMNS, row))
+        record['job'] = json.loads(record['job'])
+        record['result'] = json.loads(record['result']) if record['result'] else None
+        return record
+
+    def wait(self, job_id: int, timeout: Optional[float] = None,
+             poll_s: float = 0.05) -> Tuple[Dict[str, Any], Optional[bytes]]:
+        """
+        Block until a job is done or has failed for good (from any process)
+
+        Returns the job's state and its PDF bytes, if the queue kept them;
+        the bytes are released from the queue once collected.
+
+        Raises:
+            TimeoutError: If the job is still pending after timeout seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            record = self.get(job_id)
+            if record is None:
+                raise KeyError(job_id)
+            if record['status'] in ('done', 'failed'):
+                break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"job {job_id} still {record['status']}")
+            time.sleep(poll_s)
+        with self._transaction() as db:
+            row = db.execute("SELECT pdf FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            db.execute("UPDATE jobs SET pdf = NULL WHERE id = ?", (job_id,))
+        return record, row[0] if row else None
+
+    def finished(self, job_ids: Iterable[int]) -> Set[int]:
+        """The given jobs that are done or have failed for good"""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return set()
+        return {job_id for job_id, in self._connection().execute(
+            "SELECT id FROM jobs WHERE status IN ('done', 'failed')"
+            f" AND id IN ({', '.join('?' * len(job_ids))})", job_ids)}
+
+    def stats(self) -> Dict[str, Any]:
+        """Job counts by status, by priority class and by tenant (pending jobs)"""
+        db = self._connection()
+        names = {value: name for name, value in PRIORITIES.items()}
+        by_status = dict(db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        pending: Dict[str, Dict[str, int]] = {}
+        for priority, status, count in db.execute(
+                "SELECT priority, status, COUNT(*) FROM jobs"
+                " WHERE status IN ('queued', 'running') GROUP BY priority, status"):
+            pending.setdefault(names.get(priority, str(priority)), {})[status] = count
+        tenants = dict(db.execute(
+            "SELECT tenant, COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+            " GROUP BY tenant"))
+        return {'status': by_status, 'priorities': pending, 'tenants': tenants}
+
+    def prune(self, older_than_s: float) -> int:
+        """Delete finished jobs older than this; returns how many were removed"""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+                (time.time() - older_than_s,))
+        return cursor.rowcount
+
+
+def execute_queued(job: Dict[str, Any],
+                   allow_files: bool = False) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """
+    Render a queued job in a worker process
+
+    Writes the job's output path if it has one (and returns no bytes);
+    otherwise returns the PDF bytes. allow_files is the job's trust as
+    recorded at enqueue time.
+    """
+    start = time.perf_counter()
+    data = render_job(job, allow_files=allow_files)
+    result: Dict[str, Any] = {'size': len(data)}
+    if job.get('output'):
+        _write_atomic(job['output'], data)
+        result['path'] = job['output']
+        data = None
+    result['duration_s'] = round(time.perf_counter() - start, 4)
+    return result, data
+
+
+class QueueDispatcher:
+    """
+    NEURAL: Feed queued jobs to a pool of pre-warmed render workers
+
+    Args:
+        queue: The RenderQueue to serve
+        workers: Worker processes
+        reserved: Workers bulk jobs may not occupy, so interactive and
+            normal jobs start without waiting (at most workers - 1)
+        poll_s: How often the queue is checked for jobs from other processes
+        cache_dir, cache_entries: Worker render cache (see render_service)
+    """
+
+    def __init__(self, queue: RenderQueue, workers: int = DEFAULT_WORKERS,
+                 reserved: int = 1, poll_s: float = 0.2,
+                 cache_dir: Optional[str] = None, cache_entries: int = 0):
+        self.queue = queue
+        self.workers = max(1, workers)
+        self.reserved = max(0, min(reserved, self.workers - 1))
+        self.poll_s = poll_s
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._pool_args = (cache_dir, cache_entries)
+        self._executor = self._new_executor()
+        # Render future -> (claimed job, the executor running it)
+        self._in_flight: Dict[Future, Tuple[QueuedJob, ProcessPoolExecutor]] = {}
+        # Callers waiting in this process, by job id
+        self._waiters: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        # Completed by submit() and close() so the loop stops waiting on renders
+        self._wake: Future = Future()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        # Last error that interrupted a dispatch round, for health()
+        self.error: Optional[str] = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        from render_service import _warm_worker
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker,
+                                   initargs=self._pool_args)
+
+    def start(self) -> 'QueueDispatcher':
+        """Start the workers (warmed up before this returns) and begin claiming jobs"""
+        if self._thread is None:
+            for future in [self._executor.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+            self._thread = threading.Thread(target=self._run, name="render-queue",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, job: Dict[str, Any], tenant: str = DEFAULT_TENANT,
+               priority='interactive') -> Future:
+        """
+        Queue a job and return a Future for its (result, pdf bytes)
+
+        The Future fails with RuntimeError if the job fails for good.
+
+        Raises:
+            RuntimeError: If the dispatch thread was started and has died
+        """
+        if self._thread is not None and not self.alive():
+            raise RuntimeError(f"Render queue dispatcher stopped: {self.error}")
+        future: Future = Future()
+        with self._lock:
+            job_id = self.queue.enqueue(job, tenant, priority)
+            self._waiters[job_id] = future
+        self._wakeup()
+        return future
+
+    def _wakeup(self):
+        with self._lock:
+            if not self._wake.done():
+                self._wake.set_result(None)
+
+    def _allowed(self) -> Tuple[int, ...]:
+        """Priority classes that may take the next free worker"""
+        bulk = sum(1 for claimed, _ in self._in_flight.values()
+                   if claimed.priority >= PRIORITIES['bulk'])
+        if bulk >= self.workers - self.reserved:
+            return tuple(p for p in PRIORITIES.values() if p < PRIORITIES['bulk'])
+        return tuple(PRIORITIES.values())
+
+    def alive(self) -> bool:
+        """Whether the dispatch thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def health(self) -> Dict[str, Any]:
+        """Dispatch thread state, in-flight renders and the last round's error"""
+        return {'status': 'ok' if self.alive() else 'stopped',
+                'in_flight': len(self._in_flight), 'error': self.error}
+
+    def _run(self):
+        renewed = time.monotonic()
+        while not self._stopping:
+            try:
+                renewed = self._dispatch(renewed)
+            except Exception as e:
+                # A failed round (database error, unwritable build index) must
+                # not stop the queue; what it left unfinished is picked up by
+                # the next round, or re-queued once its lease expires
+                self.error = f"{type(e).__name__}: {e}"
+                logger.exception("Render queue dispatch round failed")
+                time.sleep(self.poll_s)
+
+    def _dispatch(self, renewed: float) -> float:
+        """One round: fill free workers, finish renders, renew leases; returns renewed"""
+        while len(self._in_flight) < self.workers:
+            try:
+                claimed = self.queue.claim(self.worker_id, self._allowed())
+            except sqlite3.OperationalError:
+                # Database busy beyond the connection timeout; try next round
+                claimed = None
+            if claimed is None:
+                break
+            try:
+                future = self._executor.submit(execute_queued, claimed.job, claimed.allow_files)
+            except BrokenProcessPool as e:
+                # The pool broke between renders: replace it and hand the job back
+                self._executor = self._new_executor()
+                self.queue.fail(claimed, f"{type(e).__name__}: {e}")
+                continue
+            self._in_flight[future] = (claimed, self._executor)
+
+        done, _ = wait(list(self._in_flight) + [self._wake], timeout=self.poll_s,
+                       return_when=FIRST_COMPLETED)
+        for future in done:
+            if future in self._in_flight:
+                self._finish(future, *self._in_flight.pop(future))
+        if self._wake.done():
+            with self._lock:
+                self._wake = Future()
+
+        if time.monotonic() - renewed > self.queue.lease_s / 3:
+            self.queue.renew(claimed for claimed, _ in self._in_flight.values())
+            renewed = time.monotonic()
+        self._collect_elsewhere()
+        return renewed
+
+    def _finish(self, future: Future, claimed: QueuedJob, executor: ProcessPoolExecutor):
+        with self._lock:
+            waiter = self._waiters.get(claimed.id)
+        try:
+            result, pdf = future.result()
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool) and executor is self._executor:
+                # A worker died; its pool's other in-flight jobs fail the same way
+                executor.shutdown(wait=False)
+                self._executor = self._new_executor()
+            retried = self.queue.fail(claimed, f"{type(e).__name__}: {e}",
+                                      retry=isinstance(e, _TRANSIENT_ERRORS))
+            if retried is False:
+                self._report(claimed, {'status': 'failed', 'error': str(e)})
+                self._resolve(claimed.id, waiter, error=e)
+            return
+
+        # PDF bytes go straight to a waiter here, or are kept for wait()
+        if not self.queue.complete(claimed, result, None if waiter else pdf):
+            # Lease lost: the job's current holder records the outcome
+            return
+        self._report(claimed, dict(result, status='ok'))
+        self._resolve(claimed.id, waiter, value=(result, pdf))
+
+    def _collect_elsewhere(self):
+        """Resolve waiters whose jobs were finished by another worker's lease"""
+        local = {claimed.id for claimed, _ in self._in_flight.values()}
+        with self._lock:
+            waiting = [(job_id, waiter) for job_id, waiter in self._waiters.items()
+                       if job_id not in local]
+        if not waiting:
+            return
+        finished = self.queue.finished(job_id for job_id, _ in waiting)
+        for job_id, waiter in waiting:
+            if job_id not in finished:
+                continue
+            record, pdf = self.queue.wait(job_id)
+            if record['status'] == 'failed':
+                self._resolve(job_id, waiter, error=record['error'])
+            else:
+                self._resolve(job_id, waiter, value=(record['result'], pdf))
+
+    def _resolve(self, job_id: int, waiter: Optional[Future], value=None, error=None):
+        if waiter is None:
+            return
+        with self._lock:
+            self._waiters.pop(job_id, None)
+        if error is not None:
+            waiter.set_exception(RuntimeError(f"Render failed: {error}"))
+        else:
+            waiter.set_result(value)
+
+    def _report(self, claimed: QueuedJob, outcome: Dict[str, Any]):
+        """Record a manifest job in its build index (see enqueue_manifest)"""
+        if claimed.report:
+            update_results(claimed.report['results'], [dict(claimed.report['entry'], **outcome)])
+
+    def close(self, wait: bool = True):
+        """Stop claiming jobs; in-flight renders finish first when wait is set"""
+        self._stopping = True
+        self._wakeup()
+        if self._thread is not None:
+            self._thread.join()
+        if wait:
+            for future in list(self._in_flight):
+                self._finish(future, *self._in_flight.pop(future))
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self) -> 'QueueDispatcher':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def enqueue_manifest(queue: RenderQueue,
+                     jobs: List[Dict[str, Any]],
+                     output_dir: str = ".",
+                     tenant: str = DEFAULT_TENANT,
+                     priority='bulk',
+                     force: bool = False,
+                     results_path: Optional[str] = None) -> Tuple[List[Optional[int]],
+                                                                  List[Optional[Dict[str, Any]]]]:
+    """
+    BRAINSAIT: Queue a job manifest (e.g. a tenant onboarding run)
+
+    Only jobs whose outputs are out of date are queued (see
+    batch_runner.plan_jobs); each records its result in the build index at
+    results_path when it finishes. An output that is already queued or
+    being rendered is not queued again.
+
+    Returns:
+        (ids, results): the queue id of each job (None if not queued) and
+        the final result of each job that was not queued
+    """
+    results_path = results_path or os.path.join(output_dir, RESULTS_FILENAME)
+    previous = {} if force else load_results(results_path)
+    results, pending = plan_jobs(jobs, output_dir, previous, force)
+    update_results(results_path, [r for r in results if r is not None and r['status'] == 'failed'])
+
+    queued = [dict(job, output=os.path.abspath(path)) for _, job, path, _ in pending]
+    reports = [{'results': os.path.abspath(results_path),
+                'entry': dict(result, path=os.path.abspath(path))}
+               for _, _, path, result in pending]
+    queue_ids = queue.enqueue_many(queued, tenant, priority,
+                                   dedupe_keys=[job['output'] for job in queued],
+                                   reports=reports, allow_files=True)
+    ids: List[Optional[int]] = [None] * len(jobs)
+    for (index, _, _, _), job_id in zip(pending, queue_ids):
+        ids[index] = job_id
+    return ids, results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="BrainSAIT render job queue")
+    parser.add_argument("--db", default=os.environ.get("BRAINSAIT_QUEUE", "render-queue.sqlite"),
+                        help="queue database (default: $BRAINSAIT_QUEUE or %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="render queued jobs until interrupted")
+    serve.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS,
+                       help="number of worker processes (default: %(default)s)")
+    serve.add_argument("--reserved", type=int, default=1,
+                       help="workers kept free of bulk jobs (default: %(default)s)")
+
+    submit = commands.add_parser("submit", help="queue a job manifest")
+    submit.add_argument("manifest", help="job manifest (.json, .jsonl, .yaml)")
+    submit.add_argument("-o", "--output-dir", default=".",
+                        help="directory for relative output paths (default: current directory)")
+    submit.add_argument("--tenant", default=DEFAULT_TENANT)
+    submit.add_argument("--priority", choices=list(PRIORITIES), default='bulk')
+    submit.add_argument("--force", action="store_true", help="re-render up-to-date outputs")
+
+    commands.add_parser("status", help="show job counts")
+    args = parser.parse_args(argv)
+
+    queue = RenderQueue(args.db)
+    if args.command == "status":
+        print(json.dumps(queue.stats(), indent=2))
+        return 0
+
+    if args.command == "submit":
+        try:
+            jobs = load_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            print(f"✗ {e}", file=sys.stderr)
+            return 2
+        ids, results = enqueue_manifest(queue, jobs, args.output_dir, args.tenant,
+                                        args.priority, args.force)
+        queued = sum(1 for job_id in ids if job_id is not None)
+        skipped = sum(1 for r in results if r is not None and r['status'] == 'skipped')
+        failed = [r for r in results if r is not None and r['status'] == 'failed']
+        for result in failed:
+            print(f"  ✗ {result['id']} - {result['error']}")
+        print(f"{queued} jobs queued for {args.tenant} ({args.priority}), {skipped} up to date, "
+              f"{len(jobs) - queued - skipped - len(failed)} already queued, "
+              f"{len(failed)} invalid")
+        return 1 if failed else 0
+
+    dispatcher = QueueDispatcher(queue, args.workers, args.reserved).start()
+    print(f"BrainSAIT render queue {args.db} ({dispatcher.workers} workers, "
+          f"{dispatcher.reserved} reserved from bulk)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dispatcher.close()
+    return 0
+
+
+__all__ = ['RenderQueue', 'QueueDispatcher', 'QueuedJob', 'enqueue_manifest', 'execute_queued',
+           'retry_delay', 'PRIORITIES', 'DEFAULT_TENANT']
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""
+BrainSAIT Document Render Service
+=================================
+Resident PDF render service with a pool of pre-warmed worker processes
+
+BRAINSAIT: Serves DocumentTemplates and custom documents as PDF bytes over HTTP
+NEURAL: Workers pay interpreter, ReportLab and style setup once at startup
+MEDICAL: Documents are rendered in memory and never touch the disk
+
+Usage:
+    python render_service.py --host 127.0.0.1 --port 8765 --workers 4
+
+    POST /render  {"template": "business-plan", "department": "Sales",
+                   "language": "en"}                  -> application/pdf
+    GET  /healthz                                     -> {"status": "ok"}
+                                                         (503 if the queue dispatcher died)
+    GET  /templates                                   -> template ids and catalog
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from template_registry import get_template_registry
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = int(os.environ.get("BRAINSAIT_WORKERS", str(os.cpu_count() or 1)))
+DEFAULT_TIMEOUT = 60.0
+
+# Queue tenant of the requests this service takes (with --queue)
+DEFAULT_TENANT = "render-service"
+
+# Kept in sync with brainsait_document_system.SUPPORTED_LANGUAGES (not imported
+# here so validating a job does not load the document system)
+SUPPORTED_LANGUAGES = ('en', 'ar')
+MAX_REQUEST_BYTES = 5 * 1024 * 1024
+
+# Paragraph markup that reads files (<img src>) or adds links and draw
+# callbacks; refused in jobs from untrusted sources (see validate_job)
+_UNSAFE_MARKUP = re.compile(r'<\s*(img|a|link|ondraw|index)\b', re.IGNORECASE)
+
+
+class RenderJobError(ValueError):
+    """Raised when a render job is malformed or names an unknown template"""
+
+
+def _render_template(job: Dict[str, Any]) -> bytes:
+    """Render a registered template with the job's template parameters"""
+    template = get_template_registry().get(job['template'])
+    params = {name: job[name] for name in template.parameters if name in job}
+    return template.render(None, language=job.get('language', 'en'), **params)
+
+
+def _render_custom(job: Dict[str, Any], allow_files: bool = False) -> bytes:
+    from brainsait_document_system import BrainSAITDocumentGenerator
+    doc_gen = BrainSAITDocumentGenerator(
+        document_type=job.get('document_type', "Document"),
+        department=job['department'],
+        title_en=job.get('title', "BrainSAIT Document"),
+        title_ar=job.get('title_ar', ""),
+        classification=job.get('classification', "INTERNAL USE"),
+        author=job.get('author', "BrainSAIT"),
+        version=job.get('version', "1.0"),
+        language=job.get('language', 'en'),
+        allow_files=allow_files,
+        table_of_contents=job.get('table_of_contents', False)
+    )
+    if job.get('sections_file'):
+        if not allow_files:
+            raise RenderJobError("jobs may not read server-side files")
+        # Large extracts stream from disk (see report_inputs)
+        from report_inputs import iter_sections
+        sections = iter_sections(job['sections_file'])
+    else:
+        sections = job.get('sections', [])
+    return doc_gen.generate_pdf(None, sections, include_cover=job.get('include_cover', True))
+
+
+# Renderers for templates that are not in the template registry
+# (called with the job and allow_files)
+CUSTOM_RENDERERS: Dict[str, Callable[..., bytes]] = {
+    'custom': _render_custom,
+}
+
+
+def template_ids() -> List[str]:
+    """Every renderable template id (registry ids match the Node API's records)"""
+    return sorted(get_template_registry().ids() + list(CUSTOM_RENDERERS))
+
+
+def validate_job(job: Any, allow_files: bool = False) -> Dict[str, Any]:
+    """
+    Check a render job before it is dispatched to a worker
+
+    Args:
+        job: The render job
+        allow_files: Accept jobs that read server-side files (a custom
+            job's sections_file or table source paths); only for trusted
+            job sources such as batch manifests, never for HTTP requests
+
+    Raises:
+        RenderJobError: If the job is not a valid render request
+    """
+    if not isinstance(job, dict):
+        raise RenderJobError("job must be a JSON object")
+
+    template = job.get('template')
+    registry = get_template_registry()
+    if template in registry:
+        for name, spec in registry.get(template).parameters.items():
+            if spec.get('required') and not job.get(name):
+                raise RenderJobError(f"{name} is required")
+    elif template in CUSTOM_RENDERERS:
+        if not job.get('department'):
+            raise RenderJobError("department is required")
+    else:
+        raise RenderJobError(f"unknown template: {template!r}")
+
+    language = job.setdefault('language', 'en')
+    if language not in SUPPORTED_LANGUAGES:
+        raise RenderJobError(f"unsupported language: {language!r}")
+
+    if template == 'custom' and not isinstance(job.get('sections', []), list):
+        raise RenderJobError("sections must be a list")
+    if template == 'custom' and not isinstance(job.get('sections_file', ''), str):
+        raise RenderJobError("sections_file must be a path")
+    if template == 'custom' and not isinstance(job.get('table_of_contents', False), bool):
+        raise RenderJobError("table_of_contents must be true or false")
+    if template == 'custom':
+        for section in job.get('sections', []):
+            _check_section(section)
+    if template == 'custom' and not allow_files:
+        from tabular import source_files
+        if job.get('sections_file') or source_files(job.get('sections', [])):
+            raise RenderJobError("jobs may not read server-side files")
+    if not allow_files:
+        _check_markup(job)
+
+    return job
+
+
+def _check_section(section: Any):
+    """Type-check one custom section so bad input fails here, not in a worker"""
+    if not isinstance(section, dict):
+        raise RenderJobError("sections must be objects")
+    for key in ('title', 'title_ar'):
+        if not isinstance(section.get(key, ''), str):
+            raise RenderJobError(f"section {key} must be a string")
+    level = section.get('level', 1)
+    if not isinstance(level, int) or isinstance(level, bool) or level not in (1, 2):
+        raise RenderJobError("section level must be 1 or 2")
+    content = section.get('content', [])
+    if not isinstance(content, list) or not all(isinstance(item, str) for item in content):
+        raise RenderJobError("section content must be a list of strings")
+    if not isinstance(section.get('table', {}), dict):
+        raise RenderJobError("section table must be an object")
+
+
+def _check_markup(value: Any):
+    """Refuse markup that would make the renderer open files or links"""
+    if isinstance(value, str):
+        if _UNSAFE_MARKUP.search(value):
+            raise RenderJobError("jobs may not use <img>, <a> or callback markup")
+    elif isinstance(value, dict):
+        for item in value.values():
+            _check_markup(item)
+    elif isinstance(value, list):
+        for item in value:
+            _check_markup(item)
+
+
+def render_job(job: Dict[str, Any], allow_files: bool = False) -> bytes:
+    """
+    Render one validated job to PDF bytes (runs inside a worker process)
+
+    allow_files must match what the job was validated with; without it the
+    job's sections_file and table source paths are refused when opened.
+    """
+    renderer = CUSTOM_RENDERERS.get(job['template'])
+    if renderer is not None:
+        return renderer(job, allow_files=allow_files)
+    return _render_template(job)
+
+
+def _warm_worker(cache_dir: Optional[str] = None, cache_entries: int = 0):
+    """
+    NEURAL: Pay the cold-start costs once per worker process
+
+    Imports ReportLab, parses declared fonts, builds the shared style
+    registry and renders a tiny document so font metrics and layout code
+    paths are loaded before the first real request arrives. Installs the worker's render cache, if any.
+    """
+    from brainsait_document_system import get_style_registry
+    from font_manager import get_font_manager
+    get_font_manager().preload()
+    get_style_registry()
+    render_job({
+        'template': 'custom',
+        'department': "Warmup",
+        'sections': [{'title': "Warmup", 'content': ["Warmup"],
+                      'table': {'headers': ['A'], 'data': [['1']]}}],
+    })
+
+    if cache_entries > 0:
+        from render_cache import DiskRenderCache, MemoryRenderCache, set_default_cache
+        if cache_dir:
+            set_default_cache(DiskRenderCache(cache_dir, cache_entries, pin_timestamps=True))
+        else:
+            set_default_cache(MemoryRenderCache(cache_entries, pin_timestamps=True))
+
+
+class RenderService:
+    """
+    BRAINSAIT: Pool of pre-warmed render workers
+
+    Jobs are validated in the calling process and rendered by worker
+    processes that stay resident between requests.
+
+    With queue_path, requests go through the durable render queue as
+    interactive jobs of the service's tenant, and the same
+    workers also serve bulk jobs queued by other processes; reserved
+    workers are kept free of bulk work (see render_queue).
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT,
+                 cache_dir: Optional[str] = None, cache_entries: int = 0,
+                 queue_path: Optional[str] = None, reserved: int = 1,
+                 tenant: str = DEFAULT_TENANT):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.tenant = tenant
+        self.dispatcher = None
+        if queue_path:
+            from render_queue import QueueDispatcher, RenderQueue
+            self.dispatcher = QueueDispatcher(RenderQueue(queue_path), self.workers, reserved,
+                                              cache_dir=cache_dir, cache_entries=cache_entries)
+            self.dispatcher.start()
+            return
+
+        self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                            initializer=_warm_worker,
+                                            initargs=(cache_dir, cache_entries))
+        # Start every worker now rather than on the first requests
+        for future in [self.executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def render(self, job: Dict[str, Any], timeout: Optional[float] = None) -> bytes:
+        """Validate and render a job, blocking until the PDF bytes are ready"""
+        job = validate_job(job)
+        if self.dispatcher is None:
+            future = self.executor.submit(render_job, job)
+            return future.result(timeout=timeout or self.timeout)
+
+        # The queue tenant is the service's own; a client cannot pick one
+        job.pop('tenant', None)
+        _, pdf = self.dispatcher.submit(job, self.tenant, 'interactive').result(
+            timeout=timeout or self.timeout)
+        return pdf
+
+    def health(self) -> Dict[str, Any]:
+        """Service status; 'unavailable' once the queue dispatcher has stopped"""
+        health: Dict[str, Any] = {'status': 'ok', 'workers': self.workers}
+        if self.dispatcher is not None:
+            health['dispatcher'] = self.dispatcher.health()
+            if health['dispatcher']['status'] != 'ok':
+                health['status'] = 'unavailable'
+        return health
+
+    def close(self):
+        if self.dispatcher is not None:
+            self.dispatcher.close()
+        else:
+            self.executor.shutdown()
+
+
+class RenderRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for a RenderService"""
+
+    server_version = "BrainSAITRender/1.0"
+
+    def do_GET(self):
+        if self.path == '/healthz':
+            health = self.server.service.health()
+            self._send_json(200 if health['status'] == 'ok' else 503, health)
+        elif self.path == '/templates':
+            self._send_json(200, {'templates': template_ids(),
+                                  'catalog': get_template_registry().describe()})
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        if self.path != '/render':
+            return self._send_json(404, {'error': 'Not found'})
+
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length < 0:
+                raise ValueError(f"invalid Content-Length: {length}")
+        except ValueError as e:
+            return self._send_json(400, {'error': str(e)})
+        if length > MAX_REQUEST_BYTES:
+            return self._send_json(413, {'error': 'Request too large'})
+
+        try:
+            job = json.loads(self.rfile.read(length) or b'{}')
+            pdf = self.server.service.render(job)
+        except (json.JSONDecodeError, RenderJobError) as e:
+            return self._send_json(400, {'error': str(e)})
+        except FutureTimeout:
+            return self._send_json(504, {'error': 'Render timed out'})
+        except Exception as e:
+            return self._send_json(500, {'error': f"Render failed: {e}"})
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/pdf')
+        self.send_header('Content-Length', str(len(pdf)))
+        self.send_header('Content-Disposition',
+                         f'attachment; filename="{job["template"]}-{job["language"]}.pdf"')
+        self.end_headers()
+        self.wfile.write(pdf)
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          workers: int = DEFAULT_WORKERS, timeout: float = DEFAULT_TIMEOUT,
+          cache_dir: Optional[str] = None, cache_entries: int = 0,
+          queue_path: Optional[str] = None, reserved: int = 1,
+          tenant: str = DEFAULT_TENANT):
+    """Run the render service until interrupted"""
+    service = RenderService(workers=workers, timeout=timeout,
+                            cache_dir=cache_dir, cache_entries=cache_entries,
+                            queue_path=queue_path, reserved=reserved, tenant=tenant)
+    httpd = ThreadingHTTPServer((host, port), RenderRequestHandler)
+    httpd.service = service
+    print(f"BrainSAIT render service on http://{host}:{port} ({service.workers} workers"
+          + (f", queue {queue_path})" if queue_path else ")"))
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BrainSAIT document render service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-j", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help="number of worker processes (default: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="per-job render timeout in seconds (default: %(default)s)")
+    parser.add_argument("--cache-entries", type=int, default=0,
+                        help="render cache size per worker, 0 disables (default: %(default)s)")
+    parser.add_argument("--cache-dir", default=None,
+                        help="use a shared on-disk render cache in this directory")
+    parser.add_argument("--queue", default=None,
+                        help="serve requests through this render queue database, "
+                             "also rendering bulk jobs queued there")
+    parser.add_argument("--reserved", type=int, default=1,
+                        help="with --queue, workers kept free of bulk jobs (default: %(default)s)")
+    parser.add_argument("--tenant", default=DEFAULT_TENANT,
+                        help="with --queue, tenant the requests are queued for "
+                             "(default: %(default)s)")
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers, args.timeout,
+          cache_dir=args.cache_dir, cache_entries=args.cache_entries,
+          queue_path=args.queue, reserved=args.reserved, tenant=args.tenant)
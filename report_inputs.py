@@ -0,0 +1,96 @@
+"""
+BrainSAIT Report Inputs
+=======================
+Streaming content sections for reports built from very large extracts
+
+NEURAL: generate_pdf already consumes content_sections lazily (LazyStory) and
+renders tables a page-sized chunk at a time (iter_table_chunks); the readers
+here feed it sections and table rows as generators, so an extract is never
+fully resident and input-side RSS is bounded by the chunk size, not the file
+MEDICAL: Extracts stay on disk; nothing is copied into intermediate files
+
+    doc_gen.generate_pdf("claims-review.pdf", iter_sections("extracts/claims.jsonl"))
+
+    doc_gen.generate_pdf("claims-register.pdf", [
+        {'title': "Overview", 'content': ["..."]},
+        table_section("extracts/claims.npy", "Claims Register",
+                      headers=["Claim", "Amount"], formats={"Amount": 'currency'}),
+    ])
+
+A .jsonl extract holds one section object per line. Table sources are
+anything tabular reads (CSV, Parquet, Arrow IPC/Feather, memory-mapped .npy,
+arrays and frames); they are opened when layout reaches the table.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class ReportInputError(ValueError):
+    """Raised for unreadable or malformed report inputs"""
+
+
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the JSON object on each non-blank line of a .jsonl file, one at a time"""
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ReportInputError(f"{path}:{number}: {e}") from None
+            if not isinstance(record, dict):
+                raise ReportInputError(f"{path}:{number}: expected a JSON object")
+            yield record
+
+
+def iter_sections(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Content sections from a file, as a generator
+
+    .jsonl files are streamed a line at a time. .json files (a list, or an
+    object with a "sections" list) are small by nature and loaded whole.
+    """
+    if os.path.splitext(path)[1].lower() == '.jsonl':
+        yield from iter_jsonl(path)
+        return
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ReportInputError(f"{path}: {e}") from None
+    if isinstance(data, dict):
+        data = data.get('sections')
+    if not isinstance(data, list):
+        raise ReportInputError(f"{path}: expected a list of sections")
+    yield from data
+
+
+def table_section(source: Any,
+                  title: str,
+                  headers: Optional[List[str]] = None,
+                  formats: Optional[Dict[str, Any]] = None,
+                  title_ar: str = "",
+                  content: Iterable[Any] = (),
+                  level: int = 1,
+                  col_widths: Optional[List[float]] = None) -> Dict[str, Any]:
+    """
+    A content section whose table streams from a tabular source
+
+    The source (a path, array, frame or Arrow object; see tabular) is opened
+    and read in TABLE_CHUNK_ROWS chunks only when the table is laid out.
+    """
+    table: Dict[str, Any] = {'source': source}
+    if headers is not None:
+        table['headers'] = list(headers)
+    if formats:
+        table['formats'] = dict(formats)
+    if col_widths is not None:
+        table['col_widths'] = list(col_widths)
+    return {'title': title, 'title_ar': title_ar, 'level': level,
+            'content': content, 'table': table}
+
+
+__all__ = ['ReportInputError', 'iter_jsonl', 'iter_sections', 'table_section']
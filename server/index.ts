@@ -140,6 +140,30 @@ const documentTemplates: DocumentTemplateRecord[] = [
 const generatedDocuments: GeneratedDocumentRecord[] = [];
 const generatedFiles = new Map<string, Buffer>();
 
+const renderServiceUrl = process.env.RENDER_SERVICE_URL;
+
+// Render through the resident Python render service (render_service.py) when configured
+const renderWithService = async (job: Record<string, unknown>): Promise<Buffer | null> => {
+  if (!renderServiceUrl) {
+    return null;
+  }
+  try {
+    const response = await fetch(`${renderServiceUrl}/render`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(job),
+    });
+    if (!response.ok) {
+      auditLog('render_service_error', { status: response.status, template: job.template });
+      return null;
+    }
+    return Buffer.from(await response.arrayBuffer());
+  } catch (error) {
+    auditLog('render_service_unavailable', { message: (error as Error).message });
+    return null;
+  }
+};
+
 app.get('/healthz', (_req, res) => {
   res.json({ status: 'ok' });
 });
@@ -250,7 +274,7 @@ app.get('/api/documents/list', (_req, res) => {
   res.json(generatedDocuments);
 });
 
-app.post('/api/documents/generate', (req, res) => {
+app.post('/api/documents/generate', async (req, res) => {
   const { templateId, language, department, title, author, customContent } = req.body ?? {};
   const template = documentTemplates.find(t => t.id === templateId);
 
@@ -259,9 +283,13 @@ app.post('/api/documents/generate', (req, res) => {
   }
 
   const documentId = randomUUID();
-  const buffer = Buffer.from(
-    `BrainSAIT Document\nTemplate: ${template.name}\nDepartment: ${department}\nTitle: ${title}\nAuthor: ${author}\nLanguage: ${language}\nNotes: ${customContent || 'N/A'}`
-  );
+  const buffer =
+    // Stock templates carry their own titles and author, so only the template
+    // parameters are sent
+    (await renderWithService({ template: templateId, language, department })) ??
+    Buffer.from(
+      `BrainSAIT Document\nTemplate: ${template.name}\nDepartment: ${department}\nTitle: ${title}\nAuthor: ${author}\nLanguage: ${language}\nNotes: ${customContent || 'N/A'}`
+    );
 
   generatedDocuments.push({
     id: documentId,
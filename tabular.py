@@ -0,0 +1,509 @@
+"""
+BrainSAIT Tabular Sources
+=========================
+Columnar table input for create_table and section 'table' entries
+
+NEURAL: Claims exports are read as they are stored - CSV files, Parquet
+files and Arrow tables, NumPy arrays, pandas DataFrames or plain column
+lists - one chunk of rows at a time, and never converted to nested lists of
+strings up front
+NEURAL: Cells are formatted a column at a time: the formatter is chosen once
+per column and applied in one pass (strftime/astype/cast on the library side
+where it exists), not dispatched per cell
+
+    {'title': "Claims", 'table': {'source': "exports/claims.parquet",
+                                  'headers': ["Claim", "Date", "Amount"],
+                                  'formats': {"Date": 'date', "Amount": 'currency'}}}
+
+Formats are a name from COLUMN_FORMATS, a str.format template such as
+"{:,.0f} SAR", or a callable that takes a whole column and returns its
+strings. Missing values (None, NaN, nulls) render as empty cells.
+
+Files are never loaded whole. CSV is read through a buffered reader a chunk
+of rows at a time; NumPy .npy files are memory-mapped and the pages of rows
+already formatted are handed back to the OS, so RSS stays bounded by the
+chunk size; Arrow IPC/Feather and Parquet files are memory-mapped by Arrow.
+
+NumPy, pandas and pyarrow are optional and only imported for sources that
+need them; Parquet and Arrow files need pyarrow, .npy files NumPy.
+"""
+
+import csv
+import mmap
+import os
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Named column formats: (kind, pattern)
+COLUMN_FORMATS: Dict[str, Tuple[str, str]] = {
+    'text': ('text', ''),
+    'integer': ('number', '{:,.0f}'),
+    'number': ('number', '{:,.2f}'),
+    'currency': ('number', 'SAR {:,.2f}'),
+    'percent': ('number', '{:.1%}'),
+    'date': ('date', '%Y-%m-%d'),
+    'datetime': ('date', '%Y-%m-%d %H:%M'),
+}
+
+# Row chunk used when the caller does not ask for one
+DEFAULT_CHUNK_ROWS = 1000
+
+_PARQUET_SUFFIXES = ('.parquet', '.pq')
+_ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+
+ColumnFormat = Union[str, Callable[[Any], Sequence[str]], None]
+
+
+class TabularSourceError(ValueError):
+    """Raised for unsupported sources, unknown columns, bad formats or bad cells"""
+
+
+class _CellError(ValueError):
+    """A cell a column format cannot convert; index is its row in the chunk"""
+
+    def __init__(self, index: int, value: Any):
+        super().__init__(index, value)
+        self.index = index
+        self.value = value
+
+
+def _convert_all(values: List[Any], convert: Callable[[Any], Any]) -> List[Any]:
+    """convert every value, reporting the first one it rejects as a _CellError"""
+    try:
+        return list(map(convert, values))
+    except (TypeError, ValueError):
+        pass
+    for index, value in enumerate(values):
+        try:
+            convert(value)
+        except (TypeError, ValueError):
+            raise _CellError(index, value) from None
+    raise AssertionError("conversion failed without a failing value")
+
+
+def _library(value) -> str:
+    return type(value).__module__.split('.', 1)[0]
+
+
+def is_tabular_source(value) -> bool:
+    """True for inputs this module reads (files, arrays, frames, Arrow data, column maps)"""
+    return (isinstance(value, (str, os.PathLike, dict))
+            or _library(value) in ('numpy', 'pandas', 'pyarrow'))
+
+
+# ---------------------------------------------------------------------------
+# Readers: each yields (headers, chunk) where chunk is a list of columns
+# ---------------------------------------------------------------------------
+
+def _select(available: List[str], headers: Optional[List[str]]) -> List[int]:
+    if headers is None:
+        return list(range(len(available)))
+    missing = [h for h in headers if h not in available]
+    if missing:
+        raise TabularSourceError(f"unknown columns {missing}; available: {available}")
+    return [available.index(h) for h in headers]
+
+
+def _read_csv(path, headers, chunk_rows) -> Tuple[List[str], Iterator[List[Sequence]]]:
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        available = next(csv.reader(f), [])
+    indexes = _select(available, headers)
+
+    def chunks():
+        # Reopened on first read, so a table that is never laid out (or fails
+        # validation) holds no file handle
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            while True:
+                rows = list(islice(reader, chunk_rows))
+                if not rows:
+                    return
+                # One C-level transpose per chunk; short rows pad with ''
+                width = len(available)
+                columns = list(zip(*(row if len(row) == width else (row + [''] * width)[:width]
+                                     for row in rows)))
+                yield [columns[i] for i in indexes]
+
+    return [available[i] for i in indexes], chunks()
+
+
+def _arrow_batches(source, headers, chunk_rows):
+    module = type(source).__module__
+    name = type(source).__name__
+    if name == 'ParquetFile':
+        return source.schema_arrow.names, source.iter_batches(batch_size=chunk_rows,
+                                                              columns=headers)
+    if name == 'Table':
+        return source.schema.names, source.to_batches(max_chunksize=chunk_rows)
+    if name == 'RecordBatch':
+        return source.schema.names, [source]
+    if name == 'RecordBatchFileReader':
+        return source.schema.names, (source.get_batch(i) for i in range(source.num_record_batches))
+    if name == 'RecordBatchReader' or hasattr(source, 'read_next_batch'):
+        return source.schema.names, iter(source)
+    raise TabularSourceError(f"unsupported Arrow source: {module}.{name}")
+
+
+def _read_arrow(source, headers, chunk_rows):
+    available, batches = _arrow_batches(source, headers, chunk_rows)
+    selected = headers if headers is not None else available
+    _select(available, selected)
+
+    def chunks():
+        for batch in batches:
+            # Slices are zero-copy views of (possibly memory-mapped) batches
+            for start in range(0, batch.num_rows, chunk_rows):
+                part = batch.slice(start, chunk_rows)
+                yield [part.column(part.schema.get_field_index(h)) for h in selected]
+
+    return list(selected), chunks()
+
+
+def _open_arrow_file(path: str):
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    source = pa.memory_map(path, 'r')
+    try:
+        return ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return ipc.open_stream(source)
+
+
+def _read_npy(path: str, headers, chunk_rows):
+    """Memory-map a .npy file; pages of rows already yielded are released"""
+    import numpy as np
+    from numpy.lib import format as npy_format
+
+    with open(path, 'rb') as f:
+        version = npy_format.read_magic(f)
+        read_header = {(1, 0): npy_format.read_array_header_1_0,
+                       (2, 0): npy_format.read_array_header_2_0}.get(version)
+        if read_header is None:
+            return _read_numpy(np.load(path, mmap_mode='r'), headers, chunk_rows)
+        shape, fortran_order, dtype = read_header(f)
+        offset = f.tell()
+        if dtype.hasobject:
+            raise TabularSourceError(f"{path}: object arrays cannot be memory-mapped")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    array = np.ndarray(shape, dtype=dtype, buffer=mapped, offset=offset,
+                       order='F' if fortran_order else 'C')
+    headers, chunks = _read_numpy(array, headers, chunk_rows)
+    if fortran_order or array.ndim == 0 or not hasattr(mapped, 'madvise'):
+        return headers, chunks
+    row_bytes = array.strides[0]
+
+    def released():
+        done = 0
+        for index, chunk in enumerate(chunks):
+            yield chunk
+            # The consumer has formatted this chunk; drop its pages from RSS
+            end = offset + min((index + 1) * chunk_rows, shape[0]) * row_bytes
+            end -= end % mmap.PAGESIZE
+            if end > done:
+                mapped.madvise(mmap.MADV_DONTNEED, done, end - done)
+                done = end
+
+    return headers, released()
+
+
+def _read_pandas(frame, headers, chunk_rows):
+    if _library(frame) == 'pandas' and type(frame).__name__ == 'Series':
+        frame = frame.to_frame()
+    available = [str(c) for c in frame.columns]
+    indexes = _select(available, headers)
+    columns = [frame.iloc[:, i] for i in indexes]
+
+    def chunks():
+        for start in range(0, len(frame), chunk_rows):
+            yield [column.iloc[start:start + chunk_rows] for column in columns]
+
+    return [available[i] for i in indexes], chunks()
+
+
+def _read_numpy(array, headers, chunk_rows):
+    if array.dtype.names:
+        available = list(array.dtype.names)
+        indexes = _select(available, headers)
+        columns = [array[available[i]] for i in indexes]
+        headers = [available[i] for i in indexes]
+    elif array.ndim == 2:
+        columns = [array[:, i] for i in range(array.shape[1])]
+        headers = headers or [f"Column {i + 1}" for i in range(len(columns))]
+        if len(headers) != len(columns):
+            raise TabularSourceError(f"{len(headers)} headers for {len(columns)} columns")
+    elif array.ndim == 1:
+        columns = [array]
+        headers = headers or ["Value"]
+    else:
+        raise TabularSourceError(f"cannot tabulate a {array.ndim}-D array")
+
+    def chunks():
+        for start in range(0, len(columns[0]), chunk_rows):
+            yield [column[start:start + chunk_rows] for column in columns]
+
+    return list(headers), chunks()
+
+
+def _read_columns(columns, headers, chunk_rows):
+    if isinstance(columns, dict):
+        available = [str(h) for h in columns]
+        indexes = _select(available, headers)
+        values = list(columns.values())
+        columns = [values[i] for i in indexes]
+        headers = [available[i] for i in indexes]
+    elif headers is None or len(headers) != len(columns):
+        raise TabularSourceError("a list of columns needs one header per column")
+
+    if any(_library(column) in ('numpy', 'pandas', 'pyarrow') for column in columns):
+        def chunks():
+            length = len(columns[0])
+            for start in range(0, length, chunk_rows):
+                yield [column[start:start + chunk_rows] for column in columns]
+    else:
+        def chunks():
+            iterators = [iter(column) for column in columns]
+            while True:
+                chunk = [list(islice(it, chunk_rows)) for it in iterators]
+                if not chunk or not chunk[0]:
+                    return
+                yield chunk
+
+    return list(headers), chunks()
+
+
+def _open(source, headers, chunk_rows, allow_files):
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if not allow_files:
+            raise TabularSourceError(f"table sources may not read files: {path!r}")
+        suffix = os.path.splitext(path)[1].lower()
+        if suffix in _PARQUET_SUFFIXES:
+            import pyarrow.parquet as pq
+            return _read_arrow(pq.ParquetFile(path, memory_map=True), headers, chunk_rows)
+        if suffix in _ARROW_SUFFIXES:
+            return _read_arrow(_open_arrow_file(path), headers, chunk_rows)
+        if suffix == '.npy':
+            return _read_npy(path, headers, chunk_rows)
+        return _read_csv(path, headers, chunk_rows)
+    library = _library(source)
+    if library == 'pyarrow':
+        return _read_arrow(source, headers, chunk_rows)
+    if library == 'pandas':
+        return _read_pandas(source, headers, chunk_rows)
+    if library == 'numpy':
+        return _read_numpy(source, headers, chunk_rows)
+    if isinstance(source, (dict, list, tuple)):
+        return _read_columns(source, headers, chunk_rows)
+    raise TabularSourceError(f"unsupported table source: {type(source).__name__}")
+
+
+# ---------------------------------------------------------------------------
+# Column formatting
+# ---------------------------------------------------------------------------
+
+def _is_missing(value) -> bool:
+    return value is None or value != value or value == ''
+
+
+def _python_values(column) -> List[Any]:
+    """A column as Python objects, converted in bulk by the owning library"""
+    library = _library(column)
+    if library == 'pyarrow':
+        return column.to_pylist()
+    if library in ('numpy', 'pandas'):
+        return column.tolist()
+    return list(column)
+
+
+def _format_text(column) -> Sequence[Any]:
+    library = _library(column)
+    if library == 'pandas':
+        return column.astype(object).where(column.notna(), '').astype(str).tolist()
+    if library == 'numpy':
+        if column.dtype.kind == 'f':
+            import numpy as np
+            text = column.astype(str).astype(object)
+            text[np.isnan(column)] = ''
+            return text.tolist()
+        return column.astype(str).tolist()
+    if library == 'pyarrow':
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        return pc.fill_null(pc.cast(column, pa.string()), '').to_pylist()
+    # Plain lists pass through untouched (ReportLab stringifies cells itself)
+    return column
+
+
+def _has_missing(column, values: List[Any]) -> bool:
+    library = _library(column)
+    if library == 'pandas':
+        return bool(column.isna().any())
+    if library == 'pyarrow':
+        import pyarrow as pa
+        return column.null_count > 0 or (pa.types.is_floating(column.type)
+                                         and any(v != v for v in values))
+    if library == 'numpy':
+        if column.dtype.kind == 'f':
+            import numpy as np
+            return bool(np.isnan(column).any())
+        if column.dtype.kind != 'O':
+            return False
+    return any(_is_missing(v) for v in values)
+
+
+def _number(text: str) -> Optional[float]:
+    # Text columns (CSV) may carry thousands separators: "1,300"
+    text = text.strip().replace(',', '')
+    return float(text) if text else None
+
+
+def _format_numbers(column, pattern: str) -> List[str]:
+    render = pattern.format
+    values = _python_values(column)
+    if values and isinstance(values[0], str):
+        values = _convert_all(values, lambda v: _number(v) if isinstance(v, str) else v)
+        column = values
+    if not _has_missing(column, values):
+        return _convert_all(values, render)
+    return _convert_all(values, lambda v: '' if _is_missing(v) else render(v))
+
+
+def _format_dates(column, pattern: str) -> List[str]:
+    library = _library(column)
+    if library == 'pandas' and column.dtype.kind == 'M':
+        return column.dt.strftime(pattern).fillna('').tolist()
+    if library == 'pyarrow':
+        import pyarrow.compute as pc
+        if str(column.type).startswith(('timestamp', 'date')):
+            return pc.fill_null(pc.strftime(column, format=pattern), '').to_pylist()
+    if library == 'numpy' and column.dtype.kind == 'M' and pattern == '%Y-%m-%d':
+        import numpy as np
+        text = np.datetime_as_string(column, unit='D').astype(object)
+        text[np.isnat(column)] = ''
+        return text.tolist()
+
+    values = _python_values(column)
+    if values and isinstance(values[0], str):
+        values = _convert_all(values, lambda v: datetime.fromisoformat(v) if v else None)
+    out = []
+    for value in values:
+        out.append(value.strftime(pattern) if isinstance(value, (date, datetime)) else '')
+    return out
+
+
+def format_column(column, column_format: ColumnFormat = None) -> Sequence[Any]:
+    """
+    Format one column chunk in a single pass
+
+    Args:
+        column: list, NumPy array, pandas Series or Arrow array
+        column_format: Name from COLUMN_FORMATS, str.format template,
+            callable(column) -> strings, or None for plain text
+    """
+    if callable(column_format):
+        return column_format(column)
+    if column_format is None:
+        return _format_text(column)
+    kind, pattern = COLUMN_FORMATS.get(column_format, ('number', column_format))
+    if kind == 'text':
+        return _format_text(column)
+    if kind == 'date':
+        return _format_dates(column, pattern)
+    if '{' not in pattern:
+        raise TabularSourceError(f"unknown column format: {column_format!r}")
+    return _format_numbers(column, pattern)
+
+
+def iter_column_chunks(source,
+                       headers: Optional[List[str]] = None,
+                       chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       formats: Optional[Dict[str, ColumnFormat]] = None,
+                       allow_files: bool = True
+                       ) -> Tuple[List[str], Iterator[List[Sequence[Any]]]]:
+    """
+    Open a tabular source and return its headers and formatted column chunks
+
+    Args:
+        source: CSV/Parquet/Arrow IPC/.npy path, Arrow table/batch/reader/ParquetFile, NumPy
+            array, pandas DataFrame, mapping of header -> column, or a list
+            of columns (headers required)
+        headers: Columns to include, in order (default: all); names the
+            columns of plain arrays and column lists
+        chunk_rows: Rows per chunk
+        formats: Column header -> format (see format_column)
+        allow_files: Whether a path source may be opened; pass False for
+            sources from untrusted input
+
+    Returns:
+        (headers, chunks), each chunk a list of formatted columns
+    """
+    headers, chunks = _open(source, headers, chunk_rows, allow_files)
+    formats = formats or {}
+    unknown = set(formats) - set(headers)
+    if unknown:
+        raise TabularSourceError(f"formats for unknown columns {sorted(unknown)}")
+    column_formats = [formats.get(h) for h in headers]
+
+    def formatted():
+        row = 0
+        for chunk in chunks:
+            out = []
+            for header, column, fmt in zip(headers, chunk, column_formats):
+                try:
+                    out.append(format_column(column, fmt))
+                except _CellError as e:
+                    raise TabularSourceError(
+                        f"{header}: row {row + e.index + 1}: {e.value!r}") from None
+            row += len(out[0]) if out else 0
+            yield out
+
+    return headers, formatted()
+
+
+def iter_rows(source,
+              headers: Optional[List[str]] = None,
+              chunk_rows: int = DEFAULT_CHUNK_ROWS,
+              formats: Optional[Dict[str, ColumnFormat]] = None,
+              allow_files: bool = True
+              ) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+    """Headers and formatted rows of a tabular source (see iter_column_chunks)"""
+    headers, chunks = iter_column_chunks(source, headers, chunk_rows, formats, allow_files)
+    return headers, (row for chunk in chunks for row in zip(*chunk))
+
+
+def table_source(table: Dict[str, Any]) -> Any:
+    """
+    What a section 'table' entry is read from: 'columns', else 'source',
+    else 'data' (the precedence the document generator uses)
+    """
+    if table.get('columns') is not None:
+        return table['columns']
+    if 'source' in table:
+        return table['source']
+    return table.get('data')
+
+
+def source_files(content_sections) -> List[str]:
+    """
+    Files read by the table sources of a list of content sections
+
+    Renders that read files are not identified by their sections alone
+    (render cache keys, batch fingerprints). Generators are not inspected.
+    """
+    if not isinstance(content_sections, (list, tuple)):
+        return []
+    paths = []
+    for section in content_sections:
+        table = section.get('table') if isinstance(section, dict) else None
+        source = table_source(table) if isinstance(table, dict) else None
+        if isinstance(source, (str, os.PathLike)):
+            paths.append(os.fspath(source))
+    return paths
+
+
+__all__ = ['COLUMN_FORMATS', 'TabularSourceError', 'format_column', 'is_tabular_source',
+           'iter_column_chunks', 'iter_rows', 'source_files', 'table_source']
@@ -0,0 +1,363 @@
+"""
+BrainSAIT Template Registry
+===========================
+Declarative document templates, compiled once per process
+
+BRAINSAIT: Every stock template is a JSON definition in templates/
+NEURAL: Definitions are parsed and their {placeholders} precompiled on first
+use; rendering a template is plain substitution into a shared section tree
+BILINGUAL: Definitions carry English/Arabic names for the template catalog
+
+A definition holds catalog metadata (the Node API's documentTemplates
+record), its parameters, the generator arguments and the content sections:
+
+    {"id": "proposal", "name": "Business Proposal", "name_ar": "عرض تجاري",
+     "parameters": {"client_name": {"default": "Healthcare Partner"}},
+     "document": {"document_type": "Business Proposal", "title_en": "... {client_name}"},
+     "sections": [{"title": "Introduction", "content": ["... {client_name} ..."]}]}
+
+Strings use str.format syntax. Besides the declared parameters they may use
+{dept_ar} (Arabic department name), {today} and {review_date} (one year
+from today), e.g. {today:%B %d, %Y}.
+
+Usage:
+    python template_registry.py            # list templates
+    python template_registry.py --json     # catalog records for the Node API
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from string import Formatter
+from typing import Any, Dict, List, Optional
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Department mapping with Arabic translations
+DEPARTMENTS = {
+    'Administration': 'الإدارة',
+    'Finance': 'المالية',
+    'Human Resources': 'الموارد البشرية',
+    'Legal': 'القانونية',
+    'Marketing': 'التسويق',
+    'Operations': 'العمليات',
+    'Products': 'المنتجات',
+    'Sales': 'المبيعات',
+    'Service': 'الخدمة',
+    'Technology': 'التقنية'
+}
+
+# Values every template may reference without declaring them
+_DERIVED_FIELDS = ('dept_ar', 'today', 'review_date')
+
+_FORMATTER = Formatter()
+
+
+class TemplateError(ValueError):
+    """Raised for unknown templates, bad definitions or bad parameters"""
+
+
+class _Text:
+    """A string with {fields}, pre-split into literal and field parts"""
+
+    __slots__ = ('parts',)
+
+    def __init__(self, parts):
+        self.parts = parts
+
+    def expand(self, context: Dict[str, Any]) -> str:
+        out = []
+        for literal, field, spec, conversion in self.parts:
+            out.append(literal)
+            if field is not None:
+                value = context[field]
+                if conversion:
+                    value = _FORMATTER.convert_field(value, conversion)
+                out.append(format(value, spec))
+        return ''.join(out)
+
+
+class _Dict:
+    """A mapping with at least one dynamic value; constant values are shared"""
+
+    __slots__ = ('items',)
+
+    def __init__(self, items):
+        self.items = items
+
+    def expand(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: _expand(value, context) for key, value in self.items}
+
+
+class _List:
+    """A list with at least one dynamic item; constant items are shared"""
+
+    __slots__ = ('items',)
+
+    def __init__(self, items):
+        self.items = items
+
+    def expand(self, context: Dict[str, Any]) -> List[Any]:
+        return [_expand(item, context) for item in self.items]
+
+
+_DYNAMIC = (_Text, _Dict, _List)
+
+
+def _expand(node, context: Dict[str, Any]):
+    return node.expand(context) if isinstance(node, _DYNAMIC) else node
+
+
+def _compile(node, fields: set, where: str):
+    """
+    Compile a definition node
+
+    Constant subtrees come back as plain values (shared by every render);
+    anything containing a {field} becomes a node that is expanded per render.
+    """
+    if isinstance(node, str):
+        try:
+            parts = []
+            for literal, field, spec, conversion in _FORMATTER.parse(node):
+                if field is not None and (not field.isidentifier() or '{' in (spec or '')):
+                    raise TemplateError(f"{where}: unsupported field {{{field}}}")
+                parts.append((literal, field, spec or '', conversion))
+        except ValueError as e:
+            raise TemplateError(f"{where}: {e}") from None
+        if all(field is None for _, field, _, _ in parts):
+            return ''.join(literal for literal, _, _, _ in parts)
+        fields.update(field for _, field, _, _ in parts if field is not None)
+        return _Text(tuple(parts))
+    if isinstance(node, dict):
+        items = [(key, _compile(value, fields, f"{where}.{key}")) for key, value in node.items()]
+        if any(isinstance(value, _DYNAMIC) for _, value in items):
+            return _Dict(tuple(items))
+        return dict(items)
+    if isinstance(node, list):
+        items = [_compile(item, fields, f"{where}[{i}]") for i, item in enumerate(node)]
+        if any(isinstance(item, _DYNAMIC) for item in items):
+            return _List(tuple(items))
+        return items
+    return node
+
+
+class TemplateDefinition:
+    """
+    BRAINSAIT: One compiled document template
+
+    The constant parts of the section tree are built once and shared by
+    every render, so content_sections() results must be treated as read-only.
+    """
+
+    def __init__(self, definition: Dict[str, Any], source: str = "<definition>"):
+        try:
+            self.id = definition['id']
+            self.name = definition['name']
+            document = definition['document']
+            sections = definition['sections']
+        except KeyError as e:
+            raise TemplateError(f"{source}: missing {e.args[0]!r}") from None
+
+        self.name_ar = definition.get('name_ar', '')
+        self.category = definition.get('category', '')
+        self.description = definition.get('description', '')
+        self.icon = definition.get('icon', '')
+        self.tags = list(definition.get('tags', []))
+        self.supported_languages = list(definition.get('supported_languages', ['en']))
+        self.parameters: Dict[str, Dict[str, Any]] = dict(definition.get('parameters', {}))
+        self.required_fields = list(definition.get(
+            'required_fields',
+            [name for name, spec in self.parameters.items() if spec.get('required')]))
+        self.source = source
+        # Changes whenever the definition does (see batch_runner's build index)
+        self.fingerprint = hashlib.sha256(json.dumps(
+            definition, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+        self.fields: set = set()
+        self._document = _compile(document, self.fields, f"{source}: document")
+        self._sections = _compile(sections, self.fields, f"{source}: sections")
+
+        unknown = self.fields - set(self.parameters) - set(_DERIVED_FIELDS)
+        if unknown:
+            raise TemplateError(f"{source}: undeclared fields {sorted(unknown)}")
+
+    def context(self, **params) -> Dict[str, Any]:
+        """Validate parameters and build the substitution context"""
+        unknown = set(params) - set(self.parameters)
+        if unknown:
+            raise TemplateError(f"{self.id}: unknown parameters {sorted(unknown)}")
+
+        context = {}
+        for name, spec in self.parameters.items():
+            if name in params:
+                context[name] = params[name]
+            elif 'default' in spec:
+                context[name] = spec['default']
+            elif spec.get('required'):
+                raise TemplateError(f"{self.id}: {name} is required")
+
+        # Derived values are only computed when the definition uses them
+        if 'dept_ar' in self.fields:
+            department = context.get('department', '')
+            context['dept_ar'] = DEPARTMENTS.get(department, department)
+        if 'today' in self.fields or 'review_date' in self.fields:
+            today = datetime.now()
+            context['today'] = today
+            context['review_date'] = today + timedelta(days=365)
+        return context
+
+    def document_kwargs(self, **params) -> Dict[str, Any]:
+        """BrainSAITDocumentGenerator arguments for these parameters"""
+        return _expand(self._document, self.context(**params))
+
+    def content_sections(self, **params) -> List[Dict[str, Any]]:
+        """Content sections for these parameters (read-only, see class docs)"""
+        return _expand(self._sections, self.context(**params))
+
+    def generator(self, language: str = 'en', **params):
+        """A BrainSAITDocumentGenerator for these parameters"""
+        from brainsait_document_system import BrainSAITDocumentGenerator
+        return BrainSAITDocumentGenerator(**self.document_kwargs(**params), language=language)
+
+    def render(self, output_path, language: str = 'en', **params):
+        """
+        Render the template
+
+        output_path is passed to BrainSAITDocumentGenerator.generate_pdf, so
+        it may be a path, a writable binary stream, or None for PDF bytes.
+        """
+        from brainsait_document_system import BrainSAITDocumentGenerator
+
+        context = self.context(**params)
+        doc_gen = BrainSAITDocumentGenerator(**_expand(self._document, context), language=language)
+        return doc_gen.generate_pdf(output_path, _expand(self._sections, context))
+
+    def render_languages(self, outputs: Dict[str, Any], **params) -> Dict[str, Any]:
+        """
+        BILINGUAL: Render language variants together from one expansion
+
+        outputs maps a language to an output path, stream or None, e.g.
+        {'en': None, 'ar': None}; see generate_pdf_languages.
+        """
+        from brainsait_document_system import BrainSAITDocumentGenerator
+
+        context = self.context(**params)
+        doc_gen = BrainSAITDocumentGenerator(**_expand(self._document, context))
+        return doc_gen.generate_pdf_languages(outputs, _expand(self._sections, context))
+
+    def describe(self) -> Dict[str, Any]:
+        """Catalog record in the shape of the Node API's documentTemplates entries"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'nameAr': self.name_ar,
+            'category': self.category,
+            'description': self.description,
+            'icon': self.icon,
+            'tags': list(self.tags),
+            'requiredFields': list(self.required_fields),
+            'supportedLanguages': list(self.supported_languages),
+            'parameters': {name: dict(spec) for name, spec in self.parameters.items()},
+        }
+
+    def __repr__(self) -> str:
+        return f"<TemplateDefinition {self.id!r}>"
+
+
+class TemplateRegistry:
+    """
+    NEURAL: Compiled template definitions by id
+
+    Iterating yields definitions in id order.
+    """
+
+    def __init__(self, definitions: Optional[List[TemplateDefinition]] = None):
+        self._templates: Dict[str, TemplateDefinition] = {}
+        for definition in definitions or []:
+            self.add(definition)
+
+    @classmethod
+    def from_directory(cls, directory: str = TEMPLATES_DIR) -> 'TemplateRegistry':
+        """Load and compile every *.json definition in a directory"""
+        registry = cls()
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith('.json'):
+                continue
+            path = os.path.join(directory, filename)
+            with open(path, encoding='utf-8') as f:
+                try:
+                    definition = json.load(f)
+                except json.JSONDecodeError as e:
+                    raise TemplateError(f"{path}: {e}") from None
+            registry.add(TemplateDefinition(definition, source=path))
+        return registry
+
+    def add(self, definition: TemplateDefinition):
+        if definition.id in self._templates:
+            raise TemplateError(f"duplicate template id: {definition.id!r}")
+        self._templates[definition.id] = definition
+
+    def get(self, template_id: str) -> TemplateDefinition:
+        try:
+            return self._templates[template_id]
+        except KeyError:
+            raise TemplateError(f"unknown template: {template_id!r}") from None
+
+    def ids(self) -> List[str]:
+        return sorted(self._templates)
+
+    def describe(self) -> List[Dict[str, Any]]:
+        """Catalog records for every template (see TemplateDefinition.describe)"""
+        return [template.describe() for template in self]
+
+    def __contains__(self, template_id) -> bool:
+        return template_id in self._templates
+
+    def __iter__(self):
+        return (self._templates[template_id] for template_id in self.ids())
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+
+_REGISTRY: Optional[TemplateRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """The process-wide registry of the stock templates, loaded on first use"""
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = TemplateRegistry.from_directory(TEMPLATES_DIR)
+    return _REGISTRY
+
+
+__all__ = ['TemplateDefinition', 'TemplateRegistry', 'TemplateError',
+           'get_template_registry', 'DEPARTMENTS']
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="List the BrainSAIT document templates")
+    parser.add_argument("--json", action="store_true",
+                        help="print catalog records (Node documentTemplates format) as JSON")
+    args = parser.parse_args(argv)
+
+    registry = get_template_registry()
+    if args.json:
+        print(json.dumps(registry.describe(), indent=2, ensure_ascii=False))
+        return 0
+    for template in registry:
+        params = ', '.join(name + ('' if spec.get('required') else '?')
+                           for name, spec in template.parameters.items())
+        print(f"{template.icon} {template.id:<20} {template.name} ({params})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
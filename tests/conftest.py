@@ -0,0 +1,11 @@
+"""
+Shared pytest setup for the Python document pipeline
+
+The modules live at the repository root rather than in a package, so the
+root is put on sys.path for the test modules.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,105 @@
+"""Arabic shaping helpers and Arabic body text in rendered PDFs"""
+
+import unicodedata
+
+import pymupdf
+import pytest
+
+import arabic_text
+from arabic_text import (ARABIC_FONT_NAME, arabic_font, has_arabic, shape_markup,
+                         starts_rtl)
+from brainsait_document_system import BrainSAITDocumentGenerator
+
+pytestmark = pytest.mark.skipif(not arabic_text.SHAPING_AVAILABLE,
+                                reason="arabic-reshaper / python-bidi not installed")
+
+GREETING = "مرحبا بالعالم"
+PLAN = "هذه فقرة عربية طويلة تشرح خطة المبيعات للربع القادم"
+
+
+def logical(text: str) -> str:
+    """Extracted text with presentation forms folded back to plain letters"""
+    return unicodedata.normalize('NFKC', text)
+
+
+def render(sections, language='en'):
+    generator = BrainSAITDocumentGenerator("Report", "Sales", "Arabic Body", language=language)
+    pdf = pymupdf.open(stream=generator.generate_pdf(None, sections, include_cover=False),
+                       filetype='pdf')
+    return pdf
+
+
+@pytest.fixture
+def arabic_ttf():
+    if arabic_font('Helvetica') != ARABIC_FONT_NAME:
+        pytest.skip("no Arabic TTF available")
+
+
+def test_starts_rtl_skips_markup_and_neutrals():
+    assert starts_rtl("2025 " + GREETING)
+    assert starts_rtl(f"<b>{GREETING}</b> Sales")
+    assert not starts_rtl(f"Sales {GREETING}")
+    assert not starts_rtl("&amp; 2025")
+
+
+def test_shape_markup_wraps_arabic_runs_in_the_font():
+    shaped = shape_markup(f"Sales in {GREETING} grew", "ArabicFont")
+    assert shaped.startswith("Sales in <font name=\"ArabicFont\">")
+    assert shaped.endswith("</font> grew")
+    assert shape_markup("Sales grew", "ArabicFont") == "Sales grew"
+
+
+def test_shape_markup_mirrors_tags_right_to_left():
+    shaped = shape_markup(f"<b>{GREETING}</b> الرياض", "F", rtl=True)
+    # The leading bold run is drawn last (rightmost) and its tags still nest
+    assert shaped.startswith('<font name="F">')
+    assert shaped.endswith('</font></b>')
+    assert shaped.index('<b>') < shaped.index('</b>')
+
+
+@pytest.mark.parametrize('language', ['en', 'ar'])
+def test_arabic_body_and_bullets_render_in_the_arabic_font(arabic_ttf, language):
+    generator = BrainSAITDocumentGenerator("Report", "Sales", "Arabic Body", language=language)
+    sections = [{'title': "Overview",
+                 'content': [GREETING, f"Sales in {GREETING} grew"]
+                 + generator.create_bullet_list(["بند أول", "Item two"])}]
+    with pymupdf.open(stream=generator.generate_pdf(None, sections, include_cover=False),
+                      filetype='pdf') as pdf:
+        page = pdf[0]
+        text = logical(page.get_text())
+        spans = [span for block in page.get_text('dict')['blocks']
+                 for line in block.get('lines', []) for span in line['spans']]
+    assert GREETING in text
+    assert "بند أول" in text
+    assert "Item two" in text
+    # Arabic is drawn in the embedded TTF, never a base-14 font (no Arabic glyphs)
+    arabic_spans = [span for span in spans if has_arabic(logical(span['text']))]
+    assert len(arabic_spans) >= 3
+    for span in arabic_spans:
+        assert not span['font'].startswith('Helvetica'), span
+
+
+def test_wrapped_arabic_paragraph_starts_on_the_first_line(arabic_ttf):
+    with render([{'title': "Overview", 'content': [" ".join([PLAN] * 6)]}]) as pdf:
+        lines = [logical(line) for line in pdf[0].get_text().splitlines()]
+    lines = [line for line in lines if "فقرة" in line or "القادم" in line]
+    assert lines[0].startswith("هذه فقرة")
+    assert lines[-1].endswith("للربع القادم")
+
+
+def test_arabic_edition_sets_body_text_in_the_arabic_font(arabic_ttf):
+    generator = BrainSAITDocumentGenerator("Report", "Sales", "Arabic Body",
+                                           title_ar="تقرير المبيعات")
+    sections = [{'title': "Overview", 'title_ar': "نظرة عامة",
+                 'content': [GREETING, "Revenue grew"]}]
+    editions = generator.generate_pdf_languages({'en': None, 'ar': None}, sections,
+                                                include_cover=False)
+    with pymupdf.open(stream=editions['ar'], filetype='pdf') as pdf:
+        page = pdf[0]
+        text = logical(page.get_text())
+        body = [span for block in page.get_text('dict')['blocks']
+                for line in block.get('lines', []) for span in line['spans']
+                if logical(span['text']).strip() in (GREETING, "Revenue grew")]
+    assert GREETING in text and "نظرة عامة" in text
+    assert len(body) == 2
+    assert all(not span['font'].startswith('Helvetica') for span in body), body
@@ -0,0 +1,57 @@
+"""Bundle contents and outline built on DocumentContents"""
+
+from datetime import datetime
+
+import pymupdf
+import pytest
+
+from document_bundle import DocumentBundle
+
+
+def render(**kwargs):
+    bundle = DocumentBundle("Sales Package", department="Sales",
+                            generated_at=datetime(2025, 1, 1), **kwargs)
+    bundle.add_template('business-plan', department="Sales")
+    bundle.add_template('proposal', department="Sales", client_name="Bupa Arabia")
+    return pymupdf.open(stream=bundle.generate_pdf(None), filetype='pdf')
+
+
+def goto_pages(page):
+    return [link['page'] + 1 for link in page.get_links() if link['kind'] == pymupdf.LINK_GOTO]
+
+
+def contents_rows(page):
+    """Title and printed page number of each linked row"""
+    rows = {}
+    for link in page.get_links():
+        text = ' '.join(page.get_textbox(link['from']).split())
+        rows[text.split(' ..')[0]] = int(text.rsplit(' ', 1)[1])
+    return rows
+
+
+def test_contents_lists_documents_and_sections():
+    with render() as pdf:
+        toc = pdf.get_toc()
+        assert toc[0][1:] == ["Contents", 2]
+        assert [level for level, _, _ in toc[1:]].count(1) == 2
+        listed = {title: page for _, title, page in toc[1:]}
+        assert contents_rows(pdf[1]) == listed
+        assert goto_pages(pdf[1]) == [page for _, _, page in toc[1:]]
+
+
+def test_sections_unlisted_but_bookmarked():
+    with render(include_sections=False) as pdf:
+        toc = pdf.get_toc()
+        documents = [(title, page) for level, title, page in toc if level == 1][1:]
+        assert contents_rows(pdf[1]) == dict(documents)
+        assert goto_pages(pdf[1]) == [page for _, page in documents]
+        assert any(level == 2 for level, _, _ in toc)
+
+
+@pytest.mark.parametrize('include_sections', [True, False])
+def test_without_contents_keeps_the_outline(include_sections):
+    with render(include_contents=False, include_sections=include_sections) as pdf:
+        toc = pdf.get_toc()
+        assert "Contents" not in [title for _, title, _ in toc]
+        assert toc[0][:2] == [1, "BrainSAIT Sales Business Plan 2025-2027"]
+        assert toc[0][2] == 2
@@ -0,0 +1,92 @@
+"""Single-pass table of contents: outline, page numbers and row links"""
+
+import pymupdf
+
+from brainsait_document_system import BrainSAITDocumentGenerator
+
+
+def render(sections, language='en', **kwargs):
+    generator = BrainSAITDocumentGenerator("Report", "Sales", "Quarterly Report",
+                                           title_ar="تقرير ربع سنوي", language=language,
+                                           table_of_contents=True, **kwargs)
+    return pymupdf.open(stream=generator.generate_pdf(None, sections), filetype='pdf')
+
+
+def sections(count, paragraphs=30):
+    return [{'title': f"Section {n}", 'content': [f"Paragraph {p} of section {n}."
+                                                  for p in range(paragraphs)]}
+            for n in range(count)]
+
+
+def heading_pages(pdf, titles):
+    """1-based page of each title's first occurrence after the contents"""
+    pages = {}
+    for number in range(2, pdf.page_count):
+        for title in titles:
+            if title not in pages and title in pdf[number].get_text().splitlines():
+                pages[title] = number + 1
+    return pages
+
+
+def test_outline_and_contents_rows_point_at_the_headings():
+    with render(sections(6)) as pdf:
+        titles = [f"Section {n}" for n in range(6)]
+        toc = pdf.get_toc()
+        assert [entry[1] for entry in toc] == ["Contents"] + titles
+        pages = heading_pages(pdf, titles)
+        assert {title: page for _, title, page in toc[1:]} == pages
+
+        contents = pdf[1]
+        text = contents.get_text()
+        links = [link for link in contents.get_links() if link['kind'] == pymupdf.LINK_GOTO]
+        assert [link['page'] + 1 for link in links] == [pages[t] for t in titles]
+        rows = {line.split(' ..')[0]: line.rsplit(' ', 1)[1]
+                for line in text.splitlines() if ' ..' in line}
+        assert rows == {title: str(page) for title, page in pages.items()}
+
+
+def test_link_rectangles_cover_their_rows():
+    with render(sections(3)) as pdf:
+        contents = pdf[1]
+        links = [link for link in contents.get_links() if link['kind'] == pymupdf.LINK_GOTO]
+        for n, link in enumerate(links):
+            row = contents.search_for(f"Section {n}")[0]
+            assert link['from'].contains(row)
+
+
+def test_headings_inside_keep_together_are_listed():
+    from reportlab.platypus import KeepTogether
+    from compact_flowables import CompactParagraph
+
+    generator = BrainSAITDocumentGenerator("Report", "Sales", "Quarterly Report",
+                                           table_of_contents=True)
+    nested = KeepTogether([CompactParagraph("Nested heading",
+                                            generator.styles['BrainSAITHeading2']),
+                           CompactParagraph("Body", generator.styles['BrainSAITBody'])])
+    document = [{'title': "Section", 'content': ["Intro", nested]}]
+    with pymupdf.open(stream=generator.generate_pdf(None, document), filetype='pdf') as pdf:
+        assert [entry[1] for entry in pdf.get_toc()] == ["Contents", "Section", "Nested heading"]
+        assert len([link for link in pdf[1].get_links()
+                    if link['kind'] == pymupdf.LINK_GOTO]) == 2
+
+
+def test_streamed_sections_list_every_heading_unlinked():
+    with render(iter(sections(4, paragraphs=2))) as pdf:
+        assert [entry[1] for entry in pdf.get_toc()][1:] == [f"Section {n}" for n in range(4)]
+        text = pdf[1].get_text()
+        assert all(f"Section {n}" in text for n in range(4))
+        assert not [link for link in pdf[1].get_links() if link['kind'] == pymupdf.LINK_GOTO]
+
+
+def test_overflow_refers_to_the_outline():
+    many = [{'title': f"Section {n}", 'content': ["Text"]} for n in range(120)]
+    with render(iter(many)) as pdf:
+        assert len(pdf.get_toc()) == 121
+        assert "Further headings are listed in the PDF bookmarks" in pdf[1].get_text()
+
+
+def test_arabic_contents_page_renders():
+    with render(sections(2), language='ar') as pdf:
+        assert len(pdf.get_toc()) == 3
+        assert len([link for link in pdf[1].get_links()
+                    if link['kind'] == pymupdf.LINK_GOTO]) == 2
@@ -0,0 +1,74 @@
+"""Lazily built stories and streamed section tables"""
+
+from itertools import count
+
+import pymupdf
+import pytest
+
+from brainsait_document_system import BrainSAITDocumentGenerator, LazyStory
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return BrainSAITDocumentGenerator("Report", "Claims", "Claims Register")
+
+
+def render(generator, sections):
+    return pymupdf.open(stream=generator.generate_pdf(None, sections, include_cover=False),
+                        filetype='pdf')
+
+
+def lines(page):
+    return page.get_text().splitlines()
+
+
+def test_lazy_story_pulls_only_its_lookahead():
+    pulled = count()
+    story = LazyStory((next(pulled) for _ in range(1000)), lookahead=8)
+    assert story[0] == 0
+    assert len(story) == 8
+    del story[0]
+    story.insert(0, 'split remainder')
+    assert len(story) == 8 and story[0] == 'split remainder'
+    assert next(pulled) == 8
+
+
+def test_generator_sections_and_content(generator):
+    sections = ({'title': f"Section {n}", 'content': (f"Line {n}.{i}" for i in range(3))}
+                for n in range(3))
+    with render(generator, sections) as pdf:
+        text = [line for page in pdf for line in lines(page)]
+    assert [line for line in text if line.startswith(("Section ", "Line "))] == [
+        f"{kind} {n}{suffix}" for n in range(3)
+        for kind, suffix in [("Section", "")] + [("Line", f".{i}") for i in range(3)]]
+
+
+@pytest.mark.parametrize('data', [[], iter([])])
+def test_empty_table_keeps_its_header_row(generator, data):
+    sections = [{'title': "Claims", 'table': {'headers': ["Claim", "Amount"], 'data': data}}]
+    with render(generator, sections) as pdf:
+        assert ["Claim", "Amount"] == [line for line in lines(pdf[0]) if line in ("Claim", "Amount")]
+
+
+def test_long_table_repeats_its_header_once_per_page(generator):
+    rows = ([f"C-{n:04d}", f"{n * 10}"] for n in range(400))
+    sections = [{'title': "Claims", 'table': {'headers': ["Claim", "Amount"], 'data': rows}}]
+    claims = []
+    with render(generator, sections) as pdf:
+        assert pdf.page_count > 2
+        for page in pdf:
+            text = lines(page)
+            assert text.count("Claim") == 1 and text.count("Amount") == 1
+            page_claims = [line for line in text if line.startswith("C-")]
+            assert text.index("Claim") < text.index(page_claims[0])
+            claims += page_claims
+    assert claims == [f"C-{n:04d}" for n in range(400)]
+
+
+def test_streamed_table_reads_rows_as_layout_reaches_them(generator):
+    pulled = count()
+    rows = ([next(pulled), "x"] for _ in range(10_000))
+    tables = generator.iter_table_chunks(rows, ["N", "X"], chunk_rows=50)
+    next(tables)
+    # One chunk to measure column widths, plus the row that showed it was longer
+    assert next(pulled) == 51
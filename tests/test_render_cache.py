@@ -0,0 +1,89 @@
+"""Render cache keys, hits and misses, and pinned timestamps"""
+
+from datetime import date, datetime
+
+import pymupdf
+import pytest
+
+from brainsait_document_system import BrainSAITDocumentGenerator
+from render_cache import DiskRenderCache, MemoryRenderCache, cache_key
+
+SECTIONS = [{'title': "Overview", 'content': ["Revenue grew"],
+             'table': {'headers': ['Quarter', 'Revenue'], 'data': [['Q1', '10']]}}]
+
+PARAMS = dict(document_type="Report", department="Sales", title_en="Quarterly Report",
+              title_ar="", classification="INTERNAL USE", author="BrainSAIT", version="1.0")
+
+
+def render(cache, sections=SECTIONS, include_cover=True, **changes):
+    generator = BrainSAITDocumentGenerator(**dict(PARAMS, **changes), render_cache=cache)
+    return generator.generate_pdf(None, sections, include_cover=include_cover)
+
+
+@pytest.fixture(params=['memory', 'disk'])
+def cache(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryRenderCache(pin_timestamps=True)
+    return DiskRenderCache(str(tmp_path / "cache"), pin_timestamps=True)
+
+
+def test_cache_key_is_stable_and_order_independent():
+    assert cache_key({'a': 1, 'b': 2}, SECTIONS) == cache_key({'b': 2, 'a': 1}, SECTIONS)
+    assert cache_key({'a': 1}, SECTIONS) != cache_key({'a': 2}, SECTIONS)
+
+
+def test_cache_key_refuses_unserialisable_content():
+    assert cache_key({}, [{'content': [object()]}]) is None
+
+
+def test_repeat_render_is_a_hit(cache):
+    first = render(cache)
+    second = render(cache)
+    assert first == second
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert len(cache) == 1
+
+
+@pytest.mark.parametrize('changes', [
+    {'document_type': "Proposal"},
+    {'department': "Finance"},
+    {'title_en': "Annual Report"},
+    {'title_ar': "تقرير"},
+    {'classification': "CONFIDENTIAL"},
+    {'author': "Finance Team"},
+    {'version': "2.0"},
+    {'style_overrides': {'BrainSAITBody': {'fontSize': 12}}},
+    {'generated_at': datetime(2025, 1, 2, 9, 30)},
+    {'language': 'ar'},
+    {'table_of_contents': True},
+    {'include_cover': False},
+    {'sections': [dict(SECTIONS[0], content=["Revenue fell"])]},
+])
+def test_each_key_field_misses(cache, changes):
+    render(cache)
+    render(cache, **changes)
+    assert (cache.hits, cache.misses) == (0, 2)
+    render(cache, **changes)
+    assert cache.hits == 1
+
+
+def test_file_sources_are_not_cached(cache, tmp_path):
+    source = tmp_path / "rows.csv"
+    source.write_text("Quarter,Revenue\nQ1,10\n")
+    sections = [{'title': "Overview", 'table': {'source': str(source)}}]
+    render(cache, sections)
+    render(cache, sections)
+    assert cache.hits == 0 and len(cache) == 0
+
+
+def test_pinned_renders_print_the_day_only():
+    cache = MemoryRenderCache(pin_timestamps=True)
+    assert cache.pinned_timestamp() == date.today()
+    with pymupdf.open(stream=render(cache), filetype='pdf') as pdf:
+        footer = pdf[1].get_text()
+    assert f"Generated: {date.today():%Y-%m-%d}\n" in footer
+    assert "00:00" not in footer
+
+
+def test_unpinned_cache_uses_no_fixed_timestamp():
+    assert MemoryRenderCache().pinned_timestamp() is None
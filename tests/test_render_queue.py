@@ -0,0 +1,181 @@
+"""Render queue leases, retries, tenant fairness and dispatcher resilience"""
+
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+import render_queue
+from render_queue import QueueDispatcher, RenderQueue
+
+JOB = {'template': 'proposal', 'department': "Sales"}
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return RenderQueue(str(tmp_path / "queue.sqlite"), lease_s=0.2)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(render_queue, 'RETRY_BASE_S', 0.0)
+
+
+def test_expired_lease_is_reclaimed_and_stale_outcomes_ignored(queue, no_backoff):
+    job_id = queue.enqueue(JOB)
+    lost = queue.claim("worker-a")
+    assert queue.claim("worker-b") is None
+
+    time.sleep(0.25)
+    reclaimed = queue.claim("worker-b")
+    assert (reclaimed.id, reclaimed.attempts) == (job_id, 2)
+    assert queue.get(job_id)['error'] == "worker lost"
+
+    assert queue.complete(lost, {'size': 1}) is False
+    assert queue.fail(lost, "late error") is None
+    assert queue.get(job_id)['status'] == 'running'
+    assert queue.complete(reclaimed, {'size': 2}) is True
+    assert queue.get(job_id)['result'] == {'size': 2}
+
+
+def test_renewed_lease_is_kept(queue):
+    queue.enqueue(JOB)
+    claimed = queue.claim("worker-a")
+    for _ in range(3):
+        time.sleep(0.1)
+        queue.renew([claimed])
+    assert queue.claim("worker-b") is None
+    assert queue.complete(claimed, {'size': 1})
+
+
+def test_failures_retry_until_max_attempts(queue, no_backoff):
+    job_id = queue.enqueue(JOB, max_attempts=2)
+    assert queue.fail(queue.claim("w"), "MemoryError: ") is True
+    assert queue.get(job_id)['status'] == 'queued'
+    assert queue.fail(queue.claim("w"), "MemoryError: ") is False
+    record = queue.get(job_id)
+    assert (record['status'], record['attempts']) == ('failed', 2)
+
+
+def test_retry_waits_for_backoff(queue):
+    job_id = queue.enqueue(JOB)
+    queue.fail(queue.claim("w"), "MemoryError: ")
+    assert queue.claim("w") is None
+    assert queue.get(job_id)['available_at'] > time.time()
+
+
+def test_finished(queue):
+    done, failed, waiting = (queue.enqueue(JOB) for _ in range(3))
+    queue.complete(queue.claim("w"), {'size': 1})
+    queue.fail(queue.claim("w"), "bad", retry=False)
+    assert queue.finished([done, failed, waiting]) == {done, failed}
+    assert queue.finished([]) == set()
+
+
+def test_priority_then_least_recently_served_tenant(queue):
+    for _ in range(3):
+        queue.enqueue(JOB, tenant="bulk-run", priority='bulk')
+        queue.enqueue(JOB, tenant="acme")
+        queue.enqueue(JOB, tenant="bupa")
+    queue.enqueue(JOB, tenant="ui", priority='interactive')
+
+    order = [queue.claim("w").tenant for _ in range(4)]
+    assert order == ["ui", "acme", "bupa", "acme"]
+
+
+def test_new_tenant_does_not_jump_waiting_tenants(queue):
+    for _ in range(2):
+        queue.enqueue(JOB, tenant="acme")
+        queue.enqueue(JOB, tenant="bupa")
+    assert [queue.claim("w").tenant for _ in range(2)] == ["acme", "bupa"]
+
+    queue.enqueue(JOB, tenant="newcomer")
+    assert [queue.claim("w").tenant for _ in range(3)] == ["acme", "bupa", "newcomer"]
+
+
+def failed_future(error):
+    future = Future()
+    future.set_exception(error)
+    return future
+
+
+@pytest.fixture
+def dispatcher(queue):
+    dispatcher = QueueDispatcher(queue, workers=1)
+    yield dispatcher
+    dispatcher.close(wait=False)
+
+
+@pytest.mark.parametrize('error, status', [
+    (BrokenProcessPool("worker died"), 'queued'),
+    (MemoryError(), 'queued'),
+    (FileNotFoundError("missing.csv"), 'failed'),
+    (ValueError("bad cell"), 'failed'),
+])
+def test_only_transient_errors_are_retried(queue, dispatcher, error, status):
+    job_id = queue.enqueue(JOB)
+    claimed = queue.claim(dispatcher.worker_id)
+    dispatcher._finish(failed_future(error), claimed, None)
+    assert queue.get(job_id)['status'] == status
+
+
+def test_failed_round_does_not_stop_the_dispatcher(dispatcher, monkeypatch):
+    rounds = []
+
+    def dispatch(renewed):
+        rounds.append(renewed)
+        if len(rounds) == 1:
+            raise RuntimeError("database disk image is malformed")
+        if len(rounds) == 3:
+            dispatcher._stopping = True
+        return renewed
+
+    monkeypatch.setattr(dispatcher, '_dispatch', dispatch)
+    monkeypatch.setattr(dispatcher, 'poll_s', 0.01)
+    dispatcher._thread = threading.Thread(target=dispatcher._run)
+    dispatcher._thread.start()
+    dispatcher._thread.join(5)
+    assert len(rounds) == 3
+    assert dispatcher.error == "RuntimeError: database disk image is malformed"
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_dead_dispatcher_is_reported(dispatcher, monkeypatch):
+    def dispatch(renewed):
+        raise SystemExit
+
+    monkeypatch.setattr(dispatcher, '_dispatch', dispatch)
+    assert dispatcher.health()['status'] == 'stopped'
+    dispatcher._thread = threading.Thread(target=dispatcher._run)
+    dispatcher._thread.start()
+    dispatcher._thread.join(5)
+    assert dispatcher.health()['status'] == 'stopped'
+    with pytest.raises(RuntimeError, match="dispatcher stopped"):
+        dispatcher.submit(JOB)
+
+
+def test_waiters_collect_jobs_finished_elsewhere(queue, dispatcher):
+    done, failed = queue.enqueue(JOB), queue.enqueue(JOB)
+    waiters = {done: Future(), failed: Future()}
+    dispatcher._waiters.update(waiters)
+    dispatcher._collect_elsewhere()
+    assert not any(waiter.done() for waiter in waiters.values())
+
+    queue.complete(queue.claim("elsewhere"), {'size': 4}, b'%PDF')
+    queue.fail(queue.claim("elsewhere"), "ValueError: bad cell", retry=False)
+    dispatcher._collect_elsewhere()
+    assert waiters[done].result(0) == ({'size': 4}, b'%PDF')
+    with pytest.raises(RuntimeError, match="bad cell"):
+        waiters[failed].result(0)
+    assert not dispatcher._waiters
+
+
+def test_dispatcher_renders_submitted_jobs(tmp_path):
+    queue = RenderQueue(str(tmp_path / "queue.sqlite"))
+    with QueueDispatcher(queue, workers=1, reserved=0) as dispatcher:
+        assert dispatcher.health() == {'status': 'ok', 'in_flight': 0, 'error': None}
+        result, pdf = dispatcher.submit(JOB).result(timeout=120)
+        assert pdf.startswith(b'%PDF') and result['size'] == len(pdf)
+    assert dispatcher.health()['status'] == 'stopped'
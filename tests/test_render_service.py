@@ -0,0 +1,143 @@
+"""Render job validation and the HTTP front end's error responses"""
+
+import json
+import threading
+from http.client import HTTPConnection
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from render_service import RenderJobError, RenderRequestHandler, render_job, validate_job
+
+
+class InlineService:
+    """Renders in the request thread instead of a worker pool"""
+
+    workers = 1
+
+    def render(self, job, timeout=None):
+        return render_job(validate_job(job))
+
+    def health(self):
+        return {'status': 'ok', 'workers': self.workers}
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), RenderRequestHandler)
+    httpd.service = InlineService()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(address, body: bytes, headers=None):
+    connection = HTTPConnection(*address, timeout=60)
+    connection.putrequest('POST', '/render')
+    for name, value in (headers or {'Content-Length': str(len(body))}).items():
+        connection.putheader(name, value)
+    connection.endheaders(body)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def get(address, path):
+    connection = HTTPConnection(*address, timeout=60)
+    connection.request('GET', path)
+    response = connection.getresponse()
+    return response.status, response.read()
+
+
+def custom(**section):
+    return {'template': 'custom', 'department': "Sales",
+            'sections': [dict({'title': "Overview"}, **section)]}
+
+
+@pytest.mark.parametrize('job, message', [
+    ([], "JSON object"),
+    ({'template': 'nope'}, "unknown template"),
+    ({'template': 'proposal'}, "department is required"),
+    ({'template': 'proposal', 'department': "Sales", 'language': 'fr'}, "unsupported language"),
+    ({'template': 'custom', 'department': "Sales", 'sections': {}}, "sections must be a list"),
+    ({'template': 'custom', 'department': "Sales", 'sections': ["Overview"]}, "objects"),
+    (custom(content=[1]), "list of strings"),
+    (custom(content="Text"), "list of strings"),
+    (custom(title=["Overview"]), "title must be a string"),
+    (custom(level=7), "level"),
+    (custom(table=[]), "table must be an object"),
+    (custom(table={'headers': ['A'], 'data': '/etc/passwd'}), "server-side files"),
+    (custom(table={'headers': ['A'], 'columns': '/etc/passwd'}), "server-side files"),
+    ({'template': 'custom', 'department': "Sales", 'sections_file': '/etc/passwd'},
+     "server-side files"),
+    (custom(content=['<img src="/etc/hostname"/>']), "<img>"),
+    (custom(content=['<IMG src="/etc/hostname" width="9" height="9"/>']), "<img>"),
+    (custom(content=['<a href="https://example.com">x</a>']), "<a>"),
+    ({'template': 'proposal', 'department': '<img src="/etc/hostname"/>'}, "<img>"),
+])
+def test_validate_job_rejects(job, message):
+    with pytest.raises(RenderJobError, match=message):
+        validate_job(job)
+
+
+def test_validate_job_accepts_plain_markup():
+    job = validate_job(custom(content=["<b>Revenue</b> grew &amp; margins held"]))
+    assert job['language'] == 'en'
+
+
+def test_trusted_jobs_may_read_files(tmp_path):
+    source = tmp_path / "rows.csv"
+    source.write_text("A,B\n1,2\n")
+    validate_job(custom(table={'source': str(source)}), allow_files=True)
+
+
+@pytest.mark.parametrize('body', [
+    b'{not json',
+    json.dumps({'template': 'nope'}).encode(),
+    json.dumps(custom(content=[1])).encode(),
+    json.dumps(custom(content=['<img src="/etc/hostname"/>'])).encode(),
+])
+def test_malformed_jobs_get_400(server, body):
+    status, payload = post(server, body)
+    assert status == 400
+    assert json.loads(payload)['error']
+
+
+@pytest.mark.parametrize('length', ['abc', '-5'])
+def test_bad_content_length_gets_400(server, length):
+    status, payload = post(server, b'', {'Content-Length': length})
+    assert status == 400
+    assert 'error' in json.loads(payload)
+
+
+def test_render_returns_pdf(server):
+    status, payload = post(server, json.dumps(custom(content=["Revenue grew"])).encode())
+    assert status == 200
+    assert payload.startswith(b'%PDF')
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_healthz_reports_a_dead_queue_dispatcher(tmp_path):
+    from render_service import RenderService
+
+    service = RenderService(workers=1, queue_path=str(tmp_path / "queue.sqlite"))
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), RenderRequestHandler)
+    httpd.service = service
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert get(httpd.server_address, '/healthz')[0] == 200
+
+        def dispatch(renewed):
+            raise SystemExit
+
+        service.dispatcher._dispatch = dispatch
+        service.dispatcher._thread.join(5)
+        status, body = get(httpd.server_address, '/healthz')
+        assert status == 503
+        assert json.loads(body)['dispatcher']['status'] == 'stopped'
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        service.dispatcher.close(wait=False)
@@ -0,0 +1,94 @@
+"""Tabular sources: CSV reading, column formats and cell errors"""
+
+import gc
+import warnings
+from itertools import islice
+
+import pytest
+
+from tabular import TabularSourceError, iter_rows
+
+
+@pytest.fixture
+def claims_csv(tmp_path):
+    path = tmp_path / "claims.csv"
+    path.write_text("Claim,Date,Amount\n"
+                    "C-1,2025-01-05,\"1,300\"\n"
+                    "C-2,2025-01-06,250.5\n"
+                    "C-3,,\n"
+                    "C-4,2025-01-08,12\n"
+                    "C-5,2025-01-09,n/a\n", encoding='utf-8')
+    return path
+
+
+FORMATS = {'Date': 'date', 'Amount': 'currency'}
+
+
+def test_csv_rows_with_thousands_separators_and_blanks(claims_csv):
+    headers, rows = iter_rows(claims_csv, ["Claim", "Amount"], chunk_rows=4,
+                              formats={'Amount': 'currency'})
+    assert headers == ["Claim", "Amount"]
+    # Formatted a chunk at a time: the bad cell in row 5 is not reached yet
+    assert list(islice(rows, 4)) == [("C-1", "SAR 1,300.00"), ("C-2", "SAR 250.50"),
+                              ("C-3", ""), ("C-4", "SAR 12.00")]
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 2, 1000])
+def test_bad_cell_names_column_and_row(claims_csv, chunk_rows):
+    _, rows = iter_rows(claims_csv, formats=FORMATS, chunk_rows=chunk_rows)
+    with pytest.raises(TabularSourceError, match=r"^Amount: row 5: 'n/a'$"):
+        list(rows)
+
+
+def test_bad_date_names_column_and_row():
+    _, rows = iter_rows({'Date': ["2025-01-05", "05/01/2025"]}, formats={'Date': 'date'})
+    with pytest.raises(TabularSourceError, match=r"^Date: row 2: '05/01/2025'$"):
+        list(rows)
+
+
+@pytest.mark.parametrize('kwargs, message', [
+    ({'headers': ["Claim", "Total"]}, r"unknown columns \['Total'\]"),
+    ({'formats': {'Total': 'currency'}}, r"formats for unknown columns \['Total'\]"),
+    ({'formats': {'Amount': 'money'}}, "unknown column format: 'money'"),
+])
+def test_bad_table_definitions(claims_csv, kwargs, message):
+    with pytest.raises(TabularSourceError, match=message):
+        _, rows = iter_rows(claims_csv, **kwargs)
+        list(rows)
+
+
+def test_files_refused_for_untrusted_sources(claims_csv):
+    with pytest.raises(TabularSourceError, match="may not read files"):
+        iter_rows(str(claims_csv), allow_files=False)
+
+
+def test_unread_and_partly_read_csv_leaves_no_open_file(claims_csv):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', ResourceWarning)
+        iter_rows(claims_csv)
+        _, rows = iter_rows(claims_csv, chunk_rows=2)
+        next(rows)
+        rows.close()
+        del rows
+        gc.collect()
+
+
+def test_column_lists_need_headers():
+    with pytest.raises(TabularSourceError, match="one header per column"):
+        iter_rows([["C-1"], ["12"]])
+
+
+def test_numpy_columns():
+    np = pytest.importorskip('numpy')
+    headers, rows = iter_rows(np.array([[1, 2500.5], [2, np.nan]]), ["Line", "Amount"],
+                              formats={'Line': 'integer', 'Amount': 'currency'})
+    assert list(rows) == [("1", "SAR 2,500.50"), ("2", "")]
+
+
+def test_document_table_reports_bad_cell(claims_csv):
+    from brainsait_document_system import BrainSAITDocumentGenerator
+
+    generator = BrainSAITDocumentGenerator("Report", "Claims", "Claims Export")
+    sections = [{'title': "Claims", 'table': {'source': str(claims_csv), 'formats': FORMATS}}]
+    with pytest.raises(TabularSourceError, match="Amount: row 5"):
+        generator.generate_pdf(None, sections)